@@ -0,0 +1,156 @@
+"""asyncio API for embedding the scanner in an event loop.
+
+The blocking calls (driver calls, backend scans, report rendering and
+file writes) run in a small bounded thread pool, so the event loop never
+stalls on them. Waits use asyncio.sleep, which makes every coroutine here
+cancellable.
+
+    networks = await aio.scan()
+    async for batch in aio.iter_scans(10):
+        ...
+    filename = await aio.write_report(networks)
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from metrics import span
+from scanner import (SCAN_HISTORY_SIZE, VIRTUAL_TABLE_THRESHOLD, _default_backend, merge_scans,
+                     parse_scan_results, write_report_file)
+from scanning import SCAN_DEADLINE, SCAN_POLL_MAX, SCAN_POLL_MIN, SCAN_SETTLE, ScanPoller, logger
+
+# Threads for blocking scanner calls; driver calls are short, so a few suffice.
+EXECUTOR_WORKERS = 4
+
+_executor = None
+
+def get_executor():
+    """Return the shared bounded executor used for blocking calls."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS, thread_name_prefix="wifi-scanner")
+    return _executor
+
+async def _call(func, *args):
+    """Run a blocking call in the scanner executor."""
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), func, *args)
+
+async def wait_for_scan(iface, deadline=SCAN_DEADLINE, poll_min=SCAN_POLL_MIN, poll_max=SCAN_POLL_MAX,
+                        settle=SCAN_SETTLE):
+    """Async scanner.wait_for_scan: trigger a scan and return (results, latency) once settled."""
+    loop = asyncio.get_running_loop()
+    name = iface.name()
+    poller = ScanPoller(name, await _call(iface.scan_results), deadline, poll_min, poll_max, settle)
+    start = loop.time()
+    with span("scan_trigger", interface=name):
+        await _call(iface.scan)
+
+    with span("scan_wait", interface=name):
+        while True:
+            results = await _call(iface.scan_results)
+            latency = loop.time() - start
+            if poller.settled(results, await _call(poller.status, iface), latency):
+                break
+            await asyncio.sleep(poller.next_delay(latency))
+    logger.debug("Scan on %s settled after %.3fs with %d results", name, latency, len(results))
+    return results, latency
+
+async def scan_iface(iface, deadline=SCAN_DEADLINE, backend=None):
+    """Scan one interface and return (raw results, latency).
+
+    Backends that use the default driver polling (pywifi) are polled from
+    the event loop; other backends run their blocking scan in the executor.
+    """
+    from backends import ScanBackend
+    backend = _default_backend(backend)
+    if type(backend).scan is ScanBackend.scan:
+        return await wait_for_scan(iface, deadline)
+    return await _call(backend.scan, iface, deadline)
+
+async def scan(deadline=SCAN_DEADLINE, all_interfaces=False, backend=None):
+    """Scan and return a list of network dicts (empty if there is no interface).
+
+    With `all_interfaces` every adapter is scanned concurrently and the
+    results are merged by BSSID, as in scanner.scan_wifi.
+    """
+    backend = _default_backend(backend)
+    interfaces = await _call(backend.interfaces)
+    if not interfaces:
+        return []
+    if not all_interfaces:
+        results, _ = await scan_iface(interfaces[0], deadline, backend)
+        return parse_scan_results(results)
+
+    outcomes = await asyncio.gather(*(scan_iface(iface, deadline, backend) for iface in interfaces),
+                                    return_exceptions=True)
+    scans = {}
+    for iface, outcome in zip(interfaces, outcomes):
+        if isinstance(outcome, BaseException):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            logger.warning("Scan failed on %s: %s", iface.name(), outcome)
+            continue
+        results, latency = outcome
+        scans[iface.name()] = (parse_scan_results(results), latency)
+    return list(merge_scans(scans).values())
+
+async def iter_scans(interval=5.0, iface=None, count=None, history=None, deadline=SCAN_DEADLINE,
+                     columnar=False, backend=None):
+    """Async scanner.iter_scans: yield one {'timestamp', 'latency', 'networks'} batch per cycle.
+
+    Scans are pull-based and cycles missed by a slow consumer are skipped.
+    The loop ends when a replayed recording runs out.
+    """
+    loop = asyncio.get_running_loop()
+    backend = _default_backend(backend)
+    if iface is None:
+        interfaces = await _call(backend.interfaces)
+        if not interfaces:
+            return
+        iface = interfaces[0]
+    if history is None:
+        history = deque(maxlen=SCAN_HISTORY_SIZE)
+
+    next_due = loop.time()
+    produced = 0
+    while count is None or produced < count:
+        delay = next_due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            networks, latency = await scan_iface(iface, deadline, backend)
+        except EOFError:
+            return
+        except Exception as e:
+            logger.warning("Scan failed: %s", e)
+            networks, latency = [], 0.0
+        if columnar:
+            from records import ScanBatch
+            parsed = ScanBatch.from_profiles(networks)
+        else:
+            parsed = parse_scan_results(networks)
+        batch = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'latency': latency,
+            'networks': parsed
+        }
+        history.append(batch)
+        produced += 1
+        yield batch
+
+        now = loop.time()
+        next_due += interval
+        if next_due < now:
+            next_due = now if interval <= 0 else next_due + ((now - next_due) // interval + 1) * interval
+
+async def write_report(networks, filename=None, virtual=None, offline=False, compress=False):
+    """Render and write the HTML report off the event loop and return its filename."""
+    if virtual is None:
+        virtual = len(networks) > VIRTUAL_TABLE_THRESHOLD
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    if filename is None:
+        filename = f"wifi_scan_report_{timestamp}.html" + (".gz" if compress else "")
+    await _call(write_report_file, networks, filename, timestamp, virtual, offline, compress)
+    return filename
@@ -0,0 +1,409 @@
+"""Scanner backends.
+
+A backend lists interfaces and runs one scan on an interface, returning
+`(results, latency)` where each result is a pywifi-style Profile with
+`ssid`, `bssid`, `freq`, `signal`, `akm` and `cipher`. Everything
+downstream of the scan (parsing, reports, history) is backend-agnostic.
+
+- PyWiFiBackend: the original Windows path through pywifi.
+- IwBackend: Linux nl80211 scans through `iw`, parsed in one pass.
+- RecordingBackend / ReplayBackend: save raw results to a JSON lines file
+  and play them back at full speed without any Wi-Fi hardware.
+- CachingBackend: share scans between concurrent callers with a TTL.
+"""
+import json
+import platform
+import subprocess
+import threading
+import time
+
+from pywifi import PyWiFi, Profile
+
+import security
+from metrics import span
+from scanning import SCAN_DEADLINE, BackendUnavailable, logger, wait_for_scan
+
+class ScanBackend:
+    """Base class: list interfaces and scan one of them."""
+    name = None
+
+    def interfaces(self):
+        """Return interface objects with at least a name() method."""
+        raise NotImplementedError
+
+    def scan(self, iface, deadline=SCAN_DEADLINE):
+        """Scan on `iface` and return (results, latency in seconds)."""
+        return wait_for_scan(iface, deadline=deadline)
+
+class PyWiFiBackend(ScanBackend):
+    """Scan through pywifi (Windows WLAN API)."""
+    name = "pywifi"
+
+    def interfaces(self):
+        if platform.system() != "Windows":
+            raise BackendUnavailable("The pywifi backend only supports Windows. Use --backend iw on Linux.")
+        with span("interface_discovery"):
+            return PyWiFi().interfaces()
+
+# Authentication suite names printed by iw, mapped to pywifi AKM types or,
+# for suites pywifi has no type for, the extended codes in security.py
+_RSN_AKM = {
+    "PSK": security.AKM_WPA2_PSK,
+    "IEEE 802.1X": security.AKM_WPA2,
+    "FT/PSK": security.AKM_FT_PSK,
+    "PSK/SHA-256": security.AKM_PSK_SHA256,
+    "FT/IEEE 802.1X": security.AKM_FT_8021X,
+    "IEEE 802.1X/SHA-256": security.AKM_8021X_SHA256,
+    "IEEE 802.1X/SUITE-B": security.AKM_8021X_SUITE_B,
+    "IEEE 802.1X/SUITE-B-192": security.AKM_8021X_SUITE_B_192,
+    "FT/IEEE 802.1X/SHA-384": security.AKM_FT_8021X_SHA384,
+    "SAE": security.AKM_SAE,
+    "FT/SAE": security.AKM_FT_SAE,
+    "SAE-EXT-KEY": security.AKM_SAE_EXT_KEY,
+    "FT/SAE-EXT-KEY": security.AKM_SAE_EXT_KEY,
+    "OWE": security.AKM_OWE
+}
+_WPA_AKM = {"PSK": security.AKM_WPA_PSK, "IEEE 802.1X": security.AKM_WPA}
+_CIPHERS = {"CCMP": security.CIPHER_CCMP, "TKIP": security.CIPHER_TKIP,
+            "WEP-40": security.CIPHER_WEP, "WEP-104": security.CIPHER_WEP,
+            "GCMP": security.CIPHER_GCMP, "GCMP-256": security.CIPHER_GCMP_256,
+            "CCMP-256": security.CIPHER_CCMP_256}
+
+def _finish_bss(profile, privacy, sections):
+    """Fill in akm/cipher for a parsed BSS from its RSN/WPA sections."""
+    akm = []
+    cipher = None
+    # RSN (WPA2) first, so akm[0] is the strongest advertised suite
+    for element, table in (("RSN", _RSN_AKM), ("WPA", _WPA_AKM)):
+        section = sections.get(element)
+        if section is None:
+            continue
+        for suite in section.get("suites", ()):
+            akm.append(table.get(suite, security.AKM_UNKNOWN))
+        if cipher is None:
+            cipher = _CIPHERS.get(section.get("cipher"), security.CIPHER_UNKNOWN)
+    if cipher is None:
+        cipher = security.CIPHER_NONE
+    if not akm:
+        akm = [security.AKM_NONE]
+        if privacy:
+            cipher = security.CIPHER_WEP
+    profile.akm = akm
+    profile.cipher = cipher
+    profile.auth_suites = {element: section.get("suites", []) for element, section in sections.items()}
+    return profile
+
+def parse_iw_scan(lines):
+    """Parse `iw dev <if> scan [dump]` output, yielding one Profile per BSS.
+
+    Works line by line in a single pass, so output can be parsed while it
+    is still being read from the iw process.
+    """
+    profile = None
+    privacy = False
+    sections = {}
+    section = None
+    for line in lines:
+        if line.startswith("BSS "):
+            if profile is not None:
+                yield _finish_bss(profile, privacy, sections)
+            profile = Profile()
+            profile.bssid = line[4:21].lower()
+            profile.ssid = ""
+            profile.freq = 0
+            profile.signal = -100
+            privacy = False
+            sections = {}
+            section = None
+            continue
+        if profile is None:
+            continue
+
+        stripped = line.strip()
+        if not line.startswith("\t\t"):
+            section = None
+        if stripped.startswith("freq:"):
+            profile.freq = int(float(stripped[5:]))
+        elif stripped.startswith("signal:"):
+            profile.signal = int(float(stripped[7:].split()[0]))
+        elif stripped.startswith("SSID:"):
+            profile.ssid = stripped[6:]
+        elif stripped.startswith("capability:"):
+            privacy = "Privacy" in stripped
+        elif stripped.startswith(("RSN:", "WPA:")):
+            section = stripped[:3]
+            sections[section] = {}
+            stripped = stripped[4:].strip()
+
+        if section is not None and stripped.startswith("* "):
+            key, _, value = stripped[2:].partition(":")
+            if key == "Authentication suites":
+                sections[section]["suites"] = _split_suites(value)
+            elif key == "Pairwise ciphers":
+                sections[section]["cipher"] = value.split()[-1] if value.split() else None
+    if profile is not None:
+        yield _finish_bss(profile, privacy, sections)
+
+def _split_suites(value):
+    """Split an iw authentication suite list, keeping 'IEEE 802.1X' whole."""
+    suites = []
+    for token in value.split():
+        if suites and suites[-1] == "IEEE":
+            suites[-1] = f"IEEE {token}"
+        else:
+            suites.append(token)
+    return suites
+
+class IwInterface:
+    """A Linux wireless interface driven through the iw command."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+class IwBackend(ScanBackend):
+    """Scan Linux interfaces through `iw` (nl80211).
+
+    A full scan (`iw dev <if> scan`) blocks until the kernel reports
+    completion and needs CAP_NET_ADMIN. Without it the backend falls back
+    to `scan dump`, the kernel's cached results from earlier scans.
+    """
+    name = "iw"
+
+    def __init__(self, iw="iw"):
+        self.iw = iw
+
+    def interfaces(self):
+        with span("interface_discovery"):
+            try:
+                output = subprocess.run([self.iw, "dev"], capture_output=True, text=True, check=True).stdout
+            except FileNotFoundError:
+                raise BackendUnavailable(f"{self.iw} not found. Install iw or choose another --backend.")
+        return [IwInterface(line.split()[1]) for line in output.splitlines()
+                if line.strip().startswith("Interface ")]
+
+    def _run_scan(self, command, timeout=None):
+        """Run an iw scan command and return (return code, parsed results, stderr)."""
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        return completed.returncode, list(parse_iw_scan(completed.stdout.splitlines())), completed.stderr
+
+    def scan(self, iface, deadline=SCAN_DEADLINE):
+        name = iface.name()
+        start = time.monotonic()
+        with span("scan_wait", interface=name):
+            try:
+                returncode, results, error = self._run_scan([self.iw, "dev", name, "scan"], timeout=deadline)
+            except subprocess.TimeoutExpired:
+                returncode, error = None, f"no results within {deadline:.1f}s"
+            if returncode != 0:
+                logger.info("iw scan on %s failed (%s), using cached scan dump", name, error.strip())
+                returncode, results, error = self._run_scan([self.iw, "dev", name, "scan", "dump"])
+                if returncode != 0:
+                    raise RuntimeError(f"iw scan dump failed: {error.strip()}")
+        return results, time.monotonic() - start
+
+# Profile attributes saved by RecordingBackend and restored by ReplayBackend
+_RECORDED_FIELDS = ('ssid', 'bssid', 'freq', 'signal', 'akm', 'cipher')
+
+class RecordingBackend(ScanBackend):
+    """Wrap another backend and append every scan's raw results to a file.
+
+    Each line of the JSON lines file is one scan:
+    {"timestamp", "interface", "latency", "results": [{ssid, bssid, freq, signal, akm, cipher}]}.
+    """
+    name = "record"
+
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+
+    def interfaces(self):
+        return self.backend.interfaces()
+
+    def scan(self, iface, deadline=SCAN_DEADLINE):
+        results, latency = self.backend.scan(iface, deadline)
+        record = {
+            'timestamp': time.time(),
+            'interface': iface.name(),
+            'latency': latency,
+            'results': [{field: getattr(result, field, None) for field in _RECORDED_FIELDS} for result in results]
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        return results, latency
+
+class ReplayInterface:
+    """A recorded interface; each scan returns the next recorded result set."""
+
+    def __init__(self, name, scans, loop):
+        self._name = name
+        self.scans = scans
+        self.loop = loop
+        self.position = 0
+
+    def name(self):
+        return self._name
+
+    def next_scan(self):
+        if self.position >= len(self.scans):
+            if not self.loop or not self.scans:
+                raise EOFError(f"Replay of {self._name} is exhausted")
+            self.position = 0
+        scan = self.scans[self.position]
+        self.position += 1
+        return scan
+
+class ReplayBackend(ScanBackend):
+    """Play back scans saved by RecordingBackend.
+
+    Scans are returned immediately, ignoring the recorded latency, unless
+    `realtime` is set. With `loop` set the recording repeats forever.
+    """
+    name = "replay"
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self._interfaces = None
+
+    def interfaces(self):
+        if self._interfaces is None:
+            scans = {}
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        scans.setdefault(record['interface'], []).append(record)
+            self._interfaces = [ReplayInterface(name, records, self.loop) for name, records in scans.items()]
+        return self._interfaces
+
+    def scan(self, iface, deadline=SCAN_DEADLINE):
+        record = iface.next_scan()
+        if self.realtime:
+            time.sleep(min(record['latency'], deadline))
+        results = []
+        for fields in record['results']:
+            profile = Profile()
+            for field in _RECORDED_FIELDS:
+                setattr(profile, field, fields.get(field))
+            results.append(profile)
+        return results, record['latency'] if self.realtime else 0.0
+
+# Seconds a cached scan is served without touching the radio
+DEFAULT_CACHE_TTL = 10.0
+
+class _Flight:
+    """One in-flight scan that concurrent callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results = None
+        self.latency = 0.0
+        self.error = None
+
+class CachingBackend(ScanBackend):
+    """Wrap another backend so that concurrent callers share scans.
+
+    Results are cached per interface for `ttl` seconds; within the TTL
+    callers get them back (with zero latency) without touching the radio.
+    Callers that miss the cache while a scan is already running wait for
+    that scan instead of starting their own (single-flight). With
+    `stale_while_revalidate`, an expired entry is returned immediately
+    while one background scan refreshes it.
+
+    `stats` counts 'hits', 'stale_hits', 'coalesced' callers and radio 'scans'.
+    """
+    name = "cache"
+
+    def __init__(self, backend, ttl=DEFAULT_CACHE_TTL, stale_while_revalidate=False):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.lock = threading.Lock()
+        self.cache = {}
+        self.flights = {}
+        self.stats = {'hits': 0, 'stale_hits': 0, 'coalesced': 0, 'scans': 0}
+
+    def interfaces(self):
+        return self.backend.interfaces()
+
+    def invalidate(self, iface=None):
+        """Drop the cached results for `iface`, or for every interface."""
+        with self.lock:
+            if iface is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(iface.name(), None)
+
+    def scan(self, iface, deadline=SCAN_DEADLINE):
+        name = iface.name()
+        with self.lock:
+            cached = self.cache.get(name)
+            age = time.monotonic() - cached[0] if cached is not None else None
+            if age is not None and age < self.ttl:
+                self.stats['hits'] += 1
+                return cached[1], 0.0
+            flight = self.flights.get(name)
+            leader = flight is None
+            if leader:
+                flight = self.flights[name] = _Flight()
+                self.stats['scans'] += 1
+            if cached is not None and self.stale_while_revalidate:
+                self.stats['stale_hits'] += 1
+                if leader:
+                    threading.Thread(target=self._fly, args=(iface, deadline, flight),
+                                     name=f"revalidate-{name}", daemon=True).start()
+                return cached[1], 0.0
+            if not leader:
+                self.stats['coalesced'] += 1
+
+        if leader:
+            self._fly(iface, deadline, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.results, flight.latency
+
+    def _fly(self, iface, deadline, flight):
+        """Run the real scan for `flight`, cache it and release the waiters."""
+        name = iface.name()
+        try:
+            flight.results, flight.latency = self.backend.scan(iface, deadline)
+        except Exception as e:
+            flight.error = e
+            logger.info("Scan on %s failed: %s", name, e)
+        finally:
+            with self.lock:
+                if flight.error is None:
+                    self.cache[name] = (time.monotonic(), flight.results)
+                del self.flights[name]
+            flight.done.set()
+
+BACKENDS = {
+    "pywifi": PyWiFiBackend,
+    "iw": IwBackend
+}
+
+def get_backend(name=None, record=None, replay=None, loop=False, cache_ttl=None, stale_while_revalidate=False):
+    """Build a backend from command-line style options.
+
+    `replay` (a recording path) takes precedence over `name`; `record`
+    wraps whichever backend is chosen in a RecordingBackend. With no name,
+    pywifi is used on Windows and iw elsewhere. A `cache_ttl` (seconds)
+    puts a CachingBackend in front of it all.
+    """
+    if replay:
+        backend = ReplayBackend(replay, loop=loop)
+    else:
+        if name is None:
+            name = "pywifi" if platform.system() == "Windows" else "iw"
+        backend = BACKENDS[name]()
+    if record:
+        backend = RecordingBackend(backend, record)
+    if cache_ttl:
+        backend = CachingBackend(backend, cache_ttl, stale_while_revalidate)
+    return backend
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pywifi import Profile, const
+
+from scanner import (freq_to_channel, freqs_to_channels, get_security_type, normalize_frequency,
+                     parse_scan_results, write_html_report, REPORT_BUFFER_SIZE)
+from security import AKM_OWE, AKM_SAE, classify_security
+
+SIZES = [10, 1000, 100000, 1000000]
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# A benchmark regresses when it is this many times slower (or larger) than baseline.
+DEFAULT_TOLERANCE = 1.25
+
+# Distinct profiles generated per run; larger inputs repeat them, so the
+# test data stays small and the measurements reflect the code under test.
+PROFILE_POOL_SIZE = 4096
+
+# Center frequencies per band, in MHz
+BAND_FREQUENCIES = {
+    "2.4": [2407 + 5 * channel for channel in range(1, 14)],
+    "5": [5000 + 5 * channel for channel in (36, 40, 44, 48, 52, 56, 60, 64, 100, 104, 108, 112,
+                                             116, 120, 124, 128, 132, 136, 140, 144, 149, 153, 157, 161, 165)],
+    "6": [5950 + 5 * channel for channel in range(1, 234, 4)]
+}
+AKM_CHOICES = [
+    [const.AKM_TYPE_NONE],
+    [const.AKM_TYPE_WPAPSK],
+    [const.AKM_TYPE_WPA2PSK],
+    [const.AKM_TYPE_WPA2],
+    [const.AKM_TYPE_WPAPSK, const.AKM_TYPE_WPA2PSK],
+    [const.AKM_TYPE_UNKNOWN],
+    [AKM_SAE],
+    [const.AKM_TYPE_WPA2PSK, AKM_SAE],
+    [AKM_OWE]
+]
+
+def make_profiles(count, band_mix=(0.5, 0.4, 0.1), khz=True, seed=0):
+    """Return `count` pywifi-like scan results.
+
+    `band_mix` gives the 2.4/5/6 GHz proportions, and `khz` reports
+    frequencies in kHz as pywifi does on Windows. Results are drawn from a
+    pool of PROFILE_POOL_SIZE distinct profiles.
+    """
+    rng = random.Random(seed)
+    pool = []
+    for i in range(min(count, PROFILE_POOL_SIZE)):
+        band = rng.choices(list(BAND_FREQUENCIES), weights=band_mix)[0]
+        freq = rng.choice(BAND_FREQUENCIES[band])
+        profile = Profile()
+        profile.ssid = f"Net-{i:04d}" if rng.random() > 0.05 else ""
+        profile.bssid = ':'.join(f"{rng.randrange(256):02x}" for _ in range(6)) + ':'
+        profile.freq = freq * 1000 if khz else freq
+        profile.signal = rng.randint(-95, -30)
+        profile.akm = list(rng.choice(AKM_CHOICES))
+        pool.append(profile)
+    return [pool[i % len(pool)] for i in range(count)]
+
+def make_networks(count):
+    """Return `count` parsed network dicts built from synthetic profiles."""
+    pool = parse_scan_results(make_profiles(min(count, PROFILE_POOL_SIZE)))
+    return [pool[i % len(pool)] for i in range(count)]
+
+def _render_report(networks, virtual=False):
+    with open(os.devnull, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+        write_html_report(networks, f, virtual=virtual)
+
+def _setup(name, count):
+    """Return the zero-argument callable that runs benchmark `name` on `count` networks."""
+    if name == "freq_to_channel":
+        freqs = [normalize_frequency(profile.freq) for profile in make_profiles(count)]
+        return lambda: [freq_to_channel(freq) for freq in freqs]
+    if name == "freqs_to_channels":
+        freqs = [profile.freq for profile in make_profiles(count)]
+        return lambda: freqs_to_channels(freqs)
+    if name == "get_security_type":
+        profiles = make_profiles(count)
+        return lambda: [get_security_type(profile) for profile in profiles]
+    if name == "classify_security":
+        profiles = make_profiles(count)
+        akms = [tuple(profile.akm) for profile in profiles]
+        ciphers = [profile.cipher for profile in profiles]
+        return lambda: classify_security(akms, ciphers)
+    if name == "parse_scan_results":
+        profiles = make_profiles(count)
+        return lambda: parse_scan_results(profiles)
+    if name == "congestion":
+        from congestion import congestion_by_band
+        networks = make_networks(count)
+        return lambda: congestion_by_band(networks)
+    if name == "html_report":
+        networks = make_networks(count)
+        return lambda: _render_report(networks)
+    if name == "html_report_virtual":
+        networks = make_networks(count)
+        return lambda: _render_report(networks, virtual=True)
+    raise ValueError(f"Unknown benchmark: {name}")
+
+BENCHMARKS = ["freq_to_channel", "freqs_to_channels", "get_security_type", "classify_security",
+              "parse_scan_results", "congestion", "html_report", "html_report_virtual"]
+
+# Cold-start commands timed by --startup; {recording} is a synthetic replay file.
+SCANNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scanner.py")
+STARTUP_COMMANDS = {
+    "import": [sys.executable, "-c", "import scanner"],
+    "help": [sys.executable, SCANNER, "--help"],
+    "scan_replay": [sys.executable, SCANNER, "scan", "--replay", "{recording}", "--no-browser"]
+}
+STARTUP_RUNS = 5
+
+def write_recording(path, count=200):
+    """Write a one-scan replay recording of `count` synthetic networks."""
+    results = [{'ssid': profile.ssid, 'bssid': profile.bssid, 'freq': profile.freq, 'signal': profile.signal,
+                'akm': profile.akm, 'cipher': None} for profile in make_profiles(count)]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'timestamp': 0, 'interface': "bench0", 'latency': 0.0, 'results': results}) + '\n')
+
+def run_startup_benchmark(name, runs=STARTUP_RUNS):
+    """Return {'seconds', 'peak_bytes'} with the median wall time of a fresh process."""
+    with tempfile.TemporaryDirectory() as workdir:
+        recording = os.path.join(workdir, "recording.jsonl")
+        write_recording(recording)
+        command = [arg.format(recording=recording) for arg in STARTUP_COMMANDS[name]]
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(SCANNER))
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - start)
+    return {'seconds': statistics.median(times), 'peak_bytes': None}
+
+def run_benchmark(name, count, measure_memory=True):
+    """Return {'seconds', 'peak_bytes'} for one benchmark at one size."""
+    func = _setup(name, count)
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+
+    # Measure memory in a separate pass; tracemalloc slows allocation down.
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {'seconds': seconds, 'peak_bytes': peak}
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression messages for results worse than baseline."""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            old, new = previous.get(metric), result.get(metric)
+            # Ignore timings too small to compare reliably
+            if not old or new is None or (metric == 'seconds' and old < 0.001):
+                continue
+            if new > old * tolerance:
+                regressions.append(f"{key} {metric}: {old:.4g} -> {new:.4g} ({new / old:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Wi-Fi scanner pipeline on synthetic data.")
+    parser.add_argument("sizes", nargs="*", type=int, default=SIZES, help="network counts to benchmark")
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="run only these benchmarks")
+    parser.add_argument("--virtual", action="store_true", help="shorthand for --only html_report_virtual")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--startup", action="store_true", help="time cold starts of scanner.py instead")
+    parser.add_argument("--runs", type=int, default=STARTUP_RUNS, help="process launches per startup benchmark")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown factor before failing")
+    args = parser.parse_args()
+
+    results = {}
+    if args.startup:
+        print(f"{'Startup':<22} {'Median (ms)':>12}")
+        for name in STARTUP_COMMANDS:
+            result = run_startup_benchmark(name, args.runs)
+            results[f"startup/{name}"] = result
+            print(f"{name:<22} {result['seconds'] * 1000:>12.1f}")
+
+    names = [] if args.startup else args.only or (["html_report_virtual"] if args.virtual else BENCHMARKS)
+    if names:
+        print(f"{'Benchmark':<22} {'Networks':>10} {'Time (s)':>10} {'us/network':>12} {'Peak (KiB)':>12}")
+    for name in names:
+        for count in args.sizes:
+            result = run_benchmark(name, count, not args.no_memory)
+            results[f"{name}/{count}"] = result
+            peak = f"{result['peak_bytes'] / 1024:.1f}" if result['peak_bytes'] is not None else "-"
+            print(f"{name:<22} {count:>10} {result['seconds']:>10.3f} "
+                  f"{result['seconds'] / count * 1e6:>12.2f} {peak:>12}")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Performance regressions against baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""IEEE 802.11 channel plan: frequency to channel and band lookups.
+
+Scalar lookups go through dicts built from the channel plan; the batch
+variants index dense NumPy tables so a whole frequency column is mapped
+in one pass.
+"""
+
+# Frequencies above this are reported in kHz (pywifi on Windows) rather than MHz.
+KHZ_THRESHOLD = 100000
+
+def _build_channel_plan():
+    """Return {center frequency (MHz): (channel, band)} for the IEEE 802.11 channel plans."""
+    plan = {}
+    # 2.4 GHz: channels 1-13 on a 5 MHz raster, channel 14 is the Japanese outlier
+    for channel in range(1, 14):
+        plan[2407 + 5 * channel] = (channel, "2.4 GHz")
+    plan[2484] = (14, "2.4 GHz")
+    # 4.9 GHz (Japan) shares the 5 GHz channel numbering offset from 4000 MHz
+    for channel in range(183, 197):
+        plan[4000 + 5 * channel] = (channel, "5 GHz")
+    # 5 GHz: every 5 MHz step is a channel index (20/40/80/160 MHz centers included)
+    for channel in range(32, 178):
+        plan[5000 + 5 * channel] = (channel, "5 GHz")
+    # 6 GHz (Wi-Fi 6E): channel 2 at 5935 MHz, then 1-233 from 5950 MHz
+    plan[5935] = (2, "6 GHz")
+    for channel in range(1, 234):
+        plan[5950 + 5 * channel] = (channel, "6 GHz")
+    return plan
+
+_CHANNEL_PLAN = _build_channel_plan()
+_CHANNEL_BY_FREQ = {freq: channel for freq, (channel, _) in _CHANNEL_PLAN.items()}
+_BAND_BY_FREQ = {freq: band for freq, (_, band) in _CHANNEL_PLAN.items()}
+
+# Dense lookup table indexed by MHz; the extra trailing slot stays 0 and catches
+# out-of-range frequencies after clipping, so batch lookups need no branching.
+# They are built on first use so NumPy is only imported by batch lookups.
+_LOOKUP_TABLES = None
+
+# Band labels by code for the batch band lookup; code 0 is an unmapped frequency.
+BANDS = (None, "2.4 GHz", "5 GHz", "6 GHz")
+
+def _lookup_tables():
+    """Return the (channel, band) lookup tables, building them on first use."""
+    global _LOOKUP_TABLES
+    if _LOOKUP_TABLES is None:
+        import numpy as np
+        channel_lut = np.zeros(max(_CHANNEL_PLAN) + 2, dtype=np.int16)
+        band_lut = np.zeros(len(channel_lut), dtype=np.uint8)
+        for freq, (channel, band) in _CHANNEL_PLAN.items():
+            channel_lut[freq] = channel
+            band_lut[freq] = BANDS.index(band)
+        _LOOKUP_TABLES = channel_lut, band_lut
+    return _LOOKUP_TABLES
+
+def normalize_frequency(frequency):
+    """Convert a frequency reported in kHz to MHz; MHz values pass through."""
+    if frequency > KHZ_THRESHOLD:
+        return frequency // 1000
+    return frequency
+
+def freq_to_channel(frequency):
+    """Map a center frequency in MHz to its channel number, or None if unknown."""
+    return _CHANNEL_BY_FREQ.get(frequency)
+
+def freq_to_band(frequency):
+    """Map a center frequency in MHz to its band label, or None if unknown."""
+    return _BAND_BY_FREQ.get(frequency)
+
+def freqs_to_channels(frequencies):
+    """Map an array of frequencies (kHz or MHz) to channel numbers in one pass.
+
+    Returns an int16 NumPy array; frequencies outside the channel plans map to 0.
+    """
+    return _lookup_tables()[0][_lut_index(frequencies)]
+
+def freqs_to_bands(frequencies):
+    """Map an array of frequencies (kHz or MHz) to band codes indexing BANDS."""
+    return _lookup_tables()[1][_lut_index(frequencies)]
+
+def normalize_frequencies(frequencies):
+    """Convert an array of frequencies in kHz or MHz to MHz."""
+    import numpy as np
+    freqs = np.asarray(frequencies, dtype=np.int64)
+    return np.where(freqs > KHZ_THRESHOLD, freqs // 1000, freqs)
+
+def _lut_index(frequencies):
+    """Return lookup-table indices (MHz, clipped into the table) for frequencies."""
+    import numpy as np
+    return np.clip(normalize_frequencies(frequencies), 0, len(_lookup_tables()[0]) - 1)
@@ -0,0 +1,177 @@
+"""Signal-weighted channel congestion model and best-channel recommendation.
+
+Every network contributes its received power (dBm converted to mW) to
+each candidate 20 MHz channel in proportion to how much of that channel
+its spectrum covers:
+
+- 2.4 GHz networks occupy a 22 MHz mask around the center frequency, so
+  they interfere with channels up to four numbers away.
+- 5 and 6 GHz networks occupy a whole bonded block (40/80/160 MHz) around
+  their primary channel. Scan results do not report the bandwidth, so a
+  network's 'width' (MHz) is used when present and ASSUMED_WIDTHS otherwise.
+
+The result is an interference level per channel in dBm over the noise
+floor. Networks are first summed per distinct spectrum span, then the
+coverage of all spans over all candidate channels is computed as one
+NumPy matrix, so the cost grows with the number of spans, not networks.
+"""
+import numpy as np
+
+from channels import BANDS, freqs_to_bands, normalize_frequencies
+
+NOISE_FLOOR_DBM = -95.0
+
+# Channel width assumed for networks that do not report one, in MHz
+ASSUMED_WIDTHS = {"2.4 GHz": 20, "5 GHz": 80, "6 GHz": 80}
+
+# 2.4 GHz DSSS/OFDM spectral mask width, in MHz
+MASK_24GHZ = 22
+
+# Candidate 20 MHz channels per band: (channel, center frequency in MHz)
+CANDIDATE_CHANNELS = {
+    "2.4 GHz": [(channel, 2407 + 5 * channel) for channel in range(1, 14)],
+    "5 GHz": [(channel, 5000 + 5 * channel) for channel in
+              list(range(36, 65, 4)) + list(range(100, 145, 4)) + list(range(149, 166, 4))],
+    "6 GHz": [(channel, 5950 + 5 * channel) for channel in range(1, 234, 4)]
+}
+
+# 2.4 GHz recommendations are limited to the non-overlapping channels.
+RECOMMENDABLE_24GHZ = (1, 6, 11)
+
+# Lower edge (MHz) of the first channel-bonding block of each sub-band, highest
+# first; wide channels are aligned to multiples of their width from there.
+# In 5 GHz, U-NII-3 (channel 149 up) is aligned separately from channel 36.
+_BONDING_BASES = {
+    "5 GHz": (5735, 5170),
+    "6 GHz": (5945,)
+}
+
+# Multiplier packing a (low, high) span in MHz into one integer
+_SPAN_KEY = 1 << 16
+
+def _network_columns(networks):
+    """Return (frequency MHz, band code, signal dBm, width MHz) arrays for a scan."""
+    if hasattr(networks, 'columnar'):
+        frequency = networks.frequency.astype(np.int64)
+        band = networks.band
+        signal = networks.signal.astype(np.float64)
+        width = np.zeros(len(networks), dtype=np.int64)
+    else:
+        count = len(networks)
+        frequency = normalize_frequencies(np.fromiter((n['frequency'] for n in networks), np.int64, count))
+        band = freqs_to_bands(frequency)
+        signal = np.fromiter((n['signal'] for n in networks), np.float64, count)
+        width = np.fromiter((n.get('width') or 0 for n in networks), np.int64, count)
+    for code, label in enumerate(BANDS):
+        if label is not None:
+            width = np.where((width == 0) & (band == code), ASSUMED_WIDTHS[label], width)
+    return frequency, band, signal, width
+
+def network_spans(frequency, band, width):
+    """Return the (low, high) spectrum edges in MHz each network occupies."""
+    frequency = np.asarray(frequency, dtype=np.int64)
+    width = np.asarray(width, dtype=np.int64)
+    low = frequency - width // 2
+    high = frequency + width // 2
+
+    is_24 = band == BANDS.index("2.4 GHz")
+    low = np.where(is_24, frequency - MASK_24GHZ // 2, low)
+    high = np.where(is_24, frequency + MASK_24GHZ // 2, high)
+
+    # 5/6 GHz: a wide channel covers the whole bonded block containing its primary.
+    # Rows outside these bands may have no width; they are never selected, but
+    # must not divide by zero on the way.
+    divisor = np.where(width > 0, width, 1)
+    for label, bases in _BONDING_BASES.items():
+        in_band = band == BANDS.index(label)
+        assigned = np.zeros(len(frequency), dtype=bool)
+        for base in bases:
+            selected = in_band & ~assigned & (frequency >= base)
+            block_low = base + (frequency - base) // divisor * divisor
+            low = np.where(selected, block_low, low)
+            high = np.where(selected, block_low + width, high)
+            assigned |= selected
+    return low, high
+
+def congestion_by_band(networks):
+    """Model channel congestion for one scan.
+
+    Returns one dict per band that has networks, in band order:
+    {'band', 'channels', 'interference' (dBm per channel), 'load'
+    (overlap-weighted network count per channel), 'recommended',
+    'recommended_width', 'recommended_interference'}.
+    """
+    if not len(networks):
+        return []
+    frequency, band, signal, width = _network_columns(networks)
+    low, high = network_spans(frequency, band, width)
+    power = 10 ** (signal / 10)
+
+    results = []
+    for label, candidates in CANDIDATE_CHANNELS.items():
+        in_band = band == BANDS.index(label)
+        if not in_band.any():
+            continue
+        # Sum power and network count per distinct span before the matrix step
+        # (spans are packed into one integer key so np.unique stays one-dimensional)
+        keys, inverse = np.unique(low[in_band] * _SPAN_KEY + high[in_band], return_inverse=True)
+        inverse = inverse.ravel()
+        span_power = np.bincount(inverse, weights=power[in_band], minlength=len(keys))
+        span_count = np.bincount(inverse, minlength=len(keys))
+        spans = np.stack([keys // _SPAN_KEY, keys % _SPAN_KEY], axis=1)
+
+        channels = np.array([channel for channel, _ in candidates])
+        centers = np.array([center for _, center in candidates])
+        half = MASK_24GHZ / 2 if label == "2.4 GHz" else 10
+        # coverage[s, c]: fraction of candidate channel c covered by span s
+        overlap = (np.minimum(spans[:, 1:2], centers + half) - np.maximum(spans[:, 0:1], centers - half))
+        coverage = np.clip(overlap, 0, None) / (2 * half)
+
+        interference_mw = span_power @ coverage + 10 ** (NOISE_FLOOR_DBM / 10)
+        interference = 10 * np.log10(interference_mw)
+        load = span_count @ coverage
+
+        channel, rec_width = _recommend(label, channels, interference_mw)
+        results.append({
+            'band': label,
+            'channels': channels.tolist(),
+            'interference': np.round(interference, 1).tolist(),
+            'load': np.round(load, 2).tolist(),
+            'recommended': channel,
+            'recommended_width': rec_width,
+            'recommended_interference': round(float(interference[channels.tolist().index(channel)]), 1)
+        })
+    return results
+
+def _recommend(label, channels, interference_mw):
+    """Return (channel, width MHz) with the least interference in a band.
+
+    In 5/6 GHz the quietest complete bonded block of the assumed width is
+    chosen first, then its quietest 20 MHz channel as the primary.
+    """
+    if label == "2.4 GHz":
+        allowed = np.isin(channels, RECOMMENDABLE_24GHZ)
+        best = np.flatnonzero(allowed)[np.argmin(interference_mw[allowed])]
+        return int(channels[best]), 20
+
+    width = ASSUMED_WIDTHS[label]
+    centers = np.array([center for _, center in CANDIDATE_CHANNELS[label]])
+    block_low, _ = network_spans(centers, np.full(len(centers), BANDS.index(label)), np.full(len(centers), width))
+    blocks, block_index = np.unique(block_low, return_inverse=True)
+    block_index = block_index.ravel()
+    per_block = np.bincount(block_index, minlength=len(blocks))
+    block_total = np.bincount(block_index, weights=interference_mw, minlength=len(blocks))
+    complete = per_block == width // 20
+    if not complete.any():
+        return int(channels[np.argmin(interference_mw)]), 20
+    block = np.flatnonzero(complete)[np.argmin(block_total[complete])]
+    members = np.flatnonzero(block_index == block)
+    return int(channels[members[np.argmin(interference_mw[members])]]), width
+
+def recommend_channels(networks):
+    """Return {band: recommended channel} for one scan."""
+    return {entry['band']: entry['recommended'] for entry in congestion_by_band(networks)}
+
+def recommend_for_sites(sites):
+    """Return {site: congestion_by_band(networks)} for {site: networks}."""
+    return {site: congestion_by_band(networks) for site, networks in sites.items()}
@@ -1,31 +1,45 @@
-import os
+import argparse
 import subprocess
 import sys
 
-def create_executable():
-    """Create a standalone executable using PyInstaller."""
+def create_executable(onefile=False):
+    """Create a standalone executable using PyInstaller.
+
+    By default the build is a folder (--onedir) that starts directly from
+    disk. --onefile builds a single file, which unpacks itself to a
+    temporary directory on every launch and so starts noticeably slower.
+    """
     try:
         # Check if PyInstaller is installed
         import PyInstaller
     except ImportError:
         print("PyInstaller not found. Installing...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
-        
+
     print("Creating executable with PyInstaller...")
     subprocess.check_call([
-        sys.executable, 
-        "-m", 
-        "PyInstaller", 
-        "--onefile", 
-        "--name", 
+        sys.executable,
+        "-m",
+        "PyInstaller",
+        "--onefile" if onefile else "--onedir",
+        "--noconfirm",
+        "--name",
         "wifi_scanner",
-        "--icon", 
-        "NONE", 
+        "--icon",
+        "NONE",
+        "--exclude-module",
+        "tkinter",
         "scanner.py"
     ])
-    
+
     print("\nExecutable created successfully!")
-    print("You can find it in the 'dist' folder.")
+    if onefile:
+        print("You can find it in the 'dist' folder.")
+    else:
+        print("You can find it in 'dist/wifi_scanner'; ship the whole folder.")
 
 if __name__ == "__main__":
-    create_executable() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build the Wi-Fi scanner executable with PyInstaller.")
+    parser.add_argument("--onefile", action="store_true",
+                        help="build a single self-extracting file (slower to start) instead of a folder")
+    create_executable(parser.parse_args().onefile)
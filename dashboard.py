@@ -0,0 +1,218 @@
+"""Live dashboard: serve the report once and push scan updates over SSE.
+
+One scan loop feeds every connected browser. The page is the virtual,
+offline report; it then listens on /events (Server-Sent Events):
+
+- snapshot: all current networks, sent once when a client connects
+- delta:    delta records (see delta.py) after every scan
+- charts:   re-rendered inline SVG charts, only when they changed
+
+Each event is encoded once and written to every subscriber. A client
+that falls SUBSCRIBER_QUEUE_SIZE events behind is disconnected; its
+EventSource reconnects and starts again from a fresh snapshot.
+"""
+import asyncio
+import io
+import json
+
+from colorama import Fore, Style
+
+from delta import DeltaTracker
+from metrics import span
+from scanner import chart_fragments, iter_scans, write_html_report
+from scanning import SCAN_DEADLINE, BackendUnavailable, logger
+from tracking import SignalTracker
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Events buffered per client before it is considered too slow and dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+# Seconds between SSE comments that keep idle connections open through proxies
+KEEPALIVE_INTERVAL = 15.0
+
+# The live view reports every signal change, not just the 6 dB delta-log default
+LIVE_SIGNAL_THRESHOLD = 1
+
+def encode_event(event, data):
+    """Return one SSE message as bytes."""
+    payload = json.dumps(data, separators=(',', ':'))
+    return f"event: {event}\ndata: {payload}\n\n".encode('utf-8')
+
+class Broadcaster:
+    """Fan encoded events out to any number of subscriber queues."""
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = set()
+
+    def subscribe(self, first=None):
+        """Return a new subscriber queue, optionally starting with event `first`."""
+        queue = asyncio.Queue(self.queue_size)
+        if first is not None:
+            queue.put_nowait(first)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def publish(self, message):
+        """Queue `message` for every subscriber; slow subscribers are cut off."""
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.info("Dropping slow dashboard client")
+                self.unsubscribe(queue)
+                # An empty message tells the client's writer to close
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+class LiveDashboard:
+    """Run one scan loop and serve its results to browsers over HTTP."""
+
+    def __init__(self, interval=5.0, backend=None, host=DEFAULT_HOST, port=DEFAULT_PORT, deadline=SCAN_DEADLINE):
+        self.interval = interval
+        self.backend = backend
+        self.host = host
+        self.port = port
+        self.deadline = deadline
+        self.signals = SignalTracker()
+        self.tracker = DeltaTracker(LIVE_SIGNAL_THRESHOLD)
+        self.broadcaster = Broadcaster()
+        self.timestamp = None
+        self.charts = None
+        self.ready = None
+        # Why the scan loop ended before publishing anything, if it did
+        self.failure = None
+
+    def snapshot_event(self):
+        return encode_event("snapshot", {'timestamp': self.timestamp, 'networks': self.tracker.networks()})
+
+    async def scan_loop(self):
+        """Pull batches from iter_scans in a worker thread and publish them.
+
+        `ready` is set once the first batch is in, or when the loop ends
+        without one; pages are then served an error instead of waiting.
+        """
+        try:
+            await self._scan_batches()
+        except BackendUnavailable as e:
+            self.failure = str(e)
+            raise
+        except Exception as e:
+            self.failure = f"scanning failed: {e}"
+            raise
+        finally:
+            if self.timestamp is None and self.failure is None:
+                self.failure = "scanning stopped before the first scan completed"
+            self.ready.set()
+
+    async def _scan_batches(self):
+        loop = asyncio.get_running_loop()
+        scans = iter_scans(self.interval, deadline=self.deadline, backend=self.backend)
+        while True:
+            batch = await loop.run_in_executor(None, next, scans, None)
+            if batch is None:
+                logger.info("Scan loop finished")
+                return
+            with span("dashboard_publish"):
+                self.timestamp = batch['timestamp']
+                # Smooth before diffing, so sample noise doesn't become a stream of signal deltas
+                self.signals.update(batch['networks'])
+                networks = self.signals.annotate(batch['networks'])
+                deltas = self.tracker.update(networks)
+                self.broadcaster.publish(encode_event("delta", {
+                    'timestamp': self.timestamp, 'count': len(networks), 'deltas': deltas
+                }))
+                charts = chart_fragments(networks)
+                if charts != self.charts:
+                    self.charts = charts
+                    self.broadcaster.publish(encode_event("charts", charts))
+            self.ready.set()
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP request."""
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode('latin-1').split()
+            path = parts[1].split('?')[0] if len(parts) > 1 else "/"
+            if path == "/":
+                await self.ready.wait()
+                if self.timestamp is None:
+                    await self.send_response(writer, "503 Service Unavailable", "text/plain; charset=utf-8",
+                                             f"No scan data: {self.failure}\n".encode('utf-8'))
+                else:
+                    await self.send_page(writer)
+            elif path == "/events":
+                await self.send_events(writer)
+            elif path == "/snapshot":
+                body = json.dumps({'timestamp': self.timestamp, 'networks': self.tracker.networks()}).encode('utf-8')
+                await self.send_response(writer, "200 OK", "application/json", body)
+            else:
+                await self.send_response(writer, "404 Not Found", "text/plain", b"Not found\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def send_response(self, writer, status, content_type, body):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+        writer.write(body)
+        await writer.drain()
+
+    async def send_page(self, writer):
+        page = io.StringIO()
+        write_html_report(self.tracker.networks(), page, live=True)
+        await self.send_response(writer, "200 OK", "text/html; charset=utf-8", page.getvalue().encode('utf-8'))
+
+    async def send_events(self, writer):
+        """Stream events to one client until it disconnects or falls behind."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+        first = self.snapshot_event() if self.ready.is_set() else None
+        queue = self.broadcaster.subscribe(first)
+        if self.charts is not None:
+            queue.put_nowait(encode_event("charts", self.charts))
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    return
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self.broadcaster.unsubscribe(queue)
+
+    async def serve(self):
+        self.ready = asyncio.Event()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"{Fore.GREEN}Live dashboard at http://{self.host}:{self.port}/ (Ctrl+C to stop){Style.RESET_ALL}")
+        async with server:
+            scanning = asyncio.create_task(self.scan_loop())
+            scanning.add_done_callback(_report_scan_loop)
+            try:
+                await server.serve_forever()
+            finally:
+                scanning.cancel()
+
+def _report_scan_loop(task):
+    """Log why the scan loop stopped, if it failed."""
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None:
+        logger.warning("Scan loop failed: %r", error)
+        print(f"{Fore.RED}Scanning stopped: {error}. The dashboard has no new data.{Style.RESET_ALL}")
+
+def serve_dashboard(interval=5.0, backend=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Run the live dashboard until interrupted."""
+    asyncio.run(LiveDashboard(interval, backend, host, port).serve())
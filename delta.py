@@ -0,0 +1,295 @@
+"""Incremental deltas between successive scans.
+
+A DeltaTracker keeps the last reported state of every network, keyed by
+BSSID (or SSID when no BSSID is known), and turns each new scan into a
+short list of delta records:
+
+- appeared:    a new network, with all of its fields
+- disappeared: a network missing from the scan
+- channel:     channel (and frequency/band) changed
+- security:    security type changed
+- signal:      signal moved by at least the threshold since it was last reported
+
+Applying the deltas in order with apply_deltas() rebuilds the tracked
+state, so a sensor can ship and store deltas instead of full scans.
+
+Next to a delta log, save_checkpoint() keeps a snapshot of the state
+together with the log size it covers (PATH.state). load_tracker() starts
+from the snapshot and replays only the log lines appended after it, so
+restoring the state doesn't get slower as the log grows.
+"""
+import html
+import json
+import os
+from collections import Counter
+from datetime import datetime
+
+from colorama import Fore, Style
+
+# Signal changes smaller than this (in dB) are not reported.
+DELTA_SIGNAL_THRESHOLD = 6
+
+DEFAULT_DELTA_PATH = "wifi_scan_deltas.jsonl"
+
+# Delta batches appended by a running monitor between state checkpoints
+CHECKPOINT_INTERVAL = 50
+
+CHANGE_TYPES = ("appeared", "disappeared", "channel", "security", "signal")
+
+_NETWORK_FIELDS = ('ssid', 'bssid', 'frequency', 'channel', 'band', 'signal', 'security')
+
+def network_key(network):
+    """Return the identity a network is tracked under: its BSSID, else its SSID."""
+    bssid = network.get('bssid')
+    return bssid if bssid else f"ssid:{network['ssid']}"
+
+class DeltaTracker:
+    """Turn successive scans into delta records against the last reported state."""
+
+    def __init__(self, signal_threshold=DELTA_SIGNAL_THRESHOLD):
+        self.signal_threshold = signal_threshold
+        self.state = {}
+
+    def update(self, networks):
+        """Compare a scan with the tracked state, update it and return the deltas."""
+        deltas = []
+        seen = set()
+        for network in networks:
+            key = network_key(network)
+            seen.add(key)
+            previous = self.state.get(key)
+            if previous is None:
+                current = {field: network.get(field) for field in _NETWORK_FIELDS}
+                self.state[key] = current
+                deltas.append(dict(current, change="appeared"))
+                continue
+
+            ident = {'bssid': previous['bssid'], 'ssid': previous['ssid']}
+            channel = network.get('channel')
+            if channel != previous['channel']:
+                deltas.append(dict(ident, change="channel", old=previous['channel'], new=channel,
+                                   frequency=network.get('frequency'), band=network.get('band')))
+                previous['channel'] = channel
+                previous['frequency'] = network.get('frequency')
+                previous['band'] = network.get('band')
+            security = network.get('security')
+            if security != previous['security']:
+                deltas.append(dict(ident, change="security", old=previous['security'], new=security))
+                previous['security'] = security
+            signal = network.get('signal')
+            if abs(signal - previous['signal']) >= self.signal_threshold:
+                deltas.append(dict(ident, change="signal", old=previous['signal'], new=signal))
+                previous['signal'] = signal
+
+        for key in [key for key in self.state if key not in seen]:
+            previous = self.state.pop(key)
+            deltas.append({'change': "disappeared", 'bssid': previous['bssid'], 'ssid': previous['ssid']})
+        return deltas
+
+    def networks(self):
+        """Return the tracked state as a list of network dicts."""
+        return [dict(network) for network in self.state.values()]
+
+def diff_scans(previous, current, signal_threshold=DELTA_SIGNAL_THRESHOLD):
+    """Return the delta records that turn scan `previous` into scan `current`."""
+    tracker = DeltaTracker(signal_threshold)
+    tracker.update(previous)
+    return tracker.update(current)
+
+def apply_deltas(state, deltas):
+    """Apply delta records to `state` ({key: network dict}) in place and return it."""
+    for delta in deltas:
+        change = delta['change']
+        key = network_key(delta)
+        if change == "appeared":
+            state[key] = {field: delta.get(field) for field in _NETWORK_FIELDS}
+        elif change == "disappeared":
+            state.pop(key, None)
+        elif change == "channel":
+            state[key].update(channel=delta['new'], frequency=delta['frequency'], band=delta['band'])
+        else:
+            state[key][change] = delta['new']
+    return state
+
+def iter_deltas(batches, tracker=None):
+    """Turn iter_scans batches into delta batches.
+
+    Each delta batch is {'timestamp', 'latency', 'count', 'deltas'}, where
+    'count' is the number of networks in the full scan. The first batch
+    reports every network as appeared unless `tracker` already holds state.
+    """
+    if tracker is None:
+        tracker = DeltaTracker()
+    for batch in batches:
+        yield {
+            'timestamp': batch['timestamp'],
+            'latency': batch['latency'],
+            'count': len(batch['networks']),
+            'deltas': tracker.update(batch['networks'])
+        }
+
+def summarize(deltas):
+    """Return a short '+appeared -disappeared ~changed' summary of delta records."""
+    counts = Counter(delta['change'] for delta in deltas)
+    changed = sum(counts[change] for change in ("channel", "security", "signal"))
+    return f"+{counts['appeared']} -{counts['disappeared']} ~{changed}"
+
+def append_delta_log(path, delta_batch):
+    """Append one delta batch to a JSON lines delta log."""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(delta_batch) + '\n')
+
+def checkpoint_path(path):
+    """Return where the state checkpoint of the delta log at `path` is kept."""
+    return path + ".state"
+
+def save_checkpoint(path, tracker):
+    """Snapshot `tracker`'s state as of the current end of the delta log at `path`."""
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+    target = checkpoint_path(path)
+    # Write then rename, so an interrupted save leaves the previous checkpoint intact
+    with open(target + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({'offset': offset, 'state': tracker.state}, f)
+    os.replace(target + ".tmp", target)
+
+def _load_checkpoint(path, size):
+    """Return (offset, state) from the checkpoint of the log at `path`, or (0, {}) if unusable."""
+    try:
+        with open(checkpoint_path(path), encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0, {}
+    # A log shorter than the checkpoint was truncated or replaced: replay it all
+    if not isinstance(checkpoint, dict) or not 0 <= checkpoint.get('offset', -1) <= size:
+        return 0, {}
+    return checkpoint['offset'], checkpoint['state']
+
+def load_tracker(path, signal_threshold=DELTA_SIGNAL_THRESHOLD):
+    """Rebuild a DeltaTracker from the delta log at `path`, if it exists.
+
+    The state starts from the log's checkpoint, if any, and only the
+    delta batches appended after it are replayed.
+    """
+    tracker = DeltaTracker(signal_threshold)
+    if not os.path.exists(path):
+        return tracker
+    offset, tracker.state = _load_checkpoint(path, os.path.getsize(path))
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if line.strip():
+                apply_deltas(tracker.state, json.loads(line)['deltas'])
+    return tracker
+
+_DELTA_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Wi-Fi Delta Report - {timestamp}</title>
+    <style>
+{css}    </style>
+</head>
+<body class="bg-gray-900 text-gray-200 min-h-screen">
+    <div class="container mx-auto px-4 py-8">
+        <div class="bg-gray-800 shadow-lg rounded-lg overflow-hidden">
+            <div class="bg-gradient-to-r from-blue-900 to-indigo-900 px-6 py-4">
+                <div class="flex justify-between items-center">
+                    <h1 class="text-white text-2xl font-bold">Wi-Fi Changes Since Last Scan</h1>
+                    <div class="text-gray-300 text-sm">{generated}</div>
+                </div>
+                <div class="text-blue-200 mt-1">
+                    <p>Networks: {count}</p>
+                    <p>Changes: {summary}</p>
+                </div>
+            </div>
+            <div class="p-6 overflow-x-auto">
+                <table class="min-w-full bg-gray-800 border border-gray-700">
+                    <thead>
+                        <tr class="bg-gray-700">
+                            <th class="px-6 py-3 border-b border-gray-600 text-left text-xs font-semibold text-gray-300 uppercase tracking-wider">Change</th>
+                            <th class="px-6 py-3 border-b border-gray-600 text-left text-xs font-semibold text-gray-300 uppercase tracking-wider">SSID</th>
+                            <th class="px-6 py-3 border-b border-gray-600 text-left text-xs font-semibold text-gray-300 uppercase tracking-wider">BSSID</th>
+                            <th class="px-6 py-3 border-b border-gray-600 text-left text-xs font-semibold text-gray-300 uppercase tracking-wider">Details</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+"""
+
+_DELTA_ROW = """                        <tr class="hover:bg-gray-700">
+                            <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600">
+                                <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full {badge_class}">{change}</span>
+                            </td>
+                            <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600 text-sm font-medium text-gray-200">{ssid}</td>
+                            <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600 text-sm text-gray-300">{bssid}</td>
+                            <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600 text-sm text-gray-300">{details}</td>
+                        </tr>
+"""
+
+_DELTA_END = """                    </tbody>
+                </table>
+            </div>
+        </div>
+    </div>
+    <script>
+        const deltas = """
+
+_CHANGE_BADGES = {
+    "appeared": "bg-green-600 text-gray-100",
+    "disappeared": "bg-red-600 text-gray-100"
+}
+_CHANGED_BADGE = "bg-yellow-600 text-gray-100"
+
+def _delta_details(delta):
+    """Return a one-line human-readable description of a delta record."""
+    change = delta['change']
+    if change == "appeared":
+        return (f"Channel {delta['channel'] or 'Unknown'} ({delta['frequency']} MHz), "
+                f"{delta['signal']} dBm, {delta['security']}")
+    if change == "disappeared":
+        return "No longer visible"
+    if change == "signal":
+        return f"{delta['old']} dBm &rarr; {delta['new']} dBm"
+    return f"{html.escape(str(delta['old']))} &rarr; {html.escape(str(delta['new']))}"
+
+def write_delta_html(delta_batch, f):
+    """Stream a self-contained HTML report of one delta batch to `f`."""
+    from report_assets import OFFLINE_CSS
+    deltas = delta_batch['deltas']
+    f.write(_DELTA_HEAD.format(
+        timestamp=html.escape(str(delta_batch.get('timestamp'))),
+        css=OFFLINE_CSS,
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        count=delta_batch.get('count', "-"),
+        summary=summarize(deltas)
+    ))
+    for delta in deltas:
+        change = delta['change']
+        f.write(_DELTA_ROW.format(
+            badge_class=_CHANGE_BADGES.get(change, _CHANGED_BADGE),
+            change=change,
+            ssid=html.escape(delta['ssid']),
+            bssid=delta['bssid'] or "-",
+            details=_delta_details(delta)
+        ))
+    f.write(_DELTA_END)
+    # Escape "</" so SSIDs cannot close the script element
+    f.write(json.dumps(deltas).replace('</', '<\\/'))
+    f.write(";\n    </script>\n</body>\n</html>\n")
+
+def write_delta_json(delta_batch, f):
+    """Write one delta batch to `f` as JSON."""
+    json.dump(delta_batch, f)
+    f.write('\n')
+
+def generate_delta_report(delta_batch, fmt="html"):
+    """Write a delta-only report (`fmt` 'html' or 'json') and return its filename."""
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    filename = f"wifi_delta_report_{timestamp}.{fmt}"
+    with open(filename, 'w', encoding='utf-8') as f:
+        if fmt == "json":
+            write_delta_json(delta_batch, f)
+        else:
+            write_delta_html(delta_batch, f)
+    print(f"{Fore.GREEN}Delta report generated: {os.path.abspath(filename)}{Style.RESET_ALL}")
+    return filename
@@ -0,0 +1,204 @@
+"""Streaming scan exports: CSV, JSON Lines and a binary columnar format.
+
+Every writer appends one scan batch ({'timestamp', 'networks'}, as
+yielded by iter_scans) to the end of its file, so a sensor can export
+every cycle without rewriting what is already there. Each row is one
+observation: timestamp, bssid, ssid, frequency, channel, band, signal,
+security. Signals are the raw samples, as in the scan history.
+
+The binary format (.wscan) is a 64-byte header followed by fixed-width
+little-endian records of RECORD_DTYPE. Because every record has the same
+size, read_binary() maps the file with np.memmap and returns a structured
+array without parsing or copying; a half-written last record left by an
+interrupted append is ignored.
+
+    records = read_binary("office.wscan")
+    channel_stats(records)
+
+read_networks() reads any of the three formats back as network dicts.
+"""
+import csv
+import json
+import os
+import struct
+import time
+from datetime import datetime
+
+import numpy as np
+
+from channels import BANDS
+
+FIELDS = ('timestamp', 'bssid', 'ssid', 'frequency', 'channel', 'band', 'signal', 'security')
+
+# One observation in the binary format. SSIDs are at most 32 bytes (802.11),
+# stored UTF-8 encoded and NUL-padded; band is a code into channels.BANDS and
+# security a records.Security code; bssid is packed into 48 bits, 0 when unknown.
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('bssid', '<u8'),
+    ('ssid', 'S32'),
+    ('frequency', '<u2'),
+    ('channel', '<i2'),
+    ('signal', '<i2'),
+    ('band', 'u1'),
+    ('security', 'u1')
+])
+
+BINARY_MAGIC = b"WSCANCOL"
+BINARY_VERSION = 1
+HEADER_SIZE = 64
+
+# magic, version, record size, padding to HEADER_SIZE
+_HEADER = struct.Struct(f"<8sHH{HEADER_SIZE - 12}x")
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.wscan': 'binary'}
+
+def _epoch(timestamp):
+    """Return a batch timestamp (ISO string, epoch or None) as epoch seconds."""
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return float(timestamp)
+
+def _rows(batch):
+    """Yield (timestamp, bssid, ssid, frequency, channel, band, signal, security) for a batch."""
+    timestamp = _epoch(batch.get('timestamp'))
+    for n in batch['networks']:
+        yield (timestamp, n.get('bssid'), n['ssid'], n['frequency'], n['channel'], n.get('band'),
+               n.get('signal_raw', n['signal']), n['security'])
+
+def append_csv(path, batch):
+    """Append one batch to a CSV file, writing the header if the file is new."""
+    new = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if new:
+            writer.writerow(FIELDS)
+        writer.writerows(_rows(batch))
+
+def append_jsonl(path, batch):
+    """Append one batch to a JSON Lines file, one object per observation."""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(json.dumps(dict(zip(FIELDS, row))) + '\n' for row in _rows(batch))
+
+def to_records(batch):
+    """Return a batch as a RECORD_DTYPE array."""
+    from records import ScanBatch
+    networks = batch['networks']
+    if not hasattr(networks, 'columnar'):
+        columns = ScanBatch.from_networks(networks)
+        columns.signal = np.asarray([n.get('signal_raw', n['signal']) for n in networks], dtype=np.int16)
+        networks = columns
+    records = np.zeros(len(networks), dtype=RECORD_DTYPE)
+    records['timestamp'] = _epoch(batch.get('timestamp'))
+    records['bssid'] = networks.bssid
+    records['ssid'] = [name.encode('utf-8')[:32] for name in networks.ssid]
+    records['frequency'] = networks.frequency
+    records['channel'] = networks.channel
+    records['signal'] = networks.signal
+    records['band'] = networks.band
+    records['security'] = networks.security
+    return records
+
+def append_binary(path, batch):
+    """Append one batch to a binary columnar file, writing the header if the file is new."""
+    records = to_records(batch)
+    with open(path, 'ab') as f:
+        if f.tell() == 0:
+            f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, RECORD_DTYPE.itemsize))
+        f.write(records.tobytes())
+
+WRITERS = {'csv': append_csv, 'jsonl': append_jsonl, 'binary': append_binary}
+
+def export_format(path):
+    """Return the export format for a file name by its extension."""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unknown export format for {path!r}; use one of {', '.join(FORMATS)}")
+    return fmt
+
+def append_batch(path, batch, fmt=None):
+    """Append one batch to `path` in `fmt` ('csv', 'jsonl' or 'binary'; by extension if not given)."""
+    WRITERS[fmt or export_format(path)](path, batch)
+
+def read_binary(path):
+    """Map a binary columnar file and return its records as a read-only structured array.
+
+    Columns are views into the mapping: records['signal'] and the like
+    are NumPy arrays that read straight from the page cache.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: not a scan export (file too short)")
+    magic, version, record_size = _HEADER.unpack(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"{path}: not a scan export")
+    if version != BINARY_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: unsupported export version {version}")
+    count = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+def channel_stats(records):
+    """Return per-(band, channel) signal statistics for binary export records.
+
+    Returns a list of {'band', 'channel', 'observations', 'mean', 'min',
+    'max'} dicts in band and channel order, computed in bulk.
+    """
+    keys = records['band'].astype(np.int32) * 1024 + records['channel']
+    unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    signal = records['signal'].astype(np.float64)
+    counts = np.bincount(inverse, minlength=len(unique))
+    means = np.bincount(inverse, weights=signal, minlength=len(unique)) / np.maximum(counts, 1)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    minimum = np.minimum.reduceat(signal[order], starts) if len(order) else signal
+    maximum = np.maximum.reduceat(signal[order], starts) if len(order) else signal
+    return [
+        {'band': BANDS[key // 1024], 'channel': int(key % 1024) or None, 'observations': int(count),
+         'mean': round(float(mean), 1), 'min': int(low), 'max': int(high)}
+        for key, count, mean, low, high in zip(unique, counts, means, minimum, maximum)
+    ]
+
+def to_networks(records):
+    """Decode binary export records back into network dicts (with 'timestamp')."""
+    from records import Security, int_to_bssid
+    return [
+        {'timestamp': float(record['timestamp']), 'ssid': record['ssid'].decode('utf-8', 'replace'),
+         'bssid': int_to_bssid(record['bssid']), 'frequency': int(record['frequency']),
+         'channel': int(record['channel']) or None, 'band': BANDS[record['band']],
+         'signal': int(record['signal']), 'security': Security(int(record['security'])).label}
+        for record in records
+    ]
+
+def _optional(value, convert=str):
+    """Convert a CSV cell, reading an empty cell as None."""
+    return convert(value) if value != '' else None
+
+def read_csv(path):
+    """Return the observations in a CSV export as network dicts (with 'timestamp')."""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [
+            {'timestamp': float(row['timestamp']), 'ssid': row['ssid'], 'bssid': _optional(row['bssid']),
+             'frequency': int(row['frequency']), 'channel': _optional(row['channel'], int),
+             'band': _optional(row['band']), 'signal': int(row['signal']), 'security': row['security']}
+            for row in csv.DictReader(f)
+        ]
+
+def read_jsonl(path):
+    """Return the observations in a JSON Lines export as network dicts (with 'timestamp')."""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl}
+
+def read_networks(path, fmt=None):
+    """Return the observations in an export file of any format as network dicts."""
+    fmt = fmt or export_format(path)
+    if fmt == 'binary':
+        return to_networks(read_binary(path))
+    return READERS[fmt](path)
@@ -0,0 +1,270 @@
+"""Merge scans exported by many sensors into one combined view.
+
+Each sensor contributes files it has already written: HTML reports
+(plain or .html.gz, table or virtual), JSON lists of network dicts, or
+the .csv, .jsonl and .wscan files appended by --export. Networks without
+a BSSID (virtual reports from older versions) merge by SSID and
+frequency.
+
+Files are read and merged in a process pool, map-reduce style:
+
+- map:    each worker loads a chunk of files and merges them into one
+          partial table keyed by BSSID, plus per-sensor channel and
+          security counts
+- reduce: the parent merges the few partial tables
+
+A merged network is its strongest observation plus 'sensor' (where it
+was strongest) and 'sensors' ({sensor: signal}), like merge_scans does
+for interfaces. The per-sensor channel and security counts are printed
+in the summary and shown in the report's Sensors section.
+
+    python scanner.py aggregate office=office.html lab/*.html.gz
+"""
+import gzip
+import html
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from colorama import Fore, Style
+
+from channels import freq_to_band
+from export import FORMATS, read_networks
+from metrics import span
+from scanner import generate_html_report
+from scanning import logger
+
+# Markers in front of the embedded data of a table and a virtual report
+_DATA_MARKERS = ("const networkData = ", "let columns = ")
+
+# Chunks per worker, so one slow (large) file doesn't leave other workers idle
+CHUNKS_PER_WORKER = 4
+
+# Channels and security types listed per sensor in the summary and report
+TOP_ENTRIES = 3
+
+def sensor_file(argument):
+    """Split a 'sensor=path' argument; without a name the sensor is the file name."""
+    sensor, sep, path = argument.partition("=")
+    if not sep:
+        path = argument
+        sensor = os.path.basename(path)
+        for suffix in (".gz", ".html", ".json", *FORMATS):
+            if sensor.endswith(suffix):
+                sensor = sensor[:-len(suffix)]
+    return sensor, path
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, encoding='utf-8')
+
+def _from_columns(columns):
+    """Turn the columnar data of a virtual report back into network dicts."""
+    security = columns['securityLabels']
+    bands = columns['bandLabels']
+    # Reports from before the bssid column have none
+    bssids = columns.get('bssid') or [None] * len(columns['ssid'])
+    return [
+        {'ssid': ssid, 'bssid': bssid, 'frequency': frequency, 'channel': channel or None,
+         'band': bands[band] if bands[band] != "Unknown" else None, 'signal': signal, 'security': security[code]}
+        for ssid, bssid, frequency, channel, signal, code, band in zip(
+            columns['ssid'], bssids, columns['frequency'], columns['channel'], columns['signal'],
+            columns['security'], columns['band'])
+    ]
+
+def load_networks(path):
+    """Return the network dicts stored in an exported scan file."""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is not None:
+        return read_networks(path, fmt)
+    with _open_text(path) as f:
+        text = f.read()
+    if not text.lstrip().startswith("<"):
+        data = json.loads(text)
+        return data['networks'] if isinstance(data, dict) else data
+
+    for marker in _DATA_MARKERS:
+        start = text.find(marker)
+        if start != -1:
+            data, _ = json.JSONDecoder().raw_decode(text, start + len(marker))
+            return _from_columns(data) if isinstance(data, dict) else data
+    raise ValueError(f"{path}: no embedded network data found")
+
+def _merge_network(merged, network, sensor):
+    """Fold one observation into a {key: network} table."""
+    key = network.get('bssid') or (network['ssid'], network['frequency'])
+    signal = network['signal']
+    entry = merged.get(key)
+    if entry is None:
+        entry = merged[key] = dict(network, sensor=sensor, sensors={})
+        entry.pop('signals', None)
+        entry.pop('interface', None)
+    elif signal > entry['signal']:
+        sensors = entry['sensors']
+        entry.update(network, sensor=sensor, sensors=sensors)
+    previous = entry['sensors'].get(sensor)
+    if previous is None or signal > previous:
+        entry['sensors'][sensor] = signal
+
+def _merge_files(files):
+    """Map step: load and merge a chunk of (sensor, path) files.
+
+    Returns (networks by key, {sensor: stats}, [(path, error)]).
+    """
+    merged = {}
+    sensors = {}
+    errors = []
+    for sensor, path in files:
+        try:
+            networks = load_networks(path)
+        except (OSError, ValueError, KeyError) as e:
+            errors.append((path, str(e)))
+            continue
+        stats = sensors.setdefault(sensor, {'files': 0, 'observations': 0, 'channels': Counter(),
+                                            'security': Counter()})
+        stats['files'] += 1
+        stats['observations'] += len(networks)
+        for network in networks:
+            if not network.get('band') and network.get('frequency'):
+                network['band'] = freq_to_band(network['frequency'])
+            if network.get('channel') is not None:
+                stats['channels'][network.get('band'), network['channel']] += 1
+            stats['security'][network['security']] += 1
+            _merge_network(merged, network, sensor)
+    return merged, sensors, errors
+
+def _reduce(partials):
+    """Reduce step: merge the partial results of the map step."""
+    merged = {}
+    sensors = {}
+    errors = []
+    for partial, partial_sensors, partial_errors in partials:
+        if not merged:
+            merged = partial
+        else:
+            for key, entry in partial.items():
+                current = merged.get(key)
+                if current is None:
+                    merged[key] = entry
+                    continue
+                for sensor, signal in entry['sensors'].items():
+                    previous = current['sensors'].get(sensor)
+                    if previous is None or signal > previous:
+                        current['sensors'][sensor] = signal
+                if entry['signal'] > current['signal']:
+                    entry['sensors'] = current['sensors']
+                    merged[key] = entry
+        for sensor, stats in partial_sensors.items():
+            total = sensors.get(sensor)
+            if total is None:
+                sensors[sensor] = stats
+            else:
+                for field in ('files', 'observations', 'channels', 'security'):
+                    total[field] += stats[field]
+        errors.extend(partial_errors)
+    return merged, sensors, errors
+
+def aggregate(files, workers=None):
+    """Merge exported scans from many sensors.
+
+    `files` is a list of (sensor, path). Returns {'networks': merged network
+    dicts, 'sensors': {sensor: {'files', 'observations', 'networks',
+    'channels', 'security'}}, 'errors': [(path, message)]}. Channel counts
+    are keyed by (band, channel).
+    """
+    files = list(files)
+    workers = min(workers or os.cpu_count() or 1, len(files) or 1)
+    size = max(1, -(-len(files) // (workers * CHUNKS_PER_WORKER)))
+    chunks = [files[i:i + size] for i in range(0, len(files), size)]
+    with span("fleet_aggregate", files=len(files), workers=workers):
+        if workers == 1:
+            merged, sensors, errors = _reduce(map(_merge_files, chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                merged, sensors, errors = _reduce(pool.map(_merge_files, chunks))
+
+    networks = list(merged.values())
+    network_counts = Counter(sensor for network in networks for sensor in network['sensors'])
+    for sensor, stats in sensors.items():
+        stats['networks'] = network_counts[sensor]
+    return {'networks': networks, 'sensors': sensors, 'errors': errors}
+
+def fleet_totals(sensors):
+    """Return (channel counts, security counts) summed over every sensor's observations."""
+    channels = Counter()
+    security = Counter()
+    for stats in sensors.values():
+        channels += stats['channels']
+        security += stats['security']
+    return channels, security
+
+def _channel_label(key):
+    band, channel = key
+    return f"{channel} ({band})" if band else str(channel)
+
+def _top_channels(channels, count=TOP_ENTRIES):
+    return ", ".join(f"{_channel_label(key)}: {n}" for key, n in channels.most_common(count))
+
+def _top_security(security, count=TOP_ENTRIES):
+    return ", ".join(f"{label}: {n}" for label, n in security.most_common(count))
+
+def print_fleet_summary(result):
+    """Print one line per sensor, fleet-wide channel and security counts, and unreadable files."""
+    for path, message in result['errors']:
+        print(f"{Fore.RED}Skipped {path}: {message}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}{'Sensor':<30} {'Files':<8} {'Observations':<14} {'Networks':<10} {'Strongest here':<15} "
+          f"{'Busiest channel':<20}{Style.RESET_ALL}")
+    print("-" * 100)
+    strongest = Counter(network['sensor'] for network in result['networks'])
+    for sensor, stats in sorted(result['sensors'].items()):
+        busiest = _top_channels(stats['channels'], 1) or "-"
+        print(f"{sensor:<30} {stats['files']:<8} {stats['observations']:<14} {stats['networks']:<10} "
+              f"{strongest[sensor]:<15} {busiest:<20}")
+    channels, security = fleet_totals(result['sensors'])
+    print(f"{Fore.CYAN}{len(result['networks'])} distinct networks from {len(result['sensors'])} sensors{Style.RESET_ALL}")
+    if channels:
+        print(f"Busiest channels (observations): {_top_channels(channels)}")
+    if security:
+        print(f"Security (observations): {_top_security(security, len(security))}")
+
+_FLEET_SECTION = """            <!-- Per-sensor observation counts of an aggregated report -->
+            <div id="fleet" class="p-6 bg-gray-800">
+                <h2 class="text-xl font-semibold mb-4 text-white">Sensors ({count})</h2>
+                <p class="text-sm text-gray-400 mb-4">{summary}</p>
+                <table class="min-w-full text-sm text-gray-300">
+                    <thead class="text-xs uppercase text-gray-400">
+                        <tr><th class="px-4 py-2 text-left">Sensor</th><th class="px-4 py-2 text-left">Files</th><th class="px-4 py-2 text-left">Observations</th><th class="px-4 py-2 text-left">Networks</th><th class="px-4 py-2 text-left">Busiest channels</th><th class="px-4 py-2 text-left">Security</th></tr>
+                    </thead>
+                    <tbody>
+{rows}                    </tbody>
+                </table>
+            </div>
+"""
+
+_FLEET_ROW = """                        <tr><td class="px-4 py-2">{sensor}</td><td class="px-4 py-2">{files}</td><td class="px-4 py-2">{observations}</td><td class="px-4 py-2">{networks}</td><td class="px-4 py-2">{channels}</td><td class="px-4 py-2">{security}</td></tr>
+"""
+
+def fleet_section(sensors):
+    """Render the per-sensor and fleet-wide channel and security counts as a report section."""
+    escape = html.escape
+    rows = ''.join(_FLEET_ROW.format(sensor=escape(sensor), files=stats['files'],
+                                     observations=stats['observations'], networks=stats['networks'],
+                                     channels=escape(_top_channels(stats['channels'])),
+                                     security=escape(_top_security(stats['security'])))
+                   for sensor, stats in sorted(sensors.items()))
+    channels, security = fleet_totals(sensors)
+    summary = (f"All sensors: {sum(stats['observations'] for stats in sensors.values())} observations. "
+               f"Busiest channels: {_top_channels(channels) or '-'}. "
+               f"Security: {_top_security(security, len(security)) or '-'}.")
+    return _FLEET_SECTION.format(count=len(sensors), summary=escape(summary), rows=rows)
+
+def aggregate_report(arguments, workers=None, open_browser=True, offline=False, compress=False):
+    """Merge the 'sensor=path' or 'path' arguments and write one combined HTML report."""
+    files = [sensor_file(argument) for argument in arguments]
+    result = aggregate(files, workers)
+    logger.info("Aggregated %d files into %d networks", len(files), len(result['networks']))
+    print_fleet_summary(result)
+    return generate_html_report(result['networks'], open_browser=open_browser, offline=offline, compress=compress,
+                                fleet=result['sensors'])
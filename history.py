@@ -0,0 +1,162 @@
+"""Persistent scan history backed by SQLite.
+
+Every scan is stored as one row in `scans` plus one row per network in
+`observations`, written in a single transaction. Observations are indexed
+by BSSID, SSID, channel and time so trend queries don't scan the table.
+"""
+import sqlite3
+import time
+from datetime import datetime
+
+DEFAULT_HISTORY_PATH = "wifi_scan_history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    sensor TEXT,
+    network_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    timestamp REAL NOT NULL,
+    bssid TEXT,
+    ssid TEXT NOT NULL,
+    frequency INTEGER,
+    channel INTEGER,
+    band TEXT,
+    signal INTEGER,
+    security TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scans_timestamp ON scans(timestamp);
+CREATE INDEX IF NOT EXISTS idx_observations_bssid ON observations(bssid, timestamp);
+CREATE INDEX IF NOT EXISTS idx_observations_ssid ON observations(ssid, timestamp);
+CREATE INDEX IF NOT EXISTS idx_observations_channel ON observations(channel, timestamp);
+CREATE INDEX IF NOT EXISTS idx_observations_timestamp ON observations(timestamp);
+"""
+
+# Columns that observation queries may filter on
+_FILTER_COLUMNS = {'bssid', 'ssid', 'frequency', 'channel', 'band', 'security'}
+
+def _to_epoch(value):
+    """Convert a datetime, ISO string or epoch number to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+def hours_ago(hours):
+    """Return the epoch time `hours` hours before now, for use as `since`."""
+    return time.time() - hours * 3600
+
+class ScanHistory:
+    """Append-only store of scan results with indexed queries.
+
+    Writes use WAL journaling with synchronous=NORMAL, so recording a scan
+    costs one fsync-free transaction and readers never block the writer.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, networks, timestamp=None, sensor=None):
+        """Store one scan of network dicts and return its scan id."""
+        return self.record_batches([{'timestamp': timestamp, 'networks': networks}], sensor)[0]
+
+    def record_batches(self, batches, sensor=None):
+        """Store several iter_scans-style batches in one transaction.
+
+        Returns the new scan ids in order. Batches without a timestamp are
+        stamped with the current time. Networks smoothed by a
+        tracking.SignalTracker are stored with their raw 'signal_raw'.
+        """
+        scan_ids = []
+        with self.conn:
+            for batch in batches:
+                timestamp = _to_epoch(batch.get('timestamp')) or time.time()
+                networks = batch['networks']
+                cursor = self.conn.execute(
+                    "INSERT INTO scans (timestamp, sensor, network_count) VALUES (?, ?, ?)",
+                    (timestamp, batch.get('sensor', sensor), len(networks))
+                )
+                scan_id = cursor.lastrowid
+                self.conn.executemany(
+                    "INSERT INTO observations (scan_id, timestamp, bssid, ssid, frequency, channel, band, signal, security) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(scan_id, timestamp, n.get('bssid'), n['ssid'], n['frequency'], n['channel'],
+                      n.get('band'), n.get('signal_raw', n['signal']), n['security']) for n in networks]
+                )
+                scan_ids.append(scan_id)
+        return scan_ids
+
+    def _where(self, since, until, **columns):
+        """Build a WHERE clause from a time range and column equality filters."""
+        clauses = []
+        params = []
+        for column, value in columns.items():
+            if column not in _FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter observations on {column!r}")
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_to_epoch(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(_to_epoch(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def signal_history(self, ssid=None, bssid=None, since=None, until=None):
+        """Return [(timestamp, bssid, signal)] for an SSID or BSSID, oldest first."""
+        where, params = self._where(since, until, ssid=ssid, bssid=bssid)
+        return self.conn.execute(
+            f"SELECT timestamp, bssid, signal FROM observations{where} ORDER BY timestamp", params
+        ).fetchall()
+
+    def networks_on_channel(self, channel, band=None, since=None, until=None):
+        """Return one dict per BSSID seen on `channel`, strongest signal first.
+
+        Each dict has 'bssid', 'ssid', 'band', 'security', 'first_seen',
+        'last_seen', 'observations' and 'max_signal'.
+        """
+        where, params = self._where(since, until, channel=channel, band=band)
+        rows = self.conn.execute(
+            "SELECT bssid, ssid, band, security, MIN(timestamp), MAX(timestamp), COUNT(*), MAX(signal) "
+            f"FROM observations{where} GROUP BY bssid, ssid ORDER BY MAX(signal) DESC", params
+        ).fetchall()
+        keys = ('bssid', 'ssid', 'band', 'security', 'first_seen', 'last_seen', 'observations', 'max_signal')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def observations(self, since=None, until=None, **columns):
+        """Return observation dicts matching column filters (e.g. ssid=, channel=)."""
+        where, params = self._where(since, until, **columns)
+        cursor = self.conn.execute(
+            f"SELECT timestamp, bssid, ssid, frequency, channel, band, signal, security FROM observations{where} "
+            "ORDER BY timestamp", params
+        )
+        keys = [column[0] for column in cursor.description]
+        return [dict(zip(keys, row)) for row in cursor]
+
+    def scans(self, since=None, until=None):
+        """Return [(scan id, timestamp, sensor, network count)] in time order."""
+        where, params = self._where(since, until)
+        return self.conn.execute(
+            f"SELECT id, timestamp, sensor, network_count FROM scans{where} ORDER BY timestamp", params
+        ).fetchall()
@@ -0,0 +1,134 @@
+"""Timing spans and latency histograms for the scanner pipeline.
+
+Wrap a stage in `span("stage_name")` to record its duration into the
+default registry. Histograms can be written out as a Prometheus textfile
+(for node_exporter's textfile collector) or appended as JSON lines.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds; an implicit +Inf bucket follows.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = "wifi_scanner_stage_seconds"
+
+class Histogram:
+    """Fixed-bucket latency histogram with a running count and sum."""
+    __slots__ = ('counts', 'count', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self):
+        """Return [(upper bound, cumulative count)] including '+Inf'."""
+        total = 0
+        buckets = []
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+class Metrics:
+    """Registry of per-stage histograms, keyed by stage name and labels."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.enabled = True
+
+    def observe(self, stage, seconds, **labels):
+        key = (stage, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage, **labels):
+        """Time the enclosed block and record it under `stage`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def snapshot(self):
+        """Return [(stage, labels dict, histogram copy)] sorted by stage."""
+        with self.lock:
+            items = []
+            for (stage, labels), histogram in sorted(self.histograms.items()):
+                copy = Histogram()
+                copy.counts = list(histogram.counts)
+                copy.count = histogram.count
+                copy.sum = histogram.sum
+                items.append((stage, dict(labels), copy))
+            return items
+
+    def to_prometheus(self):
+        """Return the histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each scanner pipeline stage.",
+            f"# TYPE {METRIC_NAME} histogram"
+        ]
+        for stage, labels, histogram in self.snapshot():
+            label_text = ','.join(f'{key}="{_escape_label(value)}"' for key, value in
+                                  [('stage', stage)] + sorted(labels.items()))
+            for bound, count in histogram.cumulative():
+                lines.append(f'{METRIC_NAME}_bucket{{{label_text},le="{bound}"}} {count}')
+            lines.append(f"{METRIC_NAME}_sum{{{label_text}}} {histogram.sum:.6f}")
+            lines.append(f"{METRIC_NAME}_count{{{label_text}}} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Atomically replace `path` with the current Prometheus textfile."""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def append_jsonl(self, path):
+        """Append one JSON line per stage with the current histogram state."""
+        timestamp = time.time()
+        with open(path, 'a', encoding='utf-8') as f:
+            for stage, labels, histogram in self.snapshot():
+                f.write(json.dumps({
+                    'timestamp': timestamp,
+                    'stage': stage,
+                    'labels': labels,
+                    'count': histogram.count,
+                    'sum': round(histogram.sum, 6),
+                    'buckets': {str(bound): count for bound, count in histogram.cumulative()}
+                }) + '\n')
+
+    def export(self, path):
+        """Write metrics to `path`: Prometheus text for .prom, JSON lines otherwise."""
+        if path.endswith('.prom'):
+            self.write_prometheus(path)
+        else:
+            self.append_jsonl(path)
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+# Default registry used by the scanner
+METRICS = Metrics()
+span = METRICS.span
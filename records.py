@@ -0,0 +1,202 @@
+"""Compact record types for holding many scans in memory.
+
+`Network` is a slotted single-network record and `ScanBatch` a
+struct-of-arrays holding a whole scan in NumPy columns. Both support the
+`record['key']` access the report and history code use on network dicts,
+so they can be passed to generate_html_report and ScanHistory directly.
+"""
+import sys
+from enum import IntEnum
+
+import numpy as np
+
+from channels import BANDS, freqs_to_bands, freqs_to_channels, normalize_frequencies
+from metrics import span
+from scanning import normalize_bssid
+from security import CIPHER_NONE, classify_security
+
+class Security(IntEnum):
+    """Security type codes; `label` is the string used in reports."""
+    UNKNOWN = 0
+    OPEN = 1
+    WPA = 2
+    WPA_PSK = 3
+    WPA2 = 4
+    WPA2_PSK = 5
+    WEP = 6
+    OWE = 7
+    WPA_WPA2 = 8
+    WPA_WPA2_PSK = 9
+    WPA2_WPA3_SAE = 10
+    WPA3_SAE = 11
+    WPA3_ENTERPRISE_192 = 12
+
+    @property
+    def label(self):
+        return _SECURITY_LABELS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        """Return the code for a report label; unrecognized labels are UNKNOWN."""
+        return _SECURITY_BY_LABEL.get(label, cls.UNKNOWN)
+
+_SECURITY_LABELS = {
+    Security.UNKNOWN: "Unknown",
+    Security.OPEN: "Open",
+    Security.WPA: "WPA",
+    Security.WPA_PSK: "WPA-PSK",
+    Security.WPA2: "WPA2",
+    Security.WPA2_PSK: "WPA2-PSK",
+    Security.WEP: "WEP",
+    Security.OWE: "OWE",
+    Security.WPA_WPA2: "WPA/WPA2",
+    Security.WPA_WPA2_PSK: "WPA/WPA2-PSK",
+    Security.WPA2_WPA3_SAE: "WPA2/WPA3-SAE",
+    Security.WPA3_SAE: "WPA3-SAE",
+    Security.WPA3_ENTERPRISE_192: "WPA3-Enterprise-192"
+}
+_SECURITY_BY_LABEL = {label: code for code, label in _SECURITY_LABELS.items()}
+
+def bssid_to_int(bssid):
+    """Pack a colon-separated BSSID into a 48-bit integer; None becomes 0."""
+    return int(bssid.replace(':', ''), 16) if bssid else 0
+
+def int_to_bssid(value):
+    """Unpack a 48-bit integer BSSID; 0 becomes None."""
+    if not value:
+        return None
+    digits = f"{int(value):012x}"
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+class Network:
+    """One observed network, stored without a per-instance __dict__."""
+    __slots__ = ('ssid', 'bssid', 'frequency', 'channel', 'band', 'signal', 'security')
+
+    def __init__(self, ssid, bssid, frequency, channel, band, signal, security):
+        self.ssid = sys.intern(ssid)
+        self.bssid = bssid
+        self.frequency = frequency
+        self.channel = channel
+        self.band = band
+        self.signal = signal
+        self.security = Security(security)
+
+    @classmethod
+    def from_dict(cls, network):
+        return cls(network['ssid'], network.get('bssid'), network['frequency'], network['channel'],
+                   network.get('band'), network['signal'], Security.from_label(network['security']))
+
+    def __getitem__(self, key):
+        if key == 'security':
+            return self.security.label
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Return the record as a network dict, as produced by parse_scan_results."""
+        return {key: self[key] for key in self.__slots__}
+
+    def __repr__(self):
+        return f"Network({self.to_dict()!r})"
+
+class ScanBatch:
+    """A scan stored as parallel columns rather than a list of dicts.
+
+    frequency (MHz), channel (0 when unmapped), signal, band (code into
+    channels.BANDS) and security (Security code) are NumPy arrays; bssid is
+    packed into uint64. SSIDs are interned, so repeated names across
+    batches share one string.
+    """
+
+    def __init__(self, ssid, bssid, frequency, channel, signal, band, security):
+        self.ssid = [sys.intern(name) for name in ssid]
+        self.bssid = np.asarray(bssid, dtype=np.uint64)
+        self.frequency = np.asarray(frequency, dtype=np.uint16)
+        self.channel = np.asarray(channel, dtype=np.int16)
+        self.signal = np.asarray(signal, dtype=np.int16)
+        self.band = np.asarray(band, dtype=np.uint8)
+        self.security = np.asarray(security, dtype=np.uint8)
+
+    @classmethod
+    def from_profiles(cls, profiles):
+        """Build a batch from raw pywifi scan results, mapping channels in bulk."""
+        with span("result_parsing"):
+            freqs = [profile.freq for profile in profiles]
+            with span("channel_mapping"):
+                channels = freqs_to_channels(freqs)
+                bands = freqs_to_bands(freqs)
+            with span("security_decoding"):
+                security = classify_security([getattr(profile, 'akm', None) for profile in profiles],
+                                             [getattr(profile, 'cipher', CIPHER_NONE) for profile in profiles])
+            return cls(
+                ssid=[profile.ssid or "<Hidden>" for profile in profiles],
+                bssid=[bssid_to_int(normalize_bssid(getattr(profile, 'bssid', None))) for profile in profiles],
+                frequency=normalize_frequencies(freqs),
+                channel=channels,
+                signal=[profile.signal for profile in profiles],
+                band=bands,
+                security=security
+            )
+
+    @classmethod
+    def from_networks(cls, networks):
+        """Build a batch from network dicts (or Network records)."""
+        return cls(
+            ssid=[n['ssid'] for n in networks],
+            bssid=[bssid_to_int(n.get('bssid')) for n in networks],
+            frequency=[n['frequency'] for n in networks],
+            channel=[n['channel'] or 0 for n in networks],
+            signal=[n['signal'] for n in networks],
+            band=[BANDS.index(n.get('band')) for n in networks],
+            security=[Security.from_label(n['security']) for n in networks]
+        )
+
+    def __len__(self):
+        return len(self.ssid)
+
+    def __getitem__(self, index):
+        channel = int(self.channel[index])
+        return Network(
+            self.ssid[index],
+            int_to_bssid(self.bssid[index]),
+            int(self.frequency[index]),
+            channel or None,
+            BANDS[self.band[index]],
+            int(self.signal[index]),
+            int(self.security[index])
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_dicts(self):
+        """Return the batch as a list of network dicts."""
+        return [network.to_dict() for network in self]
+
+    def columnar(self):
+        """Return the columns in the layout of the virtualized HTML report."""
+        return {
+            'ssid': self.ssid,
+            'bssid': [int_to_bssid(value) for value in self.bssid.tolist()],
+            'frequency': self.frequency.tolist(),
+            'channel': self.channel.tolist(),
+            'signal': self.signal.tolist(),
+            'security': self.security.tolist(),
+            'band': self.band.tolist(),
+            'securityLabels': [code.label for code in Security],
+            'bandLabels': [band or "Unknown" for band in BANDS]
+        }
+
+    @property
+    def nbytes(self):
+        """Bytes held by the numeric columns (SSID strings not included)."""
+        return sum(column.nbytes for column in
+                   (self.bssid, self.frequency, self.channel, self.signal, self.band, self.security))
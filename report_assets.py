@@ -0,0 +1,180 @@
+"""Assets for self-contained offline reports: purged CSS and inline SVG charts."""
+import base64
+import html
+import math
+import struct
+import zlib
+
+# Precompiled subset of Tailwind CSS v3 covering exactly the classes used by
+# the report templates in scanner.py. Regenerate by hand when a template
+# gains a new utility class.
+OFFLINE_CSS = """*,::before,::after{box-sizing:border-box;border:0 solid #e5e7eb}
+body{margin:0;line-height:1.5;font-family:ui-sans-serif,system-ui,-apple-system,"Segoe UI",Roboto,"Helvetica Neue",Arial,sans-serif}
+h1,h2,p{margin:0;font-size:inherit;font-weight:inherit}
+table{border-collapse:collapse;text-indent:0;border-color:inherit}
+th{text-align:inherit;font-weight:inherit}
+button,input,select{font:inherit;color:inherit;margin:0;padding:0}
+button{background:transparent;cursor:pointer}
+svg{display:block}
+.container{width:100%}
+@media (min-width:640px){.container{max-width:640px}}
+@media (min-width:768px){.container{max-width:768px}.md\\:grid-cols-2{grid-template-columns:repeat(2,minmax(0,1fr))}}
+@media (min-width:1024px){.container{max-width:1024px}}
+@media (min-width:1280px){.container{max-width:1280px}}
+@media (min-width:1536px){.container{max-width:1536px}}
+.absolute{position:absolute}.relative{position:relative}.top-0{top:0}.left-0{left:0}
+.mx-auto{margin-left:auto;margin-right:auto}.mt-1{margin-top:.25rem}.mt-8{margin-top:2rem}.mb-2{margin-bottom:.5rem}.mb-4{margin-bottom:1rem}
+.flex{display:flex}.inline-flex{display:inline-flex}.grid{display:grid}.flex-wrap{flex-wrap:wrap}
+.grid-cols-1{grid-template-columns:repeat(1,minmax(0,1fr))}
+.items-center{align-items:center}.justify-between{justify-content:space-between}
+.gap-2{gap:.5rem}.gap-6{gap:1.5rem}.space-x-2>:not([hidden])~:not([hidden]){margin-left:.5rem}
+.w-full{width:100%}.min-w-full{min-width:100%}.min-h-screen{min-height:100vh}.h-2\\.5{height:.625rem}.h-\\[250px\\]{height:250px}
+.table-fixed{table-layout:fixed}
+.overflow-hidden{overflow:hidden}.overflow-x-auto{overflow-x:auto}.overflow-y-auto{overflow-y:auto}
+.whitespace-nowrap{white-space:nowrap}.cursor-pointer{cursor:pointer}
+.rounded{border-radius:.25rem}.rounded-lg{border-radius:.5rem}.rounded-full{border-radius:9999px}
+.border{border-width:1px}.border-b{border-bottom-width:1px}.border-gray-600{border-color:#4b5563}.border-gray-700{border-color:#374151}
+.bg-gray-600{background-color:#4b5563}.bg-gray-700{background-color:#374151}.bg-gray-800{background-color:#1f2937}.bg-gray-900{background-color:#111827}
+.bg-blue-700{background-color:#1d4ed8}.bg-green-400{background-color:#4ade80}.bg-green-500{background-color:#22c55e}.bg-green-600{background-color:#16a34a}
+.bg-red-500{background-color:#ef4444}.bg-red-600{background-color:#dc2626}.bg-yellow-400{background-color:#facc15}.bg-yellow-600{background-color:#ca8a04}.bg-orange-400{background-color:#fb923c}
+.bg-gradient-to-r{background-image:linear-gradient(to right,var(--tw-gradient-stops))}
+.from-blue-900{--tw-gradient-from:#1e3a8a;--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to,rgba(30,58,138,0))}.to-indigo-900{--tw-gradient-to:#312e81}
+.p-4{padding:1rem}.p-6{padding:1.5rem}.px-2{padding-left:.5rem;padding-right:.5rem}.px-3{padding-left:.75rem;padding-right:.75rem}.px-4{padding-left:1rem;padding-right:1rem}.px-6{padding-left:1.5rem;padding-right:1.5rem}
+.py-2{padding-top:.5rem;padding-bottom:.5rem}.py-3{padding-top:.75rem;padding-bottom:.75rem}.py-4{padding-top:1rem;padding-bottom:1rem}.py-8{padding-top:2rem;padding-bottom:2rem}
+.text-left{text-align:left}.text-xs{font-size:.75rem;line-height:1rem}.text-sm{font-size:.875rem;line-height:1.25rem}.text-lg{font-size:1.125rem;line-height:1.75rem}.text-xl{font-size:1.25rem;line-height:1.75rem}.text-2xl{font-size:1.5rem;line-height:2rem}
+.font-medium{font-weight:500}.font-semibold{font-weight:600}.font-bold{font-weight:700}.uppercase{text-transform:uppercase}.leading-5{line-height:1.25rem}.tracking-wider{letter-spacing:.05em}
+.text-white{color:#fff}.text-gray-100{color:#f3f4f6}.text-gray-200{color:#e5e7eb}.text-gray-300{color:#d1d5db}.text-gray-400{color:#9ca3af}.text-blue-200{color:#bfdbfe}
+.shadow{box-shadow:0 1px 3px 0 rgb(0 0 0/.1),0 1px 2px -1px rgb(0 0 0/.1)}.shadow-lg{box-shadow:0 10px 15px -3px rgb(0 0 0/.1),0 4px 6px -4px rgb(0 0 0/.1)}
+.hover\\:bg-blue-800:hover{background-color:#1e40af}.hover\\:bg-gray-600:hover{background-color:#4b5563}.hover\\:bg-gray-700:hover{background-color:#374151}
+@media print{button,input,select{display:none}}
+"""
+
+# Palette for pie slices, matching the online Chart.js report
+PIE_COLORS = (
+    'rgba(54, 162, 235, 0.6)',
+    'rgba(255, 99, 132, 0.6)',
+    'rgba(255, 206, 86, 0.6)',
+    'rgba(75, 192, 192, 0.6)',
+    'rgba(153, 102, 255, 0.6)',
+    'rgba(255, 159, 64, 0.6)'
+)
+
+TEXT_COLOR = "#f0f0f0"
+GRID_COLOR = "rgba(255, 255, 255, 0.1)"
+
+def _nice_step(maximum, ticks=5):
+    """Return an integer axis step giving roughly `ticks` gridlines up to `maximum`."""
+    raw = max(maximum / ticks, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return int(factor * magnitude)
+    return int(10 * magnitude)
+
+def svg_bar_chart(bars, width=800, height=250, x_title=None, y_title=None):
+    """Render a vertical bar chart as an inline SVG string.
+
+    `bars` is a list of (label, value, color, tooltip) tuples.
+    """
+    left, right, top, bottom = 48, 8, 8, 40 if x_title else 24
+    plot_width = width - left - right
+    plot_height = height - top - bottom
+    maximum = max((value for _, value, _, _ in bars), default=0) or 1
+    step = _nice_step(maximum)
+    axis_max = step * math.ceil(maximum / step)
+
+    parts = [f'<svg viewBox="0 0 {width} {height}" width="100%" height="100%" '
+             f'preserveAspectRatio="xMidYMid meet" font-size="11" fill="{TEXT_COLOR}" role="img">']
+    for tick in range(0, axis_max + 1, step):
+        y = top + plot_height - tick / axis_max * plot_height
+        parts.append(f'<line x1="{left}" x2="{width - right}" y1="{y:.1f}" y2="{y:.1f}" stroke="{GRID_COLOR}"/>')
+        parts.append(f'<text x="{left - 6}" y="{y + 4:.1f}" text-anchor="end">{tick}</text>')
+
+    slot = plot_width / max(len(bars), 1)
+    bar_width = slot * 0.8
+    for i, (label, value, color, tooltip) in enumerate(bars):
+        bar_height = value / axis_max * plot_height
+        x = left + i * slot + (slot - bar_width) / 2
+        y = top + plot_height - bar_height
+        parts.append(f'<rect x="{x:.1f}" y="{y:.1f}" width="{bar_width:.1f}" height="{bar_height:.1f}" '
+                     f'fill="{color}"><title>{html.escape(tooltip)}</title></rect>')
+        parts.append(f'<text x="{x + bar_width / 2:.1f}" y="{top + plot_height + 14}" '
+                     f'text-anchor="middle">{html.escape(label)}</text>')
+
+    if x_title:
+        parts.append(f'<text x="{left + plot_width / 2:.1f}" y="{height - 4}" text-anchor="middle">{html.escape(x_title)}</text>')
+    if y_title:
+        parts.append(f'<text transform="translate(12 {top + plot_height / 2:.1f}) rotate(-90)" '
+                     f'text-anchor="middle">{html.escape(y_title)}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def svg_pie_chart(slices, width=400, height=300):
+    """Render a pie chart with a legend on the right as an inline SVG string.
+
+    `slices` is a list of (label, value) tuples.
+    """
+    total = sum(value for _, value in slices) or 1
+    radius = min(height / 2 - 10, width * 0.3)
+    cx, cy = radius + 10, height / 2
+
+    parts = [f'<svg viewBox="0 0 {width} {height}" width="100%" font-size="12" fill="{TEXT_COLOR}" role="img">']
+    angle = -math.pi / 2
+    for i, (label, value) in enumerate(slices):
+        color = PIE_COLORS[i % len(PIE_COLORS)]
+        title = f'<title>{html.escape(label)}: {value}</title>'
+        if value == total:
+            parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius:.1f}" fill="{color}">{title}</circle>')
+            continue
+        sweep = value / total * 2 * math.pi
+        x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        angle += sweep
+        x2, y2 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        large_arc = 1 if sweep > math.pi else 0
+        parts.append(f'<path d="M{cx},{cy} L{x1:.2f},{y1:.2f} A{radius:.1f},{radius:.1f} 0 {large_arc} 1 {x2:.2f},{y2:.2f} Z" '
+                     f'fill="{color}" stroke="#1f2937">{title}</path>')
+
+    legend_x = cx + radius + 20
+    legend_y = cy - len(slices) * 10
+    for i, (label, value) in enumerate(slices):
+        y = legend_y + i * 20
+        parts.append(f'<rect x="{legend_x}" y="{y}" width="12" height="12" fill="{PIE_COLORS[i % len(PIE_COLORS)]}"/>')
+        parts.append(f'<text x="{legend_x + 18}" y="{y + 10}">{html.escape(label)} ({value})</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def png_data_uri(pixels):
+    """Encode an (height, width, 4) uint8 RGBA NumPy array as a PNG data: URI."""
+    import numpy as np
+    height, width = pixels.shape[:2]
+    # Filter type 0 (none) in front of every scanline
+    scanlines = np.concatenate([np.zeros((height, 1), np.uint8), pixels.reshape(height, width * 4)], axis=1)
+    png = (b"\x89PNG\r\n\x1a\n"
+           + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+           + _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6))
+           + _png_chunk(b"IEND", b""))
+    return "data:image/png;base64," + base64.b64encode(png).decode('ascii')
+
+def svg_heatmap(image_uri, extent, points=(), background_uri=None):
+    """Render a heatmap image over an optional floor plan as an inline SVG string.
+
+    The image is stretched over `extent`, the (x0, y0, x1, y1) plan area;
+    `points` are (x, y, tooltip) markers in plan coordinates.
+    """
+    x0, y0, x1, y1 = extent
+    width, height = x1 - x0, y1 - y0
+    radius = max(width, height) / 150
+    parts = [f'<svg viewBox="{x0} {y0} {width} {height}" width="100%" preserveAspectRatio="xMidYMid meet" role="img">']
+    if background_uri:
+        parts.append(f'<image href="{background_uri}" x="{x0}" y="{y0}" width="{width}" height="{height}" '
+                     f'preserveAspectRatio="none"/>')
+    parts.append(f'<image href="{image_uri}" x="{x0}" y="{y0}" width="{width}" height="{height}" '
+                 f'preserveAspectRatio="none" opacity="{0.7 if background_uri else 1}"/>')
+    for x, y, tooltip in points:
+        parts.append(f'<circle cx="{x}" cy="{y}" r="{radius:.3g}" fill="#f0f0f0" stroke="#111827" '
+                     f'stroke-width="{radius / 3:.3g}"><title>{html.escape(tooltip)}</title></circle>')
+    parts.append('</svg>')
+    return ''.join(parts)
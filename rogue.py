@@ -0,0 +1,307 @@
+"""Rogue and evil-twin detection against an inventory of authorized APs.
+
+The inventory is a CSV (bssid, ssid, security columns) or JSON list of
+the access points that are ours. Every observed network is checked
+against it with hashed lookups only:
+
+- by BSSID: a known BSSID broadcasting another SSID, or weaker security
+- by SSID:  a known SSID on an unknown BSSID (evil twin), or with weaker
+            security than any authorized AP uses for it (downgrade)
+- fuzzy:    an unknown SSID that is a near-misspelling of a known one
+
+Lookalikes are found with a precomputed deletion index (as in SymSpell):
+every known SSID is normalized (case, separators, common digit/letter
+swaps) and stored under each variant obtained by deleting up to
+MAX_EDIT_DISTANCE characters. A query generates the same variants of
+the observed SSID and looks them up, so its cost depends on the SSID's
+length, not on the size of the inventory. Candidates are confirmed with
+an edit distance, after a free lower bound has discarded most of them:
+if the query and a known SSID meet at a variant after r and s deletions,
+their distance is at least the smallest max(r, s) over all such variants. Results are memoized per
+SSID, since the same SSIDs come back every scan.
+
+Inventory entries without a BSSID authorize their SSID on any BSSID.
+"""
+import csv
+import json
+
+from colorama import Fore, Style
+
+from scanning import normalize_bssid
+from security import SECURITY_STRENGTH
+
+# Edit distance at which an SSID counts as a lookalike of a known one
+MAX_EDIT_DISTANCE = 2
+
+# Normalized SSIDs shorter than this only match at distance 1; shorter than
+# MIN_FUZZY_LENGTH not at all, as everything short looks alike.
+LONG_SSID = 8
+MIN_FUZZY_LENGTH = 4
+
+# SSIDs whose lookalike result is remembered between scans
+FUZZY_CACHE_SIZE = 65536
+
+SEVERITIES = ("low", "medium", "high")
+
+# SSIDs of networks that hide their name: empty, or the scanner's placeholder
+HIDDEN_SSIDS = ("", "<Hidden>")
+
+DEFAULT_ALERT_PATH = "wifi_alerts.jsonl"
+
+# Characters mapped together when comparing SSIDs, so that "C0rp-Wifi" matches "corpwifi"
+_LOOKALIKE = str.maketrans({'0': 'o', '1': 'l', 'i': 'l', '3': 'e', '4': 'a', '5': 's', '7': 't',
+                            '@': 'a', '$': 's', '-': None, '_': None, ' ': None, '.': None})
+
+def normalize_ssid(ssid):
+    """Fold an SSID for lookalike comparison."""
+    return ssid.casefold().translate(_LOOKALIKE)
+
+def _allowed_distance(normalized):
+    if len(normalized) < MIN_FUZZY_LENGTH:
+        return -1
+    return MAX_EDIT_DISTANCE if len(normalized) >= LONG_SSID else 1
+
+def _deletes(word, distance):
+    """Return {variant: deletions} for `word` and every variant with up to `distance` characters deleted."""
+    variants = {word: 0}
+    level = [word]
+    for removed in range(1, min(distance, len(word)) + 1):
+        following = []
+        for text in level:
+            for i in range(len(text)):
+                variant = text[:i] + text[i + 1:]
+                if variant not in variants:
+                    variants[variant] = removed
+                    following.append(variant)
+        level = following
+    return variants
+
+def edit_distance(a, b, limit):
+    """Return the Damerau-Levenshtein (optimal string alignment) distance of a and b.
+
+    Distances above `limit` are returned as limit + 1. Only the cells
+    within `limit` of the diagonal are computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = min(value, over)
+        if min(current) > limit:
+            return over
+        previous2, previous = previous, current
+    return previous[-1]
+
+class Inventory:
+    """Authorized access points, indexed by BSSID, SSID and SSID lookalikes."""
+
+    def __init__(self, entries=()):
+        self.by_bssid = {}
+        self.by_ssid = {}
+        self.any_bssid = set()
+        self.fuzzy = {}
+        # Known SSID -> normalized SSID
+        self.normalized = {}
+        for entry in entries:
+            self.add(entry.get('bssid'), entry['ssid'], entry.get('security'))
+
+    def __len__(self):
+        return len(self.by_bssid) + len(self.any_bssid)
+
+    def add(self, bssid, ssid, security=None):
+        """Authorize `ssid` on `bssid` (any BSSID if None) with `security`."""
+        bssid = normalize_bssid(bssid)
+        if bssid:
+            self.by_bssid[bssid] = (ssid, security)
+        else:
+            self.any_bssid.add(ssid)
+        strength = SECURITY_STRENGTH.get(security)
+        entry = self.by_ssid.setdefault(ssid, {'bssids': set(), 'min_strength': strength, 'security': security})
+        if bssid:
+            entry['bssids'].add(bssid)
+        if strength is not None and (entry['min_strength'] is None or strength < entry['min_strength']):
+            entry['min_strength'] = strength
+            entry['security'] = security
+
+        if ssid in self.normalized:
+            return
+        normalized = normalize_ssid(ssid)
+        self.normalized[ssid] = normalized
+        for variant, removed in _deletes(normalized, _allowed_distance(normalized)).items():
+            self.fuzzy.setdefault(variant, {})[ssid] = removed
+
+    @classmethod
+    def load(cls, path):
+        """Load an inventory from a CSV file with a header row, or a JSON list of objects."""
+        with open(path, encoding='utf-8', newline='') as f:
+            if path.lower().endswith(".json"):
+                entries = json.load(f)
+            else:
+                entries = [{key: (value or None) for key, value in row.items()} for row in csv.DictReader(f)]
+        return cls(entries)
+
+    def lookalike(self, ssid):
+        """Return (known SSID, distance) for the closest known SSID that `ssid` resembles, or None.
+
+        Candidates are checked in order of their lower bound and the
+        distance limit shrinks to the best match so far, so most of them
+        are discarded without computing an edit distance.
+        """
+        normalized = normalize_ssid(ssid)
+        limit = _allowed_distance(normalized)
+        if limit < 0:
+            return None
+        bounds = {}
+        for variant, removed in _deletes(normalized, limit).items():
+            for known, known_removed in self.fuzzy.get(variant, {}).items():
+                bound = max(removed, known_removed)
+                if bound < bounds.get(known, limit + 1):
+                    bounds[known] = bound
+        bounds.pop(ssid, None)
+
+        best = None
+        for bound, known in sorted((bound, known) for known, bound in bounds.items()):
+            known_normalized = self.normalized[known]
+            pair_limit = min(limit, _allowed_distance(known_normalized))
+            if best is not None:
+                pair_limit = min(pair_limit, best[1])
+            if bound > pair_limit:
+                if best is not None and bound > best[1]:
+                    break
+                continue
+            distance = edit_distance(normalized, known_normalized, pair_limit)
+            if distance <= pair_limit and (best is None or (distance, known) < (best[1], best[0])):
+                best = (known, distance)
+        return best
+
+def _alert(kind, severity, network, detail, **extra):
+    return dict({'kind': kind, 'severity': severity, 'bssid': network.get('bssid'), 'ssid': network['ssid'],
+                 'security': network['security'], 'channel': network['channel'], 'signal': network['signal'],
+                 'detail': detail}, **extra)
+
+class RogueDetector:
+    """Check scans against an Inventory and turn findings into alert records.
+
+    check() returns every finding for a scan; update() returns only those
+    not already raised by the previous scan, for continuous monitoring.
+    With `flag_unknown`, networks matching nothing in the inventory are
+    reported as well (severity low).
+    """
+
+    def __init__(self, inventory, flag_unknown=False):
+        self.inventory = inventory
+        self.flag_unknown = flag_unknown
+        self.fuzzy_cache = {}
+        self.active = set()
+
+    def _lookalike(self, ssid):
+        if ssid in self.fuzzy_cache:
+            return self.fuzzy_cache[ssid]
+        if len(self.fuzzy_cache) >= FUZZY_CACHE_SIZE:
+            self.fuzzy_cache.clear()
+        match = self.fuzzy_cache[ssid] = self.inventory.lookalike(ssid)
+        return match
+
+    def check_network(self, network):
+        """Return the alerts for one network dict."""
+        inventory = self.inventory
+        ssid = network['ssid']
+        bssid = network.get('bssid')
+        strength = SECURITY_STRENGTH.get(network['security'])
+        alerts = []
+
+        known = inventory.by_bssid.get(bssid) if bssid else None
+        if known is not None:
+            known_ssid, known_security = known
+            # A known AP that hides its SSID is still broadcasting the same network
+            if ssid != known_ssid and ssid not in HIDDEN_SSIDS:
+                alerts.append(_alert("ssid_mismatch", "medium", network,
+                                     f"known AP broadcasting {ssid!r} instead of {known_ssid!r}",
+                                     expected=known_ssid))
+            known_strength = SECURITY_STRENGTH.get(known_security)
+            if strength is not None and known_strength is not None and strength < known_strength:
+                alerts.append(_alert("downgrade", "high", network,
+                                     f"security {network['security']} on an AP inventoried as {known_security}",
+                                     expected=known_security))
+            return alerts
+
+        entry = inventory.by_ssid.get(ssid)
+        if entry is not None:
+            weaker = (strength is not None and entry['min_strength'] is not None
+                      and strength < entry['min_strength'])
+            if ssid not in inventory.any_bssid:
+                alerts.append(_alert("evil_twin", "high" if weaker else "medium", network,
+                                     f"known SSID on unknown BSSID {bssid}" +
+                                     (f" with weaker security than {entry['security']}" if weaker else ""),
+                                     expected=entry['security']))
+            elif weaker:
+                alerts.append(_alert("downgrade", "high", network,
+                                     f"security {network['security']}, inventory requires {entry['security']}",
+                                     expected=entry['security']))
+            return alerts
+
+        match = self._lookalike(ssid) if ssid not in HIDDEN_SSIDS else None
+        if match is not None:
+            known_ssid, distance = match
+            alerts.append(_alert("lookalike", "medium", network,
+                                 f"SSID resembles {known_ssid!r} (distance {distance})", expected=known_ssid))
+        elif self.flag_unknown:
+            alerts.append(_alert("unknown", "low", network, "not in the inventory"))
+        return alerts
+
+    def check(self, networks):
+        """Return every alert for a scan, most severe first."""
+        return _by_severity(alert for network in networks for alert in self.check_network(network))
+
+    def update(self, networks):
+        """Return the alerts of a scan that were not raised by the previous one."""
+        alerts = self.check(networks)
+        keys = [(alert['kind'], alert['bssid'], alert['ssid']) for alert in alerts]
+        new = [alert for alert, key in zip(alerts, keys) if key not in self.active]
+        self.active = set(keys)
+        return new
+
+    def annotate(self, networks):
+        """Check a scan once and return (network dicts, alerts).
+
+        Each network dict carries its most severe alert as 'alert', if
+        any; alerts are every alert of the scan, most severe first, as
+        check() returns them.
+        """
+        annotated = []
+        alerts = []
+        for network in networks:
+            record = network.to_dict() if hasattr(network, 'to_dict') else dict(network)
+            found = self.check_network(record)
+            if found:
+                record['alert'] = max(found, key=lambda alert: SEVERITIES.index(alert['severity']))
+                alerts.extend(found)
+            annotated.append(record)
+        return annotated, _by_severity(alerts)
+
+def _by_severity(alerts):
+    return sorted(alerts, key=lambda alert: -SEVERITIES.index(alert['severity']))
+
+_SEVERITY_COLORS = {"high": Fore.RED, "medium": Fore.YELLOW, "low": Fore.CYAN}
+
+def print_alerts(alerts):
+    """Print one line per alert."""
+    for alert in alerts:
+        print(f"{_SEVERITY_COLORS[alert['severity']]}[{alert['severity'].upper()}] {alert['kind']}: "
+              f"{alert['ssid']} ({alert['bssid'] or 'no BSSID'}) - {alert['detail']}{Style.RESET_ALL}")
+
+def append_alerts(path, timestamp, alerts):
+    """Append alert records, stamped with `timestamp`, to a JSON lines alert log."""
+    if not alerts:
+        return
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(json.dumps(dict(alert, timestamp=timestamp)) + '\n' for alert in alerts)
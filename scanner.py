@@ -1,37 +1,168 @@
-import pywifi
-from pywifi import PyWiFi, const
+# Only cheap standard-library modules are imported here; pywifi, NumPy,
+# webbrowser and the thread pool are imported where they are first needed,
+# so commands that don't use them start faster.
 import time
 import platform
-from colorama import init, Fore, Style
+from colorama import Fore, Style
 import sys
 import os
 from datetime import datetime
 import json
-import webbrowser
+import html
+import logging
+from collections import Counter, deque
 
-init()
+# Run as a script this module is __main__; register it under its own name
+# so the sibling modules' `from scanner import ...` don't load it again.
+if __name__ == "__main__":
+    sys.modules.setdefault("scanner", sys.modules[__name__])
 
-def scan_wifi():
-    if platform.system() != "Windows":
-        print(f"{Fore.RED}This script only supports Windows.{Style.RESET_ALL}")
-        sys.exit(1)
-        
-    wifi = PyWiFi()
-    interfaces = wifi.interfaces()
+from channels import (BANDS, freq_to_band, freq_to_channel, freqs_to_bands, freqs_to_channels,
+                      normalize_frequencies, normalize_frequency)
+from metrics import METRICS, span
+from scanning import (SCAN_DEADLINE, SCAN_POLL_MAX, SCAN_POLL_MIN, SCAN_SETTLE, BackendUnavailable, ScanPoller,
+                      logger, normalize_bssid, wait_for_scan)
+from security import CIPHER_NONE, describe_security
+
+def _default_backend(backend):
+    """Return `backend`, or the platform's default backend if it is None."""
+    if backend is not None:
+        return backend
+    from backends import get_backend
+    return get_backend()
+
+def _open_interfaces(backend=None):
+    """Return all Wi-Fi interfaces, or an empty list if none are available."""
+    interfaces = _default_backend(backend).interfaces()
 
     if not interfaces:
-        print(f"{Fore.RED}No Wi-Fi interfaces found! Ensure Wi-Fi is enabled.{Style.RESET_ALL}")
-        print("On Windows, ensure Location Services are enabled (Settings > Privacy > Location).")
+        # Logged rather than printed, so the watch --live table isn't torn
+        logger.warning("No Wi-Fi interfaces found! Ensure Wi-Fi is enabled. On Windows, ensure "
+                       "Location Services are enabled (Settings > Privacy > Location).")
+    return interfaces
+
+def _open_interface(backend=None):
+    """Return the first Wi-Fi interface, or None if none is available."""
+    interfaces = _open_interfaces(backend)
+    if not interfaces:
         return None
 
     iface = interfaces[0]
-    print(f"{Fore.CYAN}Using interface: {iface.name()}{Style.RESET_ALL}")
+    logger.info("Using interface: %s", iface.name())
+    return iface
+
+
+def parse_scan_results(networks):
+    """Convert raw pywifi scan results into a list of network dicts.
+
+    Channel mapping and security decoding run as separate passes so each
+    is timed as one span.
+    """
+    with span("result_parsing"):
+        frequencies = [normalize_frequency(network.freq) for network in networks]
+        with span("channel_mapping"):
+            channels = [freq_to_channel(frequency) for frequency in frequencies]
+            bands = [freq_to_band(frequency) for frequency in frequencies]
+        with span("security_decoding"):
+            securities = [get_security_type(network) for network in networks]
+
+        network_data = []
+        for network, frequency, channel, band, security in zip(networks, frequencies, channels, bands, securities):
+            network_data.append({
+                'ssid': network.ssid if network.ssid else "<Hidden>",
+                'bssid': normalize_bssid(getattr(network, 'bssid', None)),
+                'frequency': frequency,
+                'channel': channel,
+                'band': band,
+                'signal': network.signal,
+                'security': security
+            })
+    return network_data
+
+def print_networks(network_data):
+    """Print parsed networks as a table."""
+    print(f"{Fore.GREEN}{'SSID':<30} {'Frequency (MHz)':<15} {'Channel':<10} {'Signal (dBm)':<15} {'Security':<15}{Style.RESET_ALL}")
+    print("-" * 85)
+    for network in network_data:
+        channel = network['channel'] if network['channel'] is not None else "Unknown"
+        print(f"{network['ssid']:<30} {network['frequency']:<15} {channel:<10} {network['signal']:<15} {network['security']:<15}")
+
+def scan_interfaces(interfaces, deadline=SCAN_DEADLINE, max_workers=None, backend=None):
+    """Scan several interfaces in parallel.
+
+    Returns {interface name: (parsed networks, latency)}. Interfaces whose
+    scan raises are reported and left out.
+    """
+    backend = _default_backend(backend)
+    scans = {}
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=max_workers or len(interfaces) or 1) as pool:
+        futures = {pool.submit(backend.scan, iface, deadline): iface.name() for iface in interfaces}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                networks, latency = future.result()
+            except Exception as e:
+                print(f"{Fore.RED}Scan failed on {name}: {e}{Style.RESET_ALL}")
+                continue
+            scans[name] = (parse_scan_results(networks), latency)
+    return scans
+
+def merge_scans(scans):
+    """Merge per-interface scans into one table keyed by BSSID.
+
+    Each entry is the strongest observation of that BSSID plus 'interface'
+    (where it was strongest) and 'signals' ({interface name: signal}).
+    Records without a BSSID are keyed by (SSID, frequency) instead.
+    """
+    merged = {}
+    for name, (networks, _) in scans.items():
+        for network in networks:
+            key = network['bssid'] or (network['ssid'], network['frequency'])
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = dict(network, interface=name, signals={})
+            elif network['signal'] > entry['signal']:
+                entry.update(network, interface=name)
+            entry['signals'][name] = network['signal']
+    return merged
+
+def scan_wifi(deadline=SCAN_DEADLINE, all_interfaces=False, backend=None, tracker=None):
+    """Scan and return a list of network dicts.
+
+    Uses the first interface unless `all_interfaces` is set, in which case
+    every adapter is scanned in parallel and the results merged by BSSID.
+    `backend` is a backends.ScanBackend; by default pywifi on Windows and
+    iw elsewhere. If `tracker` (a tracking.SignalTracker) is given, the scan
+    is added to it and the networks carry its smoothed signal.
+    """
+    backend = _default_backend(backend)
+    if all_interfaces:
+        interfaces = _open_interfaces(backend)
+        if not interfaces:
+            return None
+        print(f"{Fore.CYAN}Scanning on {len(interfaces)} interfaces...{Style.RESET_ALL}")
+        scans = scan_interfaces(interfaces, deadline=deadline, backend=backend)
+        for name, (networks, latency) in sorted(scans.items()):
+            print(f"{Fore.CYAN}{name}: {len(networks)} networks in {latency:.2f}s{Style.RESET_ALL}")
+        network_data = list(merge_scans(scans).values())
+        if not network_data:
+            print(f"{Fore.YELLOW}No networks found. Check Wi-Fi status.{Style.RESET_ALL}")
+            return None
+        if tracker is not None:
+            tracker.update(network_data)
+            network_data = tracker.annotate(network_data)
+        print_networks(network_data)
+        return network_data
+
+    iface = _open_interface(backend)
+    if iface is None:
+        return None
 
     try:
-        iface.scan()
         print(f"{Fore.CYAN}Scanning for networks...{Style.RESET_ALL}")
-        time.sleep(2)
-        networks = iface.scan_results()
+        networks, latency = backend.scan(iface, deadline=deadline)
+        print(f"{Fore.CYAN}Scan completed in {latency:.2f}s{Style.RESET_ALL}")
     except Exception as e:
         print(f"{Fore.RED}Scan failed: {e}{Style.RESET_ALL}")
         print("Try enabling Location Services or running as Administrator.")
@@ -41,150 +172,171 @@ def scan_wifi():
         print(f"{Fore.YELLOW}No networks found. Check Wi-Fi status.{Style.RESET_ALL}")
         return None
 
-    # Debug network objects
-    if networks and len(networks) > 0:
-        print(f"{Fore.GREEN}DEBUG: First network object information:{Style.RESET_ALL}")
-        print(f"Type: {type(networks[0])}")
-        print(f"Available attributes: {dir(networks[0])}")
-        print(f"Raw freq value: {networks[0].freq}")
-        print(f"Freq type: {type(networks[0].freq)}")
-        
-    print(f"{Fore.GREEN}{'SSID':<30} {'Frequency (MHz)':<15} {'Channel':<10} {'Signal (dBm)':<15} {'Security':<15}{Style.RESET_ALL}")
-    print("-" * 85)
+    if logger.isEnabledFor(logging.DEBUG):
+        print_network_details(networks[0])
 
-    network_data = []
-    for network in networks:
-        ssid = network.ssid if network.ssid else "<Hidden>"
-        
-        # Debug the raw frequency before conversion
-        print(f"Raw frequency for {ssid}: {network.freq}")
-        
-        frequency = network.freq
-        if frequency > 1000:  # If > 1000, probably in kHz
-            frequency = frequency // 1000  # Convert kHz to MHz
-        
-        channel = freq_to_channel(frequency)
-        signal = network.signal
-        security = get_security_type(network)
-
-        print(f"{ssid:<30} {frequency:<15} {channel:<10} {signal:<15} {security:<15}")
-        
-        network_data.append({
-            'ssid': ssid,
-            'frequency': frequency,
-            'channel': channel,
-            'signal': signal,
-            'security': security
-        })
-    
+    network_data = parse_scan_results(networks)
+    if tracker is not None:
+        tracker.update(network_data)
+        network_data = tracker.annotate(network_data)
+    print_networks(network_data)
     return network_data
 
-def get_security_type(network):
-    """Determine security type of network."""
-    try:
-        auth_type = network.akm[0] if hasattr(network, 'akm') and network.akm else const.AKM_TYPE_NONE
-        
-        if auth_type == const.AKM_TYPE_NONE:
-            return "Open"
-        elif auth_type == const.AKM_TYPE_WPA:
-            return "WPA"
-        elif auth_type == const.AKM_TYPE_WPAPSK:
-            return "WPA-PSK"
-        elif auth_type == const.AKM_TYPE_WPA2:
-            return "WPA2"
-        elif auth_type == const.AKM_TYPE_WPA2PSK:
-            return "WPA2-PSK"
+# Write buffer for report files, in bytes.
+REPORT_BUFFER_SIZE = 1 << 20
+# Reports with more networks than this use the virtualized table.
+VIRTUAL_TABLE_THRESHOLD = 2000
+
+# Number of recent batches kept by iter_scans when no history buffer is given.
+SCAN_HISTORY_SIZE = 32
+
+def iter_scans(interval=5.0, iface=None, count=None, history=None, deadline=SCAN_DEADLINE,
+               columnar=False, backend=None):
+    """Scan every `interval` seconds and yield one batch dict per cycle.
+
+    Each batch is {'timestamp', 'latency', 'networks'}; with `columnar` set,
+    'networks' is a records.ScanBatch instead of a list of dicts. Scans are only
+    triggered when the consumer asks for the next batch, so a slow consumer
+    never causes batches to pile up; cycles it missed are skipped rather
+    than run back to back. The last batches are kept in `history`, a
+    fixed-size deque (SCAN_HISTORY_SIZE entries by default).
+    """
+    backend = _default_backend(backend)
+    if iface is None:
+        iface = _open_interface(backend)
+        if iface is None:
+            return
+    if history is None:
+        history = deque(maxlen=SCAN_HISTORY_SIZE)
+
+    next_due = time.monotonic()
+    produced = 0
+    while count is None or produced < count:
+        delay = next_due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            networks, latency = backend.scan(iface, deadline=deadline)
+        except EOFError:
+            return
+        except Exception as e:
+            # Logged rather than printed, so a live table or dashboard frame isn't torn
+            logger.warning("Scan failed: %s", e)
+            networks, latency = [], 0.0
+        if columnar:
+            from records import ScanBatch
+            parsed = ScanBatch.from_profiles(networks)
         else:
-            return "Unknown"
-    except:
-        return "Unknown"
+            parsed = parse_scan_results(networks)
+        batch = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'latency': latency,
+            'networks': parsed
+        }
+        history.append(batch)
+        produced += 1
+        yield batch
 
-def freq_to_channel(frequency):
-    # Raw frequency value logging with more info
-    print(f"{Fore.CYAN}DEBUG - Network frequency: {frequency} MHz{Style.RESET_ALL}")
-    
-    # Simplified direct mapping approach
-    # 2.4 GHz band
-    if 2412 <= frequency <= 2484:
-        if frequency == 2412: return 1
-        if frequency == 2417: return 2
-        if frequency == 2422: return 3
-        if frequency == 2427: return 4
-        if frequency == 2432: return 5
-        if frequency == 2437: return 6
-        if frequency == 2442: return 7
-        if frequency == 2447: return 8
-        if frequency == 2452: return 9
-        if frequency == 2457: return 10
-        if frequency == 2462: return 11
-        if frequency == 2467: return 12
-        if frequency == 2472: return 13
-        if frequency == 2484: return 14
-        
-        # If exact match not found but in 2.4GHz range
-        return f"~{int((frequency - 2412) / 5) + 1}"
-    
-    # 5 GHz band - common channels
-    if frequency == 5180: return 36
-    if frequency == 5200: return 40
-    if frequency == 5220: return 44
-    if frequency == 5240: return 48
-    if frequency == 5260: return 52
-    if frequency == 5280: return 56
-    if frequency == 5300: return 60
-    if frequency == 5320: return 64
-    if frequency == 5500: return 100
-    if frequency == 5520: return 104
-    if frequency == 5745: return 149
-    if frequency == 5765: return 153
-    if frequency == 5785: return 157
-    if frequency == 5805: return 161
-    if frequency == 5825: return 165
-    
-    # Broader 5GHz range check
-    if 5170 <= frequency <= 5825:
-        return f"~{int((frequency - 5180) / 5) + 36}"
-    
-    # Fallback 
-    print(f"{Fore.YELLOW}WARNING: Could not map frequency {frequency} MHz to a channel{Style.RESET_ALL}")
-    return str(frequency) + "MHz"  # Return the frequency itself to diagnose
+        # Skip any cycles that elapsed while the consumer held the batch
+        now = time.monotonic()
+        next_due += interval
+        if next_due < now:
+            next_due = now if interval <= 0 else next_due + ((now - next_due) // interval + 1) * interval
+
+def _seeded_tracker(store=None):
+    """Return a tracking.SignalTracker, primed from the recent history in `store` if given."""
+    from tracking import SignalTracker
+    tracker = SignalTracker()
+    if store is not None:
+        tracker.seed(store.signal_history(since=time.time() - tracker.max_age))
+    return tracker
+
+def monitor(interval=5.0, store=None, metrics_path=None, backend=None, delta_path=None, view=None,
+            export_path=None, detector=None, alert_path=None):
+    """Print a summary line for every scan until interrupted.
+
+    With `view` (a terminal.LiveTable) the networks are shown as a table
+    that is redrawn in place, with the summary line above it.
+
+    If `store` (a history.ScanHistory) is given, every batch is recorded.
+    If `metrics_path` is given, metrics are exported after every cycle.
+    If `delta_path` is given, only the changes since the previous scan are
+    appended to that delta log (see delta.py).
+    If `export_path` is given, every batch is appended to that CSV, JSON
+    Lines or binary export (see export.py).
+    With `detector` (a rogue.RogueDetector) newly raised alerts are printed
+    and, if `alert_path` is given, appended to that alert log.
+    Signals are smoothed per access point (see tracking.py); the store
+    still records the raw samples.
+    """
+    signals = _seeded_tracker(store)
+    if export_path:
+        from export import append_batch
+    if detector is not None:
+        from rogue import append_alerts, print_alerts
+    tracker = None
+    if delta_path:
+        from delta import CHECKPOINT_INTERVAL, append_delta_log, load_tracker, save_checkpoint, summarize
+        tracker = load_tracker(delta_path)
+    for cycle, batch in enumerate(iter_scans(interval, backend=backend), 1):
+        if store is not None:
+            store.record_batches([batch])
+        if export_path:
+            append_batch(export_path, batch)
+        if metrics_path:
+            METRICS.export(metrics_path)
+        signals.update(batch['networks'])
+        networks = signals.annotate(batch['networks'])
+        strongest = max(networks, key=lambda n: n['signal'])['ssid'] if networks else "-"
+        changes = ""
+        if tracker is not None:
+            deltas = tracker.update(networks)
+            append_delta_log(delta_path, {'timestamp': batch['timestamp'], 'latency': batch['latency'],
+                                          'count': len(networks), 'deltas': deltas})
+            # From the first cycle on, so short runs leave a checkpoint too
+            if cycle % CHECKPOINT_INTERVAL == 1:
+                save_checkpoint(delta_path, tracker)
+            changes = f", changes: {summarize(deltas)}"
+        if detector is not None:
+            alerts = detector.update(networks)
+            if alert_path:
+                append_alerts(alert_path, batch['timestamp'], alerts)
+            if view is not None:
+                changes += f", alerts: {len(detector.active)}"
+            else:
+                print_alerts(alerts)
+        if view is not None:
+            view.update(networks, f"[{batch['timestamp']}] {len(networks)} networks "
+                                  f"in {batch['latency']:.2f}s, strongest: {strongest}{changes}")
+            continue
+        print(f"{Fore.CYAN}[{batch['timestamp']}]{Style.RESET_ALL} {len(networks)} networks "
+              f"in {batch['latency']:.2f}s, strongest: {strongest}{changes}")
+
+def get_security_type(network):
+    """Determine security type of network from its full AKM list and pairwise cipher."""
+    return describe_security(getattr(network, 'akm', None), getattr(network, 'cipher', CIPHER_NONE)).label
 
 def get_security_badge_color(security):
     """Return Tailwind CSS classes for security badge colors."""
-    if security == "Open":
+    if security in ("Open", "WEP"):
         return "bg-red-600 text-gray-100"
-    elif security.startswith("WPA2"):
+    elif security.startswith(("WPA2", "WPA3")):
         return "bg-green-600 text-gray-100"
-    elif security.startswith("WPA"):
+    elif security.startswith("WPA") or security == "OWE":
         return "bg-yellow-600 text-gray-100"
     else:
         return "bg-gray-600 text-gray-100"
 
-def generate_html_report(networks):
-    """Generate a beautiful HTML report with Tailwind CSS."""
-    if not networks:
-        print(f"{Fore.RED}No network data to generate report.{Style.RESET_ALL}")
-        return
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"wifi_scan_report_{timestamp}.html"
-    
-    # Create HTML content with Tailwind CSS
-    html_content = f"""<!DOCTYPE html>
+# Report templates, split so rows and the embedded JSON can be streamed in
+# between. The header and row templates are str.format templates.
+_REPORT_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Wi-Fi Scan Report - {timestamp}</title>
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            darkMode: 'class',
-            theme: {{
-                extend: {{}}
-            }}
-        }}
-    </script>
+{assets}
 </head>
 <body class="bg-gray-900 text-gray-200 min-h-screen">
     <div class="container mx-auto px-4 py-8">
@@ -192,23 +344,42 @@ def generate_html_report(networks):
             <div class="bg-gradient-to-r from-blue-900 to-indigo-900 px-6 py-4">
                 <div class="flex justify-between items-center">
                     <h1 class="text-white text-2xl font-bold">Wi-Fi Networks Scan Report</h1>
-                    <div class="text-gray-300 text-sm">{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</div>
+                    <div id="generated" class="text-gray-300 text-sm">{generated}</div>
                 </div>
                 <div class="text-blue-200 mt-1">
-                    <p>Windows {platform.version()}</p>
-                    <p>Networks: {len(networks)}</p>
+                    <p>Windows {os_version}</p>
+                    <p id="networkCount">Networks: {count}</p>
                 </div>
             </div>
             
             <!-- Channel Distribution Graph at the top -->
             <div class="p-6 bg-gray-800">
                 <h2 class="text-xl font-semibold mb-4 text-white">Channel Utilization</h2>
-                <div class="w-full h-[250px]">
-                    <canvas id="topChannelChart"></canvas>
+                <div id="topChart" class="w-full h-[250px]">
+                    {top_chart}
                 </div>
             </div>
-            
-            <div class="p-6">
+{fleet}{alerts}{congestion}{survey}            
+"""
+
+# Asset snippets for the online report, substituted into the templates above
+_ONLINE_ASSETS = """    <script src="https://cdn.tailwindcss.com"></script>
+    <script>
+        tailwind.config = {
+            darkMode: 'class',
+            theme: {
+                extend: {}
+            }
+        }
+    </script>"""
+_ONLINE_TOP_CHART = '<canvas id="topChannelChart"></canvas>'
+_ONLINE_CHANNEL_CHART = '<canvas id="channelChart" width="400" height="300"></canvas>'
+_ONLINE_SECURITY_CHART = '<canvas id="securityChart" width="400" height="300"></canvas>'
+_ONLINE_CHART_LIBRARY = """    <!-- Chart.js -->
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    """
+
+_REPORT_TABLE_START = """            <div class="p-6">
                 <div class="flex justify-between mb-4">
                     <button onclick="window.print()" class="bg-blue-700 hover:bg-blue-800 text-white px-4 py-2 rounded shadow">
                         Print Report
@@ -249,47 +420,10 @@ def generate_html_report(networks):
                         </thead>
                         <tbody>
 """
-    
-    # Add network rows
-    for i, network in enumerate(networks):
-        ssid = network['ssid']
-        frequency = network['frequency']
-        channel = network['channel']
-        signal = network['signal']
-        security = network['security']
-        
-        # Determine signal strength and color
-        signal_class = ""
-        signal_width = "0%"
-        signal_strength = "Unknown"
-        
-        if isinstance(signal, (int, float)):
-            if signal >= -50:
-                signal_class = "bg-green-500"
-                signal_strength = "Excellent"
-                signal_width = "100%"
-            elif signal >= -60:
-                signal_class = "bg-green-400"
-                signal_strength = "Good"
-                signal_width = "80%"
-            elif signal >= -70:
-                signal_class = "bg-yellow-400"
-                signal_strength = "Fair"
-                signal_width = "60%"
-            elif signal >= -80:
-                signal_class = "bg-orange-400"
-                signal_strength = "Weak"
-                signal_width = "40%"
-            else:
-                signal_class = "bg-red-500"
-                signal_strength = "Poor"
-                signal_width = "20%"
-        
-        row_class = "bg-gray-800" if i % 2 == 0 else "bg-gray-750"
-        html_content += f"""
-                            <tr class="{row_class} hover:bg-gray-700">
+
+_REPORT_ROW = """                            <tr class="{row_class} hover:bg-gray-700">
                                 <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600">
-                                    <div class="text-sm font-medium text-gray-200">{ssid}</div>
+                                    <div class="text-sm font-medium text-gray-200">{ssid}</div>{tags}
                                 </td>
                                 <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600">
                                     <div class="text-sm text-gray-300">{frequency}</div>
@@ -298,11 +432,11 @@ def generate_html_report(networks):
                                     <div class="text-sm text-gray-300">{channel}</div>
                                 </td>
                                 <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600">
-                                    <div class="text-sm text-gray-300">{signal}</div>
+                                    <div class="text-sm text-gray-300" title="{signal_title}">{signal}</div>
                                 </td>
                                 <td class="px-6 py-4 whitespace-nowrap border-b border-gray-600">
                                     <span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full 
-                                    {get_security_badge_color(security)}">
+                                    {badge_class}">
                                         {security}
                                     </span>
                                 </td>
@@ -314,34 +448,40 @@ def generate_html_report(networks):
                                 </td>
                             </tr>
 """
-    
-    # Complete the HTML
-    html_content += """
-                        </tbody>
+
+_REPORT_TABLE_END = """                        </tbody>
                     </table>
                 </div>
-                
+"""
+
+_REPORT_BODY_END = """                
                 <!-- Chart Section -->
                 <div class="mt-8 grid grid-cols-1 md:grid-cols-2 gap-6">
                     <div class="bg-gray-800 p-4 rounded-lg shadow">
                         <h2 class="text-lg font-semibold mb-4 text-white">Channel Distribution</h2>
-                        <canvas id="channelChart" width="400" height="300"></canvas>
+                        <div id="channelChartContainer">{channel_chart}</div>
                     </div>
                     <div class="bg-gray-800 p-4 rounded-lg shadow">
                         <h2 class="text-lg font-semibold mb-4 text-white">Security Types</h2>
-                        <canvas id="securityChart" width="400" height="300"></canvas>
+                        <div id="securityChartContainer">{security_chart}</div>
                     </div>
                 </div>
             </div>
         </div>
     </div>
     
-    <!-- Chart.js -->
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    
+{chart_library}
     <script>
-        // Network data for JavaScript
-        const networkData = {JSON_PLACEHOLDER};
+"""
+
+_REPORT_AGGREGATES_START = """        
+        // Channel and security counts, precomputed by the report generator
+        const aggregates = """
+
+_REPORT_TABLE_SCRIPT_START = """        // Network data for JavaScript
+        const networkData = """
+
+_REPORT_TABLE_SCRIPT_END = """;
         
         // Sorting function
         function sortTable(column, direction) {
@@ -386,49 +526,18 @@ def generate_html_report(networks):
             // Add sorted rows
             rows.forEach(row => tbody.appendChild(row));
         }
-        
+"""
+
+_REPORT_CHARTS_SCRIPT = """        
         // Create charts when page loads
         document.addEventListener('DOMContentLoaded', function() {
             Chart.defaults.color = '#f0f0f0';
             Chart.defaults.borderColor = 'rgba(255, 255, 255, 0.1)';
             
-            // Channel distribution data calculation
-            const channelCounts = {};
-            networkData.forEach(network => {
-                const channel = network.channel;
-                if (channel !== "Unknown") {
-                    // Handle both numeric and string channels (in case of approx channels like "~6")
-                    const cleanChannel = channel.toString().replace(/[^0-9]/g, '');
-                    if (cleanChannel) {
-                        channelCounts[cleanChannel] = (channelCounts[cleanChannel] || 0) + 1;
-                    }
-                }
-            });
-            
-            // Sort channels numerically
-            const channelLabels = Object.keys(channelCounts).sort((a, b) => parseInt(a) - parseInt(b));
-            const channelData = channelLabels.map(channel => channelCounts[channel]);
-            
-            // Create channel color scheme based on frequency bands
-            const channelColors = channelLabels.map(channel => {
-                const ch = parseInt(channel);
-                if (ch <= 14) {
-                    // 2.4 GHz channels (1-14) - blue
-                    return 'rgba(59, 130, 246, 0.7)';
-                } else if (ch <= 48) {
-                    // 5 GHz lower channels - green
-                    return 'rgba(16, 185, 129, 0.7)';
-                } else if (ch <= 64) {
-                    // 5 GHz mid channels - purple
-                    return 'rgba(139, 92, 246, 0.7)';
-                } else if (ch <= 144) {
-                    // 5 GHz upper channels - orange
-                    return 'rgba(249, 115, 22, 0.7)';
-                } else {
-                    // 5 GHz highest channels - red
-                    return 'rgba(239, 68, 68, 0.7)';
-                }
-            });
+            // Channel and security aggregates are computed by the report generator
+            const channelLabels = aggregates.channels.map(entry => entry.label);
+            const channelData = aggregates.channels.map(entry => entry.count);
+            const channelColors = aggregates.channels.map(entry => entry.color);
             
             // Channel Chart at the top
             new Chart(document.getElementById('topChannelChart'), {
@@ -473,14 +582,8 @@ def generate_html_report(networks):
                         tooltip: {
                             callbacks: {
                                 title: function(tooltipItems) {
-                                    const channel = tooltipItems[0].label;
-                                    let band = '';
-                                    if (parseInt(channel) <= 14) {
-                                        band = '2.4 GHz';
-                                    } else {
-                                        band = '5 GHz';
-                                    }
-                                    return `Channel ${channel} (${band})`;
+                                    const entry = aggregates.channels[tooltipItems[0].dataIndex];
+                                    return `Channel ${entry.label} (${entry.band})`;
                                 }
                             }
                         }
@@ -519,21 +622,19 @@ def generate_html_report(networks):
             });
             
             // Security types chart
-            const securityCounts = {};
-            networkData.forEach(network => {
-                const security = network.security;
-                securityCounts[security] = (securityCounts[security] || 0) + 1;
-            });
-            
-            const securityLabels = Object.keys(securityCounts);
-            const securityData = securityLabels.map(security => securityCounts[security]);
+            const securityLabels = aggregates.security.map(entry => entry.label);
+            const securityData = aggregates.security.map(entry => entry.count);
             const backgroundColors = [
                 'rgba(54, 162, 235, 0.6)',
                 'rgba(255, 99, 132, 0.6)',
                 'rgba(255, 206, 86, 0.6)',
                 'rgba(75, 192, 192, 0.6)',
                 'rgba(153, 102, 255, 0.6)',
-                'rgba(255, 159, 64, 0.6)'
+                'rgba(255, 159, 64, 0.6)',
+                'rgba(34, 197, 94, 0.6)',
+                'rgba(239, 68, 68, 0.6)',
+                'rgba(156, 163, 175, 0.6)',
+                'rgba(236, 72, 153, 0.6)'
             ];
             
             new Chart(document.getElementById('securityChart'), {
@@ -542,7 +643,7 @@ def generate_html_report(networks):
                     labels: securityLabels,
                     datasets: [{
                         data: securityData,
-                        backgroundColor: backgroundColors.slice(0, securityLabels.length),
+                        backgroundColor: securityLabels.map((_, i) => backgroundColors[i % backgroundColors.length]),
                         borderWidth: 1
                     }]
                 },
@@ -555,60 +656,940 @@ def generate_html_report(networks):
                 }
             });
         });
-    </script>
+"""
+
+_REPORT_END = """    </script>
 </body>
 </html>
-""".replace("{timestamp}", timestamp)
+"""
+
+_VIRTUAL_TABLE = """            <div class="p-6">
+                <div class="flex flex-wrap justify-between gap-2 mb-4">
+                    <button onclick="window.print()" class="bg-blue-700 hover:bg-blue-800 text-white px-4 py-2 rounded shadow">
+                        Print Report
+                    </button>
+                    <div class="flex flex-wrap items-center gap-2">
+                        <input id="ssidFilter" type="search" placeholder="Filter SSID" class="bg-gray-700 text-white px-3 py-2 rounded shadow">
+                        <select id="bandFilter" class="bg-gray-700 text-white px-3 py-2 rounded shadow"></select>
+                        <select id="securityFilter" class="bg-gray-700 text-white px-3 py-2 rounded shadow"></select>
+                        <button onclick="sortBy('signal', 'desc')" class="bg-gray-700 hover:bg-gray-600 px-4 py-2 rounded shadow text-white">
+                            Sort by Signal
+                        </button>
+                        <button onclick="sortBy('channel', 'asc')" class="bg-gray-700 hover:bg-gray-600 px-4 py-2 rounded shadow text-white">
+                            Sort by Channel
+                        </button>
+                    </div>
+                </div>
+                <div id="matchCount" class="text-sm text-gray-400 mb-2"></div>
+                
+                <div class="border border-gray-700">
+                    <table class="w-full bg-gray-800 table-fixed">
+                        <colgroup><col style="width: 25%"><col style="width: 13%"><col style="width: 10%"><col style="width: 12%"><col style="width: 18%"><col style="width: 22%"></colgroup>
+                        <thead>
+                            <tr class="bg-gray-700 text-left text-xs font-semibold text-gray-300 uppercase tracking-wider">
+                                <th class="px-6 py-3 cursor-pointer" onclick="sortBy('ssid')">SSID</th>
+                                <th class="px-6 py-3 cursor-pointer" onclick="sortBy('frequency')">Frequency (MHz)</th>
+                                <th class="px-6 py-3 cursor-pointer" onclick="sortBy('channel')">Channel</th>
+                                <th class="px-6 py-3 cursor-pointer" onclick="sortBy('signal')">Signal (dBm)</th>
+                                <th class="px-6 py-3 cursor-pointer" onclick="sortBy('security')">Security</th>
+                                <th class="px-6 py-3">Signal Strength</th>
+                            </tr>
+                        </thead>
+                    </table>
+                    <div id="viewport" class="overflow-y-auto relative" style="height: 600px">
+                        <div id="spacer"></div>
+                        <table class="w-full bg-gray-800 table-fixed absolute top-0 left-0">
+                            <colgroup><col style="width: 25%"><col style="width: 13%"><col style="width: 10%"><col style="width: 12%"><col style="width: 18%"><col style="width: 22%"></colgroup>
+                            <tbody id="visibleRows"></tbody>
+                        </table>
+                    </div>
+                </div>
+"""
+
+_VIRTUAL_SCRIPT_START = """        // Columnar network data; security and band are dictionary-encoded
+        let columns = """
+
+_VIRTUAL_SCRIPT_END = """;
+        
+        const ROW_HEIGHT = 40;
+        const OVERSCAN = 10;
+        let count, frequency, channel, signal, security, band, ssidLower, numericColumns;
+        
+        const viewport = document.getElementById('viewport');
+        const spacer = document.getElementById('spacer');
+        const visibleRows = document.getElementById('visibleRows');
+        const ssidFilter = document.getElementById('ssidFilter');
+        const bandFilter = document.getElementById('bandFilter');
+        const securityFilter = document.getElementById('securityFilter');
+        
+        // Indices of the rows that pass the filters, in display order
+        let view = new Uint32Array(count).map((_, i) => i);
+        let sortKey = null;
+        let sortDirection = 1;
+        
+        function escapeHtml(text) {
+            return text.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[c]);
+        }
+        
+        function signalLevel(value) {
+            if (value >= -50) return ['bg-green-500', 'Excellent', '100%'];
+            if (value >= -60) return ['bg-green-400', 'Good', '80%'];
+            if (value >= -70) return ['bg-yellow-400', 'Fair', '60%'];
+            if (value >= -80) return ['bg-orange-400', 'Weak', '40%'];
+            return ['bg-red-500', 'Poor', '20%'];
+        }
+        
+        function badgeClass(label) {
+            if (label === 'Open' || label === 'WEP') return 'bg-red-600 text-gray-100';
+            if (label.startsWith('WPA2') || label.startsWith('WPA3')) return 'bg-green-600 text-gray-100';
+            if (label.startsWith('WPA') || label === 'OWE') return 'bg-yellow-600 text-gray-100';
+            return 'bg-gray-600 text-gray-100';
+        }
+        
+        // Fleet reports tag each network with the sensor that heard it strongest
+        function sensorTag(i) {
+            if (!columns.sensor) return '';
+            const seen = columns.seenBy[i] > 1 ? ` (seen by ${columns.seenBy[i]})` : '';
+            return ` <span class="text-xs text-gray-400">${escapeHtml(columns.sensorLabels[columns.sensor[i]])}${seen}</span>`;
+        }
+        
+        function renderRow(i, position) {
+            const [signalClass, signalStrength, signalWidth] = signalLevel(signal[i]);
+            const securityLabel = columns.securityLabels[security[i]];
+            const rowClass = position % 2 === 0 ? 'bg-gray-800' : 'bg-gray-750';
+            return `<tr class="${rowClass} hover:bg-gray-700 text-sm text-gray-300" style="height: ${ROW_HEIGHT}px">` +
+                `<td class="px-6 font-medium text-gray-200 whitespace-nowrap overflow-hidden">${escapeHtml(columns.ssid[i])}${sensorTag(i)}</td>` +
+                `<td class="px-6">${frequency[i]}</td>` +
+                `<td class="px-6">${channel[i] || 'Unknown'}</td>` +
+                `<td class="px-6">${signal[i]}</td>` +
+                `<td class="px-6"><span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full ${badgeClass(securityLabel)}">${escapeHtml(securityLabel)}</span></td>` +
+                `<td class="px-6">${signalStrength}<div class="w-full bg-gray-600 rounded-full h-2.5">` +
+                `<div class="${signalClass} h-2.5 rounded-full" style="width: ${signalWidth}"></div></div></td></tr>`;
+        }
+        
+        // Render only the rows inside the scrolled window
+        function render() {
+            spacer.style.height = `${view.length * ROW_HEIGHT}px`;
+            const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            let rows = '';
+            for (let position = first; position < last; position++) {
+                rows += renderRow(view[position], position);
+            }
+            visibleRows.parentElement.style.top = `${first * ROW_HEIGHT}px`;
+            visibleRows.innerHTML = rows;
+        }
+        
+        function sortView() {
+            if (sortKey === 'ssid') {
+                view.sort((a, b) => sortDirection * columns.ssid[a].localeCompare(columns.ssid[b]) || a - b);
+            } else if (sortKey !== null) {
+                const values = numericColumns[sortKey];
+                view.sort((a, b) => sortDirection * (values[a] - values[b]) || a - b);
+            }
+        }
+        
+        function sortBy(key, direction) {
+            if (direction) {
+                sortDirection = direction === 'asc' ? 1 : -1;
+            } else {
+                sortDirection = sortKey === key ? -sortDirection : 1;
+            }
+            sortKey = key;
+            sortView();
+            render();
+        }
+        
+        function applyFilters(event, keepScroll) {
+            const text = ssidFilter.value.toLowerCase();
+            const bandCode = parseInt(bandFilter.value);
+            const securityCode = parseInt(securityFilter.value);
+            const matches = new Uint32Array(count);
+            let matched = 0;
+            for (let i = 0; i < count; i++) {
+                if (bandCode >= 0 && band[i] !== bandCode) continue;
+                if (securityCode >= 0 && security[i] !== securityCode) continue;
+                if (text && !ssidLower[i].includes(text)) continue;
+                matches[matched++] = i;
+            }
+            view = matches.subarray(0, matched);
+            sortView();
+            if (!keepScroll) viewport.scrollTop = 0;
+            document.getElementById('matchCount').textContent = `Showing ${matched} of ${count} networks`;
+            render();
+        }
+        
+        function fillFacet(select, labels, codes, allLabel) {
+            const selected = select.value;
+            const counts = new Uint32Array(labels.length);
+            codes.forEach(code => counts[code]++);
+            select.innerHTML = `<option value="-1">${allLabel}</option>` + labels.map((label, code) =>
+                counts[code] ? `<option value="${code}">${escapeHtml(label)} (${counts[code]})</option>` : '').join('');
+            select.value = selected || '-1';
+            if (!select.value) select.value = '-1';
+        }
+        
+        // (Re)load the columns; the live dashboard calls this on every update
+        function loadColumns(data, keepScroll) {
+            columns = data;
+            count = columns.ssid.length;
+            frequency = Uint16Array.from(columns.frequency);
+            channel = Int16Array.from(columns.channel);
+            signal = Int16Array.from(columns.signal);
+            security = Uint8Array.from(columns.security);
+            band = Uint8Array.from(columns.band);
+            ssidLower = columns.ssid.map(ssid => ssid.toLowerCase());
+            numericColumns = {frequency: frequency, channel: channel, signal: signal, security: security};
+            fillFacet(bandFilter, columns.bandLabels, band, 'All bands');
+            fillFacet(securityFilter, columns.securityLabels, security, 'All security');
+            applyFilters(null, keepScroll);
+        }
+        
+        ssidFilter.addEventListener('input', applyFilters);
+        bandFilter.addEventListener('change', applyFilters);
+        securityFilter.addEventListener('change', applyFilters);
+        viewport.addEventListener('scroll', () => window.requestAnimationFrame(render));
+        loadColumns(columns);
+"""
+
+# Appended to the virtual table script for the live dashboard (dashboard.py):
+# applies the snapshot/delta/charts events from /events to the page.
+_LIVE_SCRIPT = """        
+        const liveNetworks = new Map();
+        
+        function networkKey(network) {
+            return network.bssid || `ssid:${network.ssid}`;
+        }
+        
+        function dictionaryCode(labels, label) {
+            let code = labels.indexOf(label);
+            if (code < 0) {
+                code = labels.length;
+                labels.push(label);
+            }
+            return code;
+        }
+        
+        function showLiveNetworks(timestamp) {
+            const list = Array.from(liveNetworks.values());
+            const securityLabels = columns.securityLabels.slice();
+            const bandLabels = columns.bandLabels.slice();
+            loadColumns({
+                ssid: list.map(n => n.ssid),
+                bssid: list.map(n => n.bssid),
+                frequency: list.map(n => n.frequency),
+                channel: list.map(n => n.channel || 0),
+                signal: list.map(n => n.signal),
+                security: list.map(n => dictionaryCode(securityLabels, n.security)),
+                band: list.map(n => dictionaryCode(bandLabels, n.band || 'Unknown')),
+                securityLabels: securityLabels,
+                bandLabels: bandLabels
+            }, true);
+            document.getElementById('networkCount').textContent = `Networks: ${list.length}`;
+            document.getElementById('generated').textContent = `Live, last scan ${timestamp}`;
+        }
+        
+        const events = new EventSource('/events');
+        events.addEventListener('snapshot', event => {
+            const data = JSON.parse(event.data);
+            liveNetworks.clear();
+            data.networks.forEach(network => liveNetworks.set(networkKey(network), network));
+            showLiveNetworks(data.timestamp);
+        });
+        events.addEventListener('delta', event => {
+            const data = JSON.parse(event.data);
+            for (const delta of data.deltas) {
+                const key = networkKey(delta);
+                const network = liveNetworks.get(key);
+                if (delta.change === 'appeared') {
+                    const {change, ...fields} = delta;
+                    liveNetworks.set(key, fields);
+                } else if (delta.change === 'disappeared') {
+                    liveNetworks.delete(key);
+                } else if (delta.change === 'channel') {
+                    Object.assign(network, {channel: delta.new, frequency: delta.frequency, band: delta.band});
+                } else {
+                    network[delta.change] = delta.new;
+                }
+            }
+            showLiveNetworks(data.timestamp);
+        });
+        events.addEventListener('charts', event => {
+            const charts = JSON.parse(event.data);
+            for (const id in charts) {
+                const element = document.getElementById(id);
+                if (element) element.innerHTML = charts[id];
+            }
+        });
+"""
+
+# (threshold dBm, bar class, label, bar width), strongest first
+_SIGNAL_LEVELS = (
+    (-50, "bg-green-500", "Excellent", "100%"),
+    (-60, "bg-green-400", "Good", "80%"),
+    (-70, "bg-yellow-400", "Fair", "60%"),
+    (-80, "bg-orange-400", "Weak", "40%"),
+)
+_SIGNAL_POOR = ("bg-red-500", "Poor", "20%")
+_SIGNAL_UNKNOWN = ("", "Unknown", "0%")
+
+def get_signal_level(signal):
+    """Return (bar class, label, bar width) for a signal strength in dBm."""
+    if not isinstance(signal, (int, float)):
+        return _SIGNAL_UNKNOWN
+    for threshold, signal_class, signal_strength, signal_width in _SIGNAL_LEVELS:
+        if signal >= threshold:
+            return signal_class, signal_strength, signal_width
+    return _SIGNAL_POOR
+
+def _signal_title(network):
+    """Return the tooltip for a signal cell: its statistics when tracked, else nothing."""
+    stats = network.get('signal_stats')
+    if not stats:
+        return ""
+    return (f"Last {network['signal_raw']} dBm, avg {stats['ewma']} \u00b1{stats['stddev']}, "
+            f"p10/p50/p90 {stats['p10']}/{stats['p50']}/{stats['p90']}, "
+            f"range {stats['min']}..{stats['max']} over {stats['samples']} scans")
+
+def _sensor_tag(network):
+    """Return the sensor line under the SSID of a fleet-aggregated network, else nothing."""
+    sensors = network.get('sensors')
+    if not sensors:
+        return ""
+    seen = f" (seen by {len(sensors)})" if len(sensors) > 1 else ""
+    return f'\n                                    <div class="text-xs text-gray-400">{html.escape(network["sensor"])}{seen}</div>'
+
+_ALERT_BADGES = {
+    "high": "bg-red-600 text-gray-100",
+    "medium": "bg-yellow-600 text-gray-100",
+    "low": "bg-gray-600 text-gray-100"
+}
+
+def _alert_badge(alert):
+    kind = alert['kind'].replace('_', ' ')
+    return (f'<span class="px-2 inline-flex text-xs leading-5 font-semibold rounded-full {_ALERT_BADGES[alert["severity"]]}" '
+            f'title="{html.escape(alert["detail"])}">{kind}</span>')
+
+def _alert_tag(network):
+    """Return the alert badge under the SSID of a network flagged by rogue.py, else nothing."""
+    alert = network.get('alert')
+    if not alert:
+        return ""
+    return f'\n                                    <div class="mt-1">{_alert_badge(alert)}</div>'
+
+def _iter_report_rows(networks):
+    """Yield the rendered table row for each network."""
+    render = _REPORT_ROW.format
+    escape = html.escape
+    for i, network in enumerate(networks):
+        channel = network['channel'] if network['channel'] is not None else "Unknown"
+        security = network['security']
+        signal_class, signal_strength, signal_width = get_signal_level(network['signal'])
+        yield render(
+            row_class="bg-gray-800" if i % 2 == 0 else "bg-gray-750",
+            ssid=escape(network['ssid']),
+            tags=_sensor_tag(network) + _alert_tag(network),
+            frequency=network['frequency'],
+            channel=channel,
+            signal=network['signal'],
+            signal_title=_signal_title(network),
+            badge_class=get_security_badge_color(security),
+            security=security,
+            signal_strength=signal_strength,
+            signal_class=signal_class,
+            signal_width=signal_width
+        )
+
+def _json_default(obj):
+    """Encode the compact record types from records.py as plain JSON."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if hasattr(obj, 'columnar'):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _iter_json(networks):
+    """Yield the networks as JSON chunks that are safe inside a <script> tag."""
+    for chunk in json.JSONEncoder(default=_json_default).iterencode(networks):
+        yield chunk.replace("</", "<\\/")
+
+def _columnar(networks):
+    """Return the networks as a dict of columns for the virtualized report.
+
+    Security and band are dictionary-encoded as small integer codes into
+    'securityLabels' and 'bandLabels'; unmapped channels become 0. BSSIDs
+    are kept (None when unknown) so aggregation can tell APs apart. Fleet
+    reports add 'sensor' (codes into 'sensorLabels') and 'seenBy', the
+    number of sensors that heard each network. A records.ScanBatch
+    supplies its columns directly.
+    """
+    if hasattr(networks, 'columnar'):
+        return networks.columnar()
+    security_codes = {}
+    band_codes = {}
+    columns = {'ssid': [], 'bssid': [], 'frequency': [], 'channel': [], 'signal': [], 'security': [], 'band': []}
+    for network in networks:
+        columns['ssid'].append(network['ssid'])
+        columns['bssid'].append(network.get('bssid'))
+        columns['frequency'].append(network['frequency'])
+        columns['channel'].append(network['channel'] or 0)
+        columns['signal'].append(network['signal'])
+        columns['security'].append(security_codes.setdefault(network['security'], len(security_codes)))
+        columns['band'].append(band_codes.setdefault(network.get('band') or "Unknown", len(band_codes)))
+    columns['securityLabels'] = list(security_codes)
+    columns['bandLabels'] = list(band_codes)
+    if networks and networks[0].get('sensors'):
+        sensor_codes = {}
+        columns['sensor'] = [sensor_codes.setdefault(network['sensor'], len(sensor_codes)) for network in networks]
+        columns['seenBy'] = [len(network['sensors']) for network in networks]
+        columns['sensorLabels'] = list(sensor_codes)
+    return columns
+
+def _iter_columnar_json(networks):
+    """Yield the columnar network data as compact, <script>-safe JSON chunks."""
+    encoder = json.JSONEncoder(separators=(',', ':'))
+    for chunk in encoder.iterencode(_columnar(networks)):
+        yield chunk.replace("</", "<\\/")
+
+_BAND_ORDER = {"2.4 GHz": 0, "5 GHz": 1, "6 GHz": 2}
+
+def channel_color(channel, band):
+    """Return the chart color for a channel, grouped by band and sub-band."""
+    if band == "2.4 GHz":
+        return 'rgba(59, 130, 246, 0.7)'
+    if band == "6 GHz":
+        return 'rgba(236, 72, 153, 0.7)'
+    if channel <= 48:
+        return 'rgba(16, 185, 129, 0.7)'
+    if channel <= 64:
+        return 'rgba(139, 92, 246, 0.7)'
+    if channel <= 144:
+        return 'rgba(249, 115, 22, 0.7)'
+    return 'rgba(239, 68, 68, 0.7)'
+
+def report_aggregates(networks):
+    """Count networks per channel and per security type for the report charts.
+
+    Returns {'channels': [{'label', 'band', 'count', 'color'}],
+    'security': [{'label', 'count'}], 'congestion': [...]}, channels ordered
+    by band then channel. Channels are counted per band, since 6 GHz reuses
+    2.4 GHz numbers; 'congestion' is congestion.congestion_by_band().
+    """
+    channel_counts = Counter()
+    security_counts = Counter()
+    for network in networks:
+        if network['channel'] is not None:
+            channel_counts[network.get('band'), network['channel']] += 1
+        security_counts[network['security']] += 1
+
+    channels = []
+    for (band, channel), count in sorted(channel_counts.items(),
+                                         key=lambda item: (_BAND_ORDER.get(item[0][0], 3), item[0][1])):
+        channels.append({
+            'label': str(channel),
+            'band': band or "Unknown",
+            'count': count,
+            'color': channel_color(channel, band)
+        })
+    security = [{'label': label, 'count': count} for label, count in security_counts.items()]
+    from congestion import congestion_by_band
+    return {'channels': channels, 'security': security, 'congestion': congestion_by_band(networks)}
+
+_CONGESTION_SECTION = """            <!-- Overlap-aware congestion and recommended channels -->
+            <div id="congestion" class="p-6 bg-gray-800">
+                <h2 class="text-xl font-semibold mb-4 text-white">Channel Congestion</h2>
+                <div id="congestionBands" class="grid grid-cols-1 gap-6">
+{bands}                </div>
+            </div>
+"""
+
+_CONGESTION_BAND = """                    <div class="bg-gray-800 p-4 rounded-lg shadow">
+                        <h3 class="text-lg font-semibold mb-2 text-white">{band}: recommended channel {channel} ({width} MHz, {interference} dBm)</h3>
+                        <div class="w-full h-[250px]">
+                            {chart}
+                        </div>
+                    </div>
+"""
+
+_RECOMMENDED_COLOR = 'rgba(34, 197, 94, 0.9)'
+
+def _congestion_section(congestion):
+    """Render the congestion model as one interference chart per band."""
+    if not congestion:
+        return ""
+    return _CONGESTION_SECTION.format(bands=_congestion_bands(congestion))
+
+def _congestion_bands(congestion):
+    """Render the per-band congestion charts of the congestion section."""
+    from congestion import NOISE_FLOOR_DBM
+    from report_assets import svg_bar_chart
+
+    bands = []
+    for entry in congestion:
+        bars = []
+        for channel, interference, load in zip(entry['channels'], entry['interference'], entry['load']):
+            color = _RECOMMENDED_COLOR if channel == entry['recommended'] else channel_color(channel, entry['band'])
+            bars.append((str(channel), interference - NOISE_FLOOR_DBM, color,
+                         f"Channel {channel}: {interference} dBm, {load} overlapping networks"))
+        bands.append(_CONGESTION_BAND.format(
+            band=entry['band'],
+            channel=entry['recommended'],
+            width=entry['recommended_width'],
+            interference=entry['recommended_interference'],
+            chart=svg_bar_chart(bars, x_title="Channel", y_title="dB above noise floor")
+        ))
+    return ''.join(bands)
+
+_ALERTS_SECTION = """            <!-- Findings against the AP inventory -->
+            <div id="alerts" class="p-6 bg-gray-800">
+                <h2 class="text-xl font-semibold mb-4 text-white">Security Alerts ({count})</h2>
+{alerts}            </div>
+"""
+
+_ALERT_LINE = """                <div class="flex items-center gap-2 mb-2 text-sm text-gray-300">{badge} <span>{ssid} ({bssid}, channel {channel}, {signal} dBm): {detail}</span></div>
+"""
+
+def _alerts_section(networks):
+    """List the networks flagged by rogue.py, most severe first; empty if there are none."""
+    if hasattr(networks, 'columnar'):
+        return ""
+    from rogue import SEVERITIES
+    alerts = sorted((network['alert'] for network in networks if network.get('alert')),
+                    key=lambda alert: -SEVERITIES.index(alert['severity']))
+    if not alerts:
+        return ""
+    escape = html.escape
+    lines = ''.join(_ALERT_LINE.format(badge=_alert_badge(alert), ssid=escape(alert['ssid']),
+                                       bssid=alert['bssid'] or "no BSSID", channel=alert['channel'] or "?",
+                                       signal=alert['signal'], detail=escape(alert['detail']))
+                    for alert in alerts)
+    return _ALERTS_SECTION.format(count=len(alerts), alerts=lines)
+
+def _survey_section(survey):
+    """Render the survey heatmaps section, if there is a survey."""
+    if survey is None:
+        return ""
+    from survey import survey_section
+    with span("survey_heatmaps", points=len(survey)):
+        return survey_section(survey)
+
+def _fleet_section(sensors):
+    """Render the per-sensor counts of an aggregated report, if there are any."""
+    if not sensors:
+        return ""
+    from fleet import fleet_section
+    return fleet_section(sensors)
+
+def _offline_charts(aggregates):
+    """Return the (top, channel, security) charts as inline SVG."""
+    from report_assets import svg_bar_chart, svg_pie_chart
+
+    bars = [(entry['label'], entry['count'], entry['color'],
+             f"Channel {entry['label']} ({entry['band']}): {entry['count']}")
+            for entry in aggregates['channels']]
+    slices = [(entry['label'], entry['count']) for entry in aggregates['security']]
+    return (
+        svg_bar_chart(bars, x_title="Channel", y_title="Number of Networks"),
+        svg_bar_chart(bars, width=400, height=300),
+        svg_pie_chart(slices)
+    )
 
-    # Replace the JSON placeholder with actual network data
-    json_data = json.dumps(networks)
-    html_content = html_content.replace("{JSON_PLACEHOLDER}", json_data)
+def chart_fragments(networks):
+    """Return {element id: inline SVG} for every report chart.
+
+    The live dashboard pushes these to replace the charts of an offline
+    report in place.
+    """
+    aggregates = report_aggregates(networks)
+    top_chart, channel_chart, security_chart = _offline_charts(aggregates)
+    return {
+        'topChart': top_chart,
+        'channelChartContainer': channel_chart,
+        'securityChartContainer': security_chart,
+        'congestionBands': _congestion_bands(aggregates['congestion'])
+    }
+
+def write_html_report(networks, f, timestamp=None, virtual=False, offline=False, live=False, survey=None,
+                      fleet=None):
+    """Stream the HTML report for `networks` to the text file object `f`.
+
+    The document is written header, row by row, then footer with the
+    embedded JSON, so it is never held in memory as a whole. With
+    `virtual` set, no table rows are written; the data is shipped once as
+    columnar JSON and the browser renders only the rows in view.
+
+    With `offline` set the report loads nothing from the network: the CSS
+    is an inlined Tailwind subset and the charts are inline SVG.
+
+    With `live` set (implies `virtual` and `offline`) the page subscribes
+    to the dashboard server's event stream and updates itself in place.
+
+    With `survey` (a survey.Survey) the report includes its coverage heatmaps,
+    and with `fleet` (the 'sensors' of fleet.aggregate) its per-sensor counts.
+    """
+    now = datetime.now()
+    if timestamp is None:
+        timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+    if live:
+        virtual = offline = True
+    with span("report_render", mode="virtual" if virtual else "table"):
+        _write_html_report(networks, f, timestamp, now, virtual, offline, live, survey, fleet)
+
+def _write_html_report(networks, f, timestamp, now, virtual, offline, live=False, survey=None, fleet=None):
+    """Write the report pieces in order; see write_html_report."""
+    aggregates = report_aggregates(networks)
+    if offline:
+        from report_assets import OFFLINE_CSS
+        assets = f"    <style>\n{OFFLINE_CSS}    </style>"
+        top_chart, channel_chart, security_chart = _offline_charts(aggregates)
+        chart_library = ""
+    else:
+        assets = _ONLINE_ASSETS
+        top_chart, channel_chart, security_chart = _ONLINE_TOP_CHART, _ONLINE_CHANNEL_CHART, _ONLINE_SECURITY_CHART
+        chart_library = _ONLINE_CHART_LIBRARY
+    body_end = _REPORT_BODY_END.format(
+        channel_chart=channel_chart,
+        security_chart=security_chart,
+        chart_library=chart_library
+    )
+
+    f.write(_REPORT_HEAD.format(
+        timestamp=timestamp,
+        assets=assets,
+        generated=now.strftime("%Y-%m-%d %H:%M:%S"),
+        os_version=html.escape(platform.version()),
+        count=len(networks),
+        top_chart=top_chart,
+        fleet=_fleet_section(fleet),
+        alerts=_alerts_section(networks),
+        congestion=_congestion_section(aggregates['congestion']),
+        survey=_survey_section(survey)
+    ))
+    if virtual:
+        f.write(_VIRTUAL_TABLE)
+        f.write(body_end)
+        f.write(_VIRTUAL_SCRIPT_START)
+        f.writelines(_iter_columnar_json(networks))
+        f.write(_VIRTUAL_SCRIPT_END)
+        if live:
+            f.write(_LIVE_SCRIPT)
+    else:
+        f.write(_REPORT_TABLE_START)
+        f.writelines(_iter_report_rows(networks))
+        f.write(_REPORT_TABLE_END)
+        f.write(body_end)
+        f.write(_REPORT_TABLE_SCRIPT_START)
+        f.writelines(_iter_json(networks))
+        f.write(_REPORT_TABLE_SCRIPT_END)
+    if not offline:
+        f.write(_REPORT_AGGREGATES_START)
+        f.writelines(_iter_json(aggregates))
+        f.write(";\n")
+        f.write(_REPORT_CHARTS_SCRIPT)
+    f.write(_REPORT_END)
+
+def write_report_file(networks, filename, timestamp=None, virtual=False, offline=False, compress=False, survey=None,
+                      fleet=None):
+    """Write the HTML report for `networks` to `filename`, gzip-compressed if `compress`."""
+    if compress:
+        import gzip
+        with gzip.open(filename, 'wt', encoding='utf-8') as f:
+            write_html_report(networks, f, timestamp, virtual, offline, survey=survey, fleet=fleet)
+    else:
+        with open(filename, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+            write_html_report(networks, f, timestamp, virtual, offline, survey=survey, fleet=fleet)
+
+def generate_html_report(networks, open_browser=True, virtual=None, offline=False, compress=False, survey=None,
+                         fleet=None):
+    """Generate a beautiful HTML report with Tailwind CSS.
+
+    `virtual` selects the virtualized table; by default it is used once
+    there are more than VIRTUAL_TABLE_THRESHOLD networks. `offline` writes
+    a self-contained report, and `compress` writes it gzip-compressed as
+    .html.gz for serving with Content-Encoding: gzip. `survey` adds the
+    heatmaps of a survey.Survey, and `fleet` the per-sensor counts of
+    fleet.aggregate.
+    """
+    if not networks:
+        print(f"{Fore.RED}No network data to generate report.{Style.RESET_ALL}")
+        return
+    if virtual is None:
+        virtual = len(networks) > VIRTUAL_TABLE_THRESHOLD
     
-    # Write to file
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    filename = f"wifi_scan_report_{timestamp}.html" + (".gz" if compress else "")
+    write_report_file(networks, filename, timestamp, virtual, offline, compress, survey, fleet)
     
     print(f"{Fore.GREEN}HTML report generated: {os.path.abspath(filename)}{Style.RESET_ALL}")
     
+    # Browsers download rather than display a bare .gz file
+    if not open_browser or compress:
+        return filename
+
     # Try to open the report in the default browser
     try:
+        import webbrowser
         webbrowser.open('file://' + os.path.abspath(filename))
         print(f"{Fore.CYAN}Opening report in browser...{Style.RESET_ALL}")
     except:
         print(f"{Fore.YELLOW}Unable to open browser automatically. Please open the HTML file manually.{Style.RESET_ALL}")
+    return filename
 
-def check_requirements():
+def check_requirements(backend=None):
     """Provide OS-specific guidance."""
+    if backend is not None and backend.name == "replay":
+        return
     os_name = platform.system()
     if os_name == "Windows":
         print(f"{Fore.YELLOW}Note: On Windows, enable Location Services (Settings > Privacy > Location).{Style.RESET_ALL}")
         print("Run as Administrator if issues persist.")
     elif os_name == "Darwin":  # macOS
         print(f"{Fore.YELLOW}Note: On macOS, you may need to run with 'sudo' for Wi-Fi access.{Style.RESET_ALL}")
+    elif os_name == "Linux":
+        print(f"{Fore.YELLOW}Note: On Linux, run as root for fresh scans; otherwise cached results are shown.{Style.RESET_ALL}")
     else:
-        print(f"{Fore.RED}Unsupported OS: {os_name}. This script supports Windows and macOS.{Style.RESET_ALL}")
+        print(f"{Fore.RED}Unsupported OS: {os_name}. This script supports Windows, macOS and Linux.{Style.RESET_ALL}")
         sys.exit(1)
 
 def print_network_details(network):
-    print(f"\n{Fore.YELLOW}=== NETWORK DEBUG INFO ==={Style.RESET_ALL}")
-    print(f"SSID: {network.ssid if network.ssid else '<Hidden>'}")
-    print(f"Raw frequency value: {network.freq}")
-    print(f"Signal strength: {network.signal}")
-    print(f"Network object type: {type(network)}")
-    print(f"Network object attributes: {dir(network)}")
-    print(f"{Fore.YELLOW}========================={Style.RESET_ALL}\n")
-
-def main():
+    """Log a raw pywifi scan result at debug level."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("SSID: %s", network.ssid if network.ssid else '<Hidden>')
+    logger.debug("Raw frequency value: %s (%s)", network.freq, type(network.freq).__name__)
+    logger.debug("Signal strength: %s", network.signal)
+    logger.debug("Network object type: %s", type(network))
+    logger.debug("Network object attributes: %s", dir(network))
+
+def configure_logging(level="WARNING"):
+    """Send scanner log records at `level` and above to stderr.
+
+    pywifi configures the root logger on import, so the scanner logger gets
+    its own handler instead of relying on logging.basicConfig.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+COMMANDS = ("scan", "watch", "serve", "aggregate")
+
+def build_parser():
+    """Return the command-line parser.
+
+    Every subcommand takes the common options; `scan` is the default when
+    no subcommand is given.
+    """
+    import argparse
+
+    general = argparse.ArgumentParser(add_help=False)
+    general.add_argument("--log-level", nargs="?", const="INFO", default="WARNING", metavar="LEVEL",
+                         help="log to stderr at LEVEL (INFO if no level is given)")
+    general.add_argument("--metrics", nargs="?", const="wifi_scanner_metrics.prom", metavar="PATH",
+                         help="export stage latency metrics (.prom for Prometheus, else JSON lines)")
+    general.add_argument("--profile", nargs="?", const="wifi_scanner.pstats", metavar="PATH",
+                         help="write a cProfile profile of the run")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[general])
+    common.add_argument("--backend", choices=("pywifi", "iw"),
+                        help="scanner backend (default: pywifi on Windows, iw elsewhere)")
+    common.add_argument("--record", nargs="?", const="wifi_scan_recording.jsonl", metavar="PATH",
+                        help="save raw scan results to a JSON lines recording")
+    common.add_argument("--replay", metavar="PATH", help="play back a recording instead of scanning")
+    common.add_argument("--loop", action="store_true", help="repeat the replayed recording forever")
+    common.add_argument("--cache-ttl", type=float, metavar="SECONDS",
+                        help="reuse scan results for this long; concurrent scans share one radio scan")
+    common.add_argument("--stale-while-revalidate", action="store_true",
+                        help="with --cache-ttl, return expired results while refreshing them in the background")
+
+    storage = argparse.ArgumentParser(add_help=False)
+    storage.add_argument("--history", nargs="?", const="", metavar="PATH",
+                         help="record scans in the SQLite scan history")
+    storage.add_argument("--delta", nargs="?", const="", metavar="PATH",
+                         help="append the changes since the previous scan to a delta log (state kept in PATH.state)")
+    storage.add_argument("--export", metavar="PATH",
+                         help="append every scan to a .csv, .jsonl or .wscan (binary columnar) export")
+    storage.add_argument("--inventory", metavar="PATH",
+                         help="flag rogue APs and evil twins against this CSV/JSON list of authorized APs")
+    storage.add_argument("--alerts", nargs="?", const="", metavar="PATH",
+                         help="with --inventory, append alerts to a JSON lines alert log")
+    storage.add_argument("--flag-unknown", action="store_true",
+                         help="with --inventory, also flag networks that are not in it")
+
+    report = argparse.ArgumentParser(add_help=False)
+    report.add_argument("--offline", action="store_true", help="write a self-contained report")
+    report.add_argument("--gzip", action="store_true", help="write the report gzip-compressed")
+    report.add_argument("--no-browser", action="store_true", help="don't open the report in a browser")
+
+    parser = argparse.ArgumentParser(prog="scanner.py", description="Scan nearby Wi-Fi networks and report on them.")
+    commands = parser.add_subparsers(dest="command", metavar="{scan,watch,serve,aggregate}")
+
+    scan = commands.add_parser("scan", parents=[common, storage, report],
+                               help="scan once and write an HTML report (default)")
+    scan.add_argument("--all-interfaces", action="store_true", help="scan every interface concurrently")
+    scan.add_argument("--survey", nargs="?", const="wifi_survey.jsonl", metavar="PATH",
+                      help="site survey file; the report shows its coverage heatmaps")
+    scan.add_argument("--at", metavar="X,Y", help="with --survey, add this scan at floor-plan position X,Y")
+    scan.add_argument("--floorplan", metavar="IMAGE", help="with --survey, image drawn under the heatmaps")
+    scan.add_argument("--floor-size", metavar="W,H", help="with --survey, floor-plan width and height in plan units")
+    scan.add_argument("--delta-report", nargs="?", const="html", choices=("html", "json"),
+                      help="write only the changes since the previous scan (implies --delta)")
+
+    watch = commands.add_parser("watch", parents=[common, storage], help="scan repeatedly and print a summary")
+    watch.add_argument("interval", nargs="?", type=float, default=5.0, help="seconds between scans")
+    watch.add_argument("--live", action="store_true", help="keep a table on screen and redraw only what changed")
+    watch.add_argument("--sort", choices=("signal", "ssid", "channel", "security"), default="signal",
+                       help="--live table order (default: strongest first)")
+    watch.add_argument("--filter", metavar="TEXT", help="--live: only networks whose SSID, security or BSSID contains TEXT")
+    # Accepted only to be rejected with a clear message: watch has no reports
+    watch.add_argument("--delta-report", nargs="?", const="html", help=argparse.SUPPRESS)
+
+    serve = commands.add_parser("serve", parents=[common], help="serve a live dashboard over HTTP")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on")
+    serve.add_argument("--interval", type=float, default=5.0, help="seconds between scans")
+
+    aggregate = commands.add_parser("aggregate", parents=[general, report],
+                                    help="merge reports exported by many sensors into one report")
+    aggregate.add_argument("files", nargs="+", metavar="[SENSOR=]PATH",
+                           help="HTML report (.html/.html.gz) or JSON scan; the sensor defaults to the file name")
+    aggregate.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    return parser
+
+def main(argv=None):
     """Main entry point for the script."""
-    check_requirements()
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["scan"] + list(argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    from colorama import init
+    init()
+    configure_logging(args.log_level)
+
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        _run(args, parser)
+    except BackendUnavailable as e:
+        print(f"{Fore.RED}{e}{Style.RESET_ALL}")
+        sys.exit(1)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"{Fore.CYAN}Profile written to {args.profile}{Style.RESET_ALL}")
+        if args.metrics:
+            METRICS.export(args.metrics)
+
+def _run(args, parser):
+    """Run the command parsed from the command line; option conflicts are reported through `parser`."""
+    if args.command == "watch" and args.delta_report:
+        parser.error("--delta-report applies to scan; watch appends every change to the --delta log")
+    if getattr(args, 'export', None):
+        from export import export_format
+        try:
+            export_format(args.export)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.command == "aggregate":
+        from fleet import aggregate_report
+        aggregate_report(args.files, args.workers, open_browser=not args.no_browser, offline=args.offline,
+                         compress=args.gzip)
+        return
+
+    from backends import get_backend
+    backend = get_backend(args.backend, record=args.record, replay=args.replay, loop=args.loop,
+                          cache_ttl=args.cache_ttl, stale_while_revalidate=args.stale_while_revalidate)
+    check_requirements(backend)
     try:
-        network_data = scan_wifi()
-        if network_data:
-            generate_html_report(network_data)
+        if args.command == "serve":
+            from dashboard import serve_dashboard
+            serve_dashboard(args.interval, backend, args.host, args.port)
+            return
+
+        store = None
+        if args.history is not None:
+            from history import ScanHistory, DEFAULT_HISTORY_PATH
+            store = ScanHistory(args.history or DEFAULT_HISTORY_PATH)
+        delta_path = None
+        if args.delta is not None or getattr(args, 'delta_report', None):
+            from delta import DEFAULT_DELTA_PATH
+            delta_path = args.delta or DEFAULT_DELTA_PATH
+
+        detector = None
+        alert_path = None
+        if args.inventory:
+            from rogue import DEFAULT_ALERT_PATH, Inventory, RogueDetector
+            detector = RogueDetector(Inventory.load(args.inventory), args.flag_unknown)
+            if args.alerts is not None:
+                alert_path = args.alerts or DEFAULT_ALERT_PATH
+
+        if args.command == "watch":
+            view = None
+            if args.live:
+                from terminal import LiveTable
+                view = LiveTable(sort=args.sort, filter_text=args.filter)
+            try:
+                monitor(args.interval, store, args.metrics, backend, delta_path, view, args.export, detector,
+                        alert_path)
+            finally:
+                if view is not None:
+                    view.close()
+        else:
+            _scan_once(args, backend, store, delta_path, detector, alert_path)
     except KeyboardInterrupt:
         print(f"{Fore.YELLOW}Scan interrupted by user.{Style.RESET_ALL}")
-    except Exception as e:
+    except (OSError, ValueError) as e:
+        # Expected failures (files, devices, bad input) get one line; anything else keeps its traceback
+        if logger.isEnabledFor(logging.DEBUG):
+            raise
         print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
 
+def _scan_once(args, backend, store, delta_path, detector=None, alert_path=None):
+    """Scan once, record the result and write the requested report."""
+    network_data = scan_wifi(all_interfaces=args.all_interfaces, backend=backend, tracker=_seeded_tracker(store))
+    if not network_data:
+        return
+    if store is not None:
+        store.record(network_data)
+    if args.export:
+        from export import append_batch
+        append_batch(args.export, {'timestamp': None, 'networks': network_data})
+    if detector is not None:
+        from rogue import append_alerts, print_alerts
+        network_data, alerts = detector.annotate(network_data)
+        print_alerts(alerts)
+        if alert_path:
+            append_alerts(alert_path, datetime.now().isoformat(timespec='seconds'), alerts)
+    survey = None
+    if args.survey:
+        from survey import Survey, parse_position
+        survey = Survey(args.survey, args.floorplan, parse_position(args.floor_size) if args.floor_size else None)
+        if args.at:
+            x, y = parse_position(args.at)
+            survey.add(x, y, network_data)
+            print(f"{Fore.CYAN}Survey point {len(survey)} recorded at ({x:g}, {y:g}){Style.RESET_ALL}")
+    if delta_path:
+        from delta import append_delta_log, generate_delta_report, load_tracker, save_checkpoint, summarize
+        tracker = load_tracker(delta_path)
+        deltas = tracker.update(network_data)
+        delta_batch = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'latency': None,
+                       'count': len(network_data), 'deltas': deltas}
+        append_delta_log(delta_path, delta_batch)
+        save_checkpoint(delta_path, tracker)
+        print(f"{Fore.CYAN}Changes since last scan: {summarize(deltas)}{Style.RESET_ALL}")
+        if args.delta_report:
+            generate_delta_report(delta_batch, args.delta_report)
+            return
+    generate_html_report(network_data, open_browser=not args.no_browser, offline=args.offline, compress=args.gzip,
+                         survey=survey)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,112 @@
+"""Scan triggering and completion polling shared by every backend.
+
+wait_for_scan() triggers a scan on a pywifi-style interface and returns
+as soon as the results settle; ScanPoller holds the settling rule so the
+asyncio scanner (aio.py) can reuse it. This module imports nothing from
+scanner.py, so the backends and the record types can depend on it
+without importing the CLI.
+"""
+import logging
+import time
+
+from metrics import span
+
+logger = logging.getLogger("wifi_scanner")
+
+# Upper bound on how long to wait for a scan to finish, in seconds.
+SCAN_DEADLINE = 5.0
+# Poll interval bounds for the scan completion backoff, in seconds.
+SCAN_POLL_MIN = 0.05
+SCAN_POLL_MAX = 0.25
+# Results identical to the pre-scan snapshot are accepted once they have been
+# stable this long, so a static RF environment doesn't wait for the deadline.
+SCAN_SETTLE = 1.5
+
+class BackendUnavailable(RuntimeError):
+    """A scanner backend can't run on this system; the message says why."""
+
+def _results_signature(results):
+    """Return a hashable fingerprint of a scan result set."""
+    return frozenset((r.bssid, r.freq, r.signal) for r in results)
+
+class ScanPoller:
+    """Decide when a triggered scan's results have settled.
+
+    Results count as settled once they differ from the pre-scan snapshot and
+    two consecutive polls agree, or once the interface leaves the scanning
+    state. Results matching the snapshot are accepted after `settle`
+    seconds of stability, and after `deadline` seconds whatever the driver
+    has is accepted. Shared by wait_for_scan and aio.wait_for_scan: pass
+    every poll to settled() and sleep next_delay() in between.
+    """
+
+    def __init__(self, name, stale_results, deadline=SCAN_DEADLINE, poll_min=SCAN_POLL_MIN,
+                 poll_max=SCAN_POLL_MAX, settle=SCAN_SETTLE):
+        from pywifi import const
+        self.scanning = const.IFACE_SCANNING
+        self.name = name
+        self.stale = _results_signature(stale_results)
+        self.deadline = deadline
+        self.poll_max = poll_max
+        self.settle = settle
+        self.interval = poll_min
+        self.previous = None
+        self.saw_scanning = False
+
+    @staticmethod
+    def status(iface):
+        """Return the interface status, or None if the driver can't report it."""
+        try:
+            return iface.status()
+        except Exception:
+            return None
+
+    def settled(self, results, status, latency):
+        """Return True once `results`, polled `latency` seconds in, are final."""
+        signature = _results_signature(results)
+        if status == self.scanning:
+            self.saw_scanning = True
+        elif self.saw_scanning and results:
+            return True
+
+        if results and signature == self.previous and (signature != self.stale or latency >= self.settle):
+            return True
+        if latency >= self.deadline:
+            logger.warning("Scan on %s hit the %.1fs deadline", self.name, self.deadline)
+            return True
+        self.previous = signature
+        return False
+
+    def next_delay(self, latency):
+        """Return the time to wait before the next poll, backing off up to poll_max."""
+        delay = min(self.interval, self.deadline - latency)
+        self.interval = min(self.interval * 1.5, self.poll_max)
+        return delay
+
+def wait_for_scan(iface, deadline=SCAN_DEADLINE, poll_min=SCAN_POLL_MIN, poll_max=SCAN_POLL_MAX,
+                  settle=SCAN_SETTLE):
+    """Trigger a scan and return (results, latency) as soon as the results settle.
+
+    See ScanPoller for when results count as settled. Polls back off from
+    poll_min to poll_max; after `deadline` seconds whatever the driver has
+    is returned.
+    """
+    name = iface.name()
+    poller = ScanPoller(name, iface.scan_results(), deadline, poll_min, poll_max, settle)
+    start = time.monotonic()
+    with span("scan_trigger", interface=name):
+        iface.scan()
+
+    with span("scan_wait", interface=name):
+        while True:
+            results = iface.scan_results()
+            latency = time.monotonic() - start
+            if poller.settled(results, poller.status(iface), latency):
+                break
+            time.sleep(poller.next_delay(latency))
+    logger.debug("Scan on %s settled after %.3fs with %d results", name, latency, len(results))
+    return results, latency
+
+def normalize_bssid(bssid):
+    """Return a BSSID as lowercase colon-separated hex without a trailing colon."""
+    return bssid.lower().rstrip(':') if bssid else None
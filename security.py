@@ -0,0 +1,195 @@
+"""Decoding of AKM and cipher suites into security descriptors.
+
+A scan result advertises a list of AKM (authentication and key
+management) suites and a pairwise cipher. describe_security() turns the
+pair into a SecurityDescriptor: the report label plus the protocol
+generation, the authentication method, whether several generations are
+offered at once (WPA/WPA2, WPA2/WPA3 transition) and a relative strength.
+
+AKM codes 0-5 are pywifi's AKM_TYPE_* constants; the iw backend also
+reports the suites pywifi has no constant for (SAE, OWE, FT, SHA-256 and
+Suite-B variants) with the codes defined here. The legacy labels are
+unchanged: "WPA" and "WPA2" are the 802.1X (Enterprise) suites, as they
+always were in reports and history.
+
+pywifi on Windows derives the AKM list from the default cipher alone:
+[AKM_WPA_PSK] for TKIP, [AKM_WPA2_PSK] for CCMP, [AKM_NONE] for open
+networks and an empty list for any other secured network (WEP, GCMP),
+which decodes as Unknown rather than Open. Detecting WPA3, OWE, WEP and
+Enterprise networks therefore needs the iw backend. A missing AKM list
+(None) is read as open, as before.
+
+Descriptors are memoized on the (AKM tuple, cipher) key, and the table
+is precomputed for every single-suite key, so classifying a stored
+observation is one dict lookup. classify_security() does the same for a
+whole column of AKM tuples and returns records.Security codes.
+"""
+from collections import namedtuple
+
+# AKM suites: pywifi's AKM_TYPE_* values, then the ones pywifi doesn't define
+AKM_NONE = 0
+AKM_WPA = 1
+AKM_WPA_PSK = 2
+AKM_WPA2 = 3
+AKM_WPA2_PSK = 4
+AKM_UNKNOWN = 5
+AKM_SAE = 6
+AKM_FT_SAE = 7
+AKM_SAE_EXT_KEY = 8
+AKM_OWE = 9
+AKM_FT_PSK = 10
+AKM_PSK_SHA256 = 11
+AKM_FT_8021X = 12
+AKM_8021X_SHA256 = 13
+AKM_8021X_SUITE_B = 14
+AKM_8021X_SUITE_B_192 = 15
+AKM_FT_8021X_SHA384 = 16
+
+# Pairwise ciphers: pywifi's CIPHER_TYPE_* values, then the newer ones
+CIPHER_NONE = 0
+CIPHER_WEP = 1
+CIPHER_TKIP = 2
+CIPHER_CCMP = 3
+CIPHER_UNKNOWN = 4
+CIPHER_GCMP = 5
+CIPHER_GCMP_256 = 6
+CIPHER_CCMP_256 = 7
+
+# AKM code -> (suite name, protocol generation, authentication)
+_AKM_SUITES = {
+    AKM_WPA: ("802.1X", "WPA", "Enterprise"),
+    AKM_WPA_PSK: ("PSK", "WPA", "PSK"),
+    AKM_WPA2: ("802.1X", "WPA2", "Enterprise"),
+    AKM_WPA2_PSK: ("PSK", "WPA2", "PSK"),
+    AKM_FT_PSK: ("FT-PSK", "WPA2", "PSK"),
+    AKM_PSK_SHA256: ("PSK-SHA256", "WPA2", "PSK"),
+    AKM_FT_8021X: ("FT-802.1X", "WPA2", "Enterprise"),
+    AKM_8021X_SHA256: ("802.1X-SHA256", "WPA2", "Enterprise"),
+    AKM_8021X_SUITE_B: ("802.1X-Suite-B", "WPA2", "Enterprise"),
+    AKM_SAE: ("SAE", "WPA3", "SAE"),
+    AKM_FT_SAE: ("FT-SAE", "WPA3", "SAE"),
+    AKM_SAE_EXT_KEY: ("SAE-EXT-KEY", "WPA3", "SAE"),
+    AKM_8021X_SUITE_B_192: ("802.1X-Suite-B-192", "WPA3", "Enterprise-192"),
+    AKM_FT_8021X_SHA384: ("FT-802.1X-SHA384", "WPA3", "Enterprise-192"),
+    AKM_OWE: ("OWE", "OWE", "OWE")
+}
+
+# WPA generations, weakest first; a descriptor's protocol is the strongest one offered
+GENERATIONS = ("WPA", "WPA2", "WPA3")
+
+CIPHER_NAMES = {
+    CIPHER_NONE: None,
+    CIPHER_WEP: "WEP",
+    CIPHER_TKIP: "TKIP",
+    CIPHER_CCMP: "CCMP",
+    CIPHER_UNKNOWN: None,
+    CIPHER_GCMP: "GCMP",
+    CIPHER_GCMP_256: "GCMP-256",
+    CIPHER_CCMP_256: "CCMP-256"
+}
+
+# Relative strength of each report label; a higher value is stronger
+SECURITY_STRENGTH = {
+    "Open": 0,
+    "WEP": 1,
+    "OWE": 1,
+    "WPA": 2,
+    "WPA-PSK": 2,
+    "WPA/WPA2": 2,
+    "WPA/WPA2-PSK": 2,
+    "WPA2": 3,
+    "WPA2-PSK": 3,
+    "WPA2/WPA3-SAE": 3,
+    "WPA3-SAE": 4,
+    "WPA3-Enterprise-192": 4
+}
+
+SecurityDescriptor = namedtuple('SecurityDescriptor',
+                                ('label', 'protocol', 'auth', 'suites', 'cipher', 'mixed', 'strength'))
+SecurityDescriptor.__doc__ = """Decoded security of one network.
+
+label is the report label; protocol the strongest generation offered
+(Open, WEP, OWE, WPA, WPA2 or WPA3); auth the authentication (None, PSK,
+SAE, Enterprise, Enterprise-192 or OWE); suites the decoded AKM suite
+names; cipher the pairwise cipher name or None; mixed whether more than
+one generation is accepted; strength as in SECURITY_STRENGTH, None for
+Unknown.
+"""
+
+UNKNOWN = SecurityDescriptor("Unknown", None, None, (), None, False, None)
+
+_DESCRIPTORS = {}
+# AKM key for results that carry no AKM list at all
+_NO_AKM = (AKM_NONE,)
+
+def _label(generations, auths):
+    """Return (report label, authentication) for the generations and authentications of the known suites."""
+    if "Enterprise-192" in auths:
+        return "WPA3-Enterprise-192", "Enterprise-192"
+    if "SAE" in auths:
+        return ("WPA2/WPA3-SAE" if "PSK" in auths else "WPA3-SAE"), "SAE"
+    if "PSK" in auths:
+        auth, suffix = "PSK", "-PSK"
+    elif "Enterprise" in auths:
+        auth, suffix = "Enterprise", ""
+    else:
+        return "OWE", "OWE"
+    generations = generations & {"WPA", "WPA2"}
+    if generations == {"WPA", "WPA2"}:
+        return "WPA/WPA2" + suffix, auth
+    return ("WPA2" if "WPA2" in generations else "WPA") + suffix, auth
+
+def _decode(akm, cipher):
+    cipher_name = CIPHER_NAMES.get(cipher)
+    suites = [_AKM_SUITES[code] for code in akm if code in _AKM_SUITES]
+    if not suites:
+        # An empty list is a secured network whose suite wasn't reported
+        if not akm or any(code != AKM_NONE for code in akm):
+            return UNKNOWN
+        if cipher == CIPHER_WEP:
+            return SecurityDescriptor("WEP", "WEP", None, (), cipher_name, False, SECURITY_STRENGTH["WEP"])
+        return SecurityDescriptor("Open", "Open", None, (), None, False, SECURITY_STRENGTH["Open"])
+
+    generations = {generation for _, generation, _ in suites} - {"OWE"}
+    label, auth = _label(generations, {auth for _, _, auth in suites})
+    names = tuple(dict.fromkeys(name for name, _, _ in suites))
+    # Mixed and transition modes accept more than one generation
+    return SecurityDescriptor(label, max(generations, key=GENERATIONS.index, default="OWE"), auth, names,
+                              cipher_name, len(generations) > 1, SECURITY_STRENGTH[label])
+
+def describe_security(akm, cipher=CIPHER_NONE):
+    """Return the SecurityDescriptor for an AKM list and pairwise cipher, memoized."""
+    key = (tuple(akm) if akm is not None else _NO_AKM, cipher)
+    descriptor = _DESCRIPTORS.get(key)
+    if descriptor is None:
+        descriptor = _DESCRIPTORS[key] = _decode(key[0], cipher)
+    return descriptor
+
+def classify_security(akms, ciphers=None):
+    """Return records.Security codes for a column of AKM tuples, as a uint8 array.
+
+    `ciphers` is the matching column of pairwise ciphers (none if not
+    given). Every distinct (AKM tuple, cipher) key is decoded once.
+    """
+    import numpy as np
+    from records import Security
+
+    codes = {}
+    column = []
+    if ciphers is None:
+        ciphers = [CIPHER_NONE] * len(akms)
+    for akm, cipher in zip(akms, ciphers):
+        key = (akm if type(akm) is tuple else tuple(akm) if akm is not None else _NO_AKM, cipher)
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = Security.from_label(describe_security(*key).label)
+        column.append(code)
+    return np.array(column, dtype=np.uint8)
+
+def _precompute():
+    """Fill the memo table with every single-suite key."""
+    for akm in [(), (AKM_NONE,), (AKM_UNKNOWN,)] + [(code,) for code in _AKM_SUITES]:
+        for cipher in CIPHER_NAMES:
+            describe_security(akm, cipher)
+
+_precompute()
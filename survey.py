@@ -0,0 +1,230 @@
+"""Site surveys: scans tagged with floor-plan positions, and coverage heatmaps.
+
+Walk the site and scan at marked positions:
+
+    python scanner.py scan --survey office.jsonl --at 12.5,4 --floorplan office.png --floor-size 40,25
+
+Every scan is appended to the survey file as one point ({'x', 'y',
+'timestamp', 'networks'}), and the report gains one heatmap for the best
+signal of all networks plus one per SSID. Coordinates are in floor-plan
+units with y pointing down, as in the plan image.
+
+Coverage is interpolated with inverse distance weighting (IDW). The
+weights depend only on where the samples and grid cells are, not on the
+access point, so they are computed once per block of grid cells and
+applied to every BSSID at once as a single matrix product.
+"""
+import base64
+import html
+import json
+import os
+import time
+
+import numpy as np
+
+DEFAULT_SURVEY_PATH = "wifi_survey.jsonl"
+
+# Grid cells along the longer side of the plan
+GRID_CELLS = 160
+
+# IDW distance exponent; higher values make coverage follow the nearest sample
+IDW_POWER = 2
+
+# Signal assumed where a network was not heard, in dBm
+UNHEARD_DBM = -100
+
+# Heatmaps per report besides the all-networks one
+MAX_HEATMAPS = 12
+
+# Grid cells x samples handled per block, bounding the weight matrix's memory
+_BLOCK_ELEMENTS = 1 << 22
+
+# Margin around the surveyed points when no floor size is given, as a fraction of their spread
+_MARGIN = 0.1
+
+# Heatmap colors by signal (dBm): red for poor through green for excellent
+_COLOR_STOPS = np.array([
+    (-90, 220, 38, 38, 170),
+    (-80, 249, 115, 22, 170),
+    (-70, 250, 204, 21, 170),
+    (-60, 74, 222, 128, 170),
+    (-50, 22, 163, 74, 170)
+], dtype=np.float64)
+
+_IMAGE_TYPES = {'.png': "image/png", '.jpg': "image/jpeg", '.jpeg': "image/jpeg", '.gif': "image/gif",
+                '.svg': "image/svg+xml"}
+
+def parse_position(text):
+    """Parse an 'X,Y' command-line value into a pair of floats."""
+    try:
+        x, y = (float(part) for part in text.split(','))
+    except ValueError:
+        raise ValueError(f"expected X,Y, got {text!r}") from None
+    return x, y
+
+class Survey:
+    """Survey points stored in a JSON lines file.
+
+    `floorplan` is an image drawn under the heatmaps and `size` its
+    (width, height) in plan units; without a size, the plan area is the
+    bounding box of the surveyed points.
+    """
+
+    def __init__(self, path=DEFAULT_SURVEY_PATH, floorplan=None, size=None):
+        self.path = path
+        self.floorplan = floorplan
+        self.size = size
+        self.points = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.points = [json.loads(line) for line in f if line.strip()]
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, x, y, networks, timestamp=None):
+        """Record one scan taken at (x, y) and append it to the survey file."""
+        point = {
+            'x': x,
+            'y': y,
+            'timestamp': timestamp or time.time(),
+            'networks': [{'bssid': n.get('bssid'), 'ssid': n['ssid'], 'channel': n['channel'],
+                          'band': n.get('band'), 'signal': n.get('signal_raw', n['signal'])} for n in networks]
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(point) + '\n')
+        self.points.append(point)
+        return point
+
+    def samples(self):
+        """Return (positions, keys, ssids, signals) for all points.
+
+        positions is a (points, 2) array; signals a (networks, points) array
+        holding the strongest sample of each network at each point, or
+        UNHEARD_DBM where it was not heard. Networks are keyed by BSSID,
+        else by SSID.
+        """
+        positions = np.array([(point['x'], point['y']) for point in self.points], dtype=np.float64)
+        index = {}
+        ssids = []
+        rows, columns, values = [], [], []
+        for column, point in enumerate(self.points):
+            for network in point['networks']:
+                key = network['bssid'] or f"ssid:{network['ssid']}"
+                row = index.get(key)
+                if row is None:
+                    row = index[key] = len(ssids)
+                    ssids.append(network['ssid'])
+                rows.append(row)
+                columns.append(column)
+                values.append(network['signal'])
+        signals = np.full((len(ssids), len(self.points)), UNHEARD_DBM, dtype=np.float64)
+        np.maximum.at(signals, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)),
+                      np.array(values, dtype=np.float64))
+        return positions.reshape(-1, 2), list(index), ssids, signals
+
+    def extent(self):
+        """Return the plan area (x0, y0, x1, y1)."""
+        if self.size:
+            return (0.0, 0.0, float(self.size[0]), float(self.size[1]))
+        positions = np.array([(point['x'], point['y']) for point in self.points], dtype=np.float64)
+        low, high = positions.min(axis=0), positions.max(axis=0)
+        margin = np.maximum((high - low) * _MARGIN, 1.0)
+        return tuple(float(v) for v in (*(low - margin), *(high + margin)))
+
+def grid_axes(extent, cells=GRID_CELLS):
+    """Return the x and y cell centers of an interpolation grid over `extent`."""
+    x0, y0, x1, y1 = extent
+    step = max(x1 - x0, y1 - y0) / cells
+    xs = np.arange(x0 + step / 2, x1, step)
+    ys = np.arange(y0 + step / 2, y1, step)
+    return xs, ys
+
+def idw_grid(positions, values, xs, ys, power=IDW_POWER):
+    """Interpolate sample values onto a grid by inverse distance weighting.
+
+    `positions` is (points, 2) and `values` (series, points); returns a
+    (series, len(ys), len(xs)) array. Cells are processed in blocks: one
+    weight matrix per block, shared by every series.
+    """
+    gx, gy = np.meshgrid(xs, ys)
+    cells = np.stack([gx.ravel(), gy.ravel()], axis=1)
+    result = np.empty((len(values), len(cells)), dtype=np.float64)
+    block = max(1, _BLOCK_ELEMENTS // max(len(positions), 1))
+    for start in range(0, len(cells), block):
+        chunk = cells[start:start + block]
+        squared = ((chunk[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+        # A sample exactly on a cell center gets a huge, finite weight instead of 1/0
+        weights = np.maximum(squared, 1e-12) ** (-power / 2)
+        weights /= weights.sum(axis=1, keepdims=True)
+        result[:, start:start + block] = values @ weights.T
+    return result.reshape(len(values), len(ys), len(xs))
+
+def coverage_maps(survey, cells=GRID_CELLS, max_maps=MAX_HEATMAPS):
+    """Return [(title, grid)] heatmaps: best signal overall, then per SSID.
+
+    SSIDs are ordered by the number of points they were heard at. Each
+    SSID map is the best signal of any of its BSSIDs at every cell.
+    """
+    positions, _, ssids, signals = survey.samples()
+    xs, ys = grid_axes(survey.extent(), cells)
+    grids = idw_grid(positions, signals, xs, ys)
+
+    maps = [("All networks (best signal)", grids.max(axis=0) if len(grids) else
+             np.full((len(ys), len(xs)), UNHEARD_DBM, dtype=np.float64))]
+    heard = (signals > UNHEARD_DBM).sum(axis=1)
+    by_ssid = {}
+    for row, ssid in enumerate(ssids):
+        by_ssid.setdefault(ssid, []).append(row)
+    ranked = sorted(by_ssid.items(), key=lambda item: -heard[item[1]].sum())
+    for ssid, rows in ranked[:max_maps]:
+        maps.append((ssid, grids[rows].max(axis=0)))
+    return maps
+
+def signal_colors(grid):
+    """Map a grid of dBm values to an RGBA image array."""
+    image = np.empty(grid.shape + (4,), dtype=np.uint8)
+    for channel in range(4):
+        image[..., channel] = np.interp(grid, _COLOR_STOPS[:, 0], _COLOR_STOPS[:, channel + 1])
+    return image
+
+def _image_uri(path):
+    """Return an image file as a data: URI."""
+    mime = _IMAGE_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+    with open(path, 'rb') as f:
+        return f"data:{mime};base64," + base64.b64encode(f.read()).decode('ascii')
+
+_SURVEY_SECTION = """            <!-- Site survey heatmaps -->
+            <div id="survey" class="p-6 bg-gray-800">
+                <h2 class="text-xl font-semibold mb-4 text-white">Site Survey</h2>
+                <p class="text-sm text-gray-400 mb-4">{summary}</p>
+                <div class="grid grid-cols-1 md:grid-cols-2 gap-6">
+{maps}                </div>
+            </div>
+"""
+
+_SURVEY_MAP = """                    <div class="bg-gray-800 p-4 rounded-lg shadow">
+                        <h3 class="text-lg font-semibold mb-2 text-white">{title}</h3>
+                        {heatmap}
+                    </div>
+"""
+
+def survey_section(survey, cells=GRID_CELLS):
+    """Render the survey heatmaps as a report section; empty if there are no points."""
+    if not len(survey):
+        return ""
+    from report_assets import png_data_uri, svg_heatmap
+
+    extent = survey.extent()
+    background = _image_uri(survey.floorplan) if survey.floorplan else None
+    markers = [(point['x'], point['y'], f"({point['x']}, {point['y']}): {len(point['networks'])} networks")
+               for point in survey.points]
+    maps = []
+    for title, grid in coverage_maps(survey, cells):
+        image = png_data_uri(signal_colors(grid))
+        maps.append(_SURVEY_MAP.format(title=html.escape(title),
+                                       heatmap=svg_heatmap(image, extent, markers, background)))
+    stops = ", ".join(f"{int(stop[0])}" for stop in _COLOR_STOPS)
+    summary = (f"{len(survey)} survey points. Signal interpolated by inverse distance weighting; "
+               f"red to green at {stops} dBm.")
+    return _SURVEY_SECTION.format(summary=summary, maps=''.join(maps))
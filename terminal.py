@@ -0,0 +1,150 @@
+"""Live terminal table with differential redraw.
+
+LiveTable keeps one table of networks on screen and, on every update,
+rewrites only the cells whose text changed, positioning the cursor with
+ANSI escapes. A frame is assembled into one string and written with a
+single write() and flush(), so a refresh costs one terminal write no
+matter how many networks are shown.
+
+When the output is not a terminal (a pipe, a log file, TERM=dumb) the
+table is written as plain text instead, one block per update; NO_COLOR
+turns colors off either way. On Windows, colorama's init() translates
+the escapes for the console.
+"""
+import os
+import shutil
+import sys
+
+from colorama import Fore, Style
+
+# (title, width) of each column, in order
+COLUMNS = (("SSID", 32), ("Channel", 8), ("Band", 8), ("Signal", 8), ("Security", 16))
+
+SORT_KEYS = {
+    'signal': lambda n: -n['signal'],
+    'ssid': lambda n: n['ssid'].lower(),
+    'channel': lambda n: (n['channel'] is None, n['channel'] or 0),
+    'security': lambda n: n['security']
+}
+
+# Lines above the first network: status, header, rule
+_HEADER_LINES = 3
+
+_CLEAR_SCREEN = "\x1b[2J"
+_CLEAR_LINE = "\x1b[K"
+_HIDE_CURSOR = "\x1b[?25l"
+_SHOW_CURSOR = "\x1b[?25h"
+
+def is_interactive(stream):
+    """Return whether `stream` is a terminal that understands cursor movement."""
+    isatty = getattr(stream, 'isatty', None)
+    return bool(isatty and isatty()) and os.environ.get("TERM") != "dumb"
+
+def use_color(stream):
+    """Return whether to color output written to `stream` (see https://no-color.org)."""
+    return is_interactive(stream) and not os.environ.get("NO_COLOR")
+
+def _move(row, column):
+    return f"\x1b[{row};{column}H"
+
+def _signal_color(signal):
+    if signal >= -60:
+        return Fore.GREEN
+    if signal >= -75:
+        return Fore.YELLOW
+    return Fore.RED
+
+class LiveTable:
+    """A sorted, filtered network table redrawn in place.
+
+    `sort` is one of SORT_KEYS; `filter_text` keeps only networks whose
+    SSID, security or BSSID contains it (case-insensitive).
+    """
+
+    def __init__(self, stream=None, sort='signal', filter_text=None, color=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.sort = sort
+        self.filter_text = filter_text.lower() if filter_text else None
+        self.interactive = is_interactive(self.stream)
+        self.color = use_color(self.stream) if color is None else color
+        # Previous frame: one tuple of rendered cells per screen line
+        self.frame = []
+        self.size = None
+
+    def select(self, networks):
+        """Return the networks to show, filtered and sorted."""
+        if self.filter_text:
+            needle = self.filter_text
+            networks = [n for n in networks
+                        if needle in n['ssid'].lower() or needle in n['security'].lower()
+                        or needle in (n.get('bssid') or "").lower()]
+        return sorted(networks, key=SORT_KEYS[self.sort])
+
+    def _cells(self, network):
+        """Return the padded (and, with color, styled) cells of one table line."""
+        channel = network['channel'] if network['channel'] is not None else "?"
+        values = (network['ssid'] or "<hidden>", channel, network.get('band') or "", network['signal'],
+                  network['security'])
+        cells = [str(value)[:width - 1].ljust(width) for value, (_, width) in zip(values, COLUMNS)]
+        if self.color:
+            cells[3] = f"{_signal_color(network['signal'])}{cells[3]}{Style.RESET_ALL}"
+        return tuple(cells)
+
+    def render(self, networks, status="", height=None, width=None):
+        """Return the frame for `networks` as a list of cell tuples, one per line."""
+        shown = self.select(networks)
+        if height is not None:
+            shown = shown[:max(0, height - _HEADER_LINES)]
+        line_width = sum(column_width for _, column_width in COLUMNS)
+        if len(shown) < len(networks):
+            status = f"{status}  [showing {len(shown)} of {len(networks)}]"
+        if width is not None:
+            status = status[:width - 1]
+        header = tuple(title.ljust(column_width) for title, column_width in COLUMNS)
+        if self.color:
+            status = f"{Fore.CYAN}{status}{Style.RESET_ALL}"
+            header = tuple(f"{Fore.GREEN}{cell}{Style.RESET_ALL}" for cell in header)
+        frame = [(status,), header, ("-" * min(line_width, width or line_width),)]
+        frame.extend(self._cells(network) for network in shown)
+        return frame
+
+    def update(self, networks, status=""):
+        """Show `networks` with a status line above the table."""
+        if not self.interactive:
+            frame = self.render(networks, status)
+            self.stream.write(''.join(''.join(line).rstrip() + "\n" for line in frame) + "\n")
+            self.stream.flush()
+            return
+
+        size = shutil.get_terminal_size()
+        frame = self.render(networks, status, size.lines, size.columns)
+        parts = []
+        if size != self.size:
+            # First frame or resized terminal: start from a blank screen
+            parts.append(_HIDE_CURSOR + _CLEAR_SCREEN)
+            self.frame = []
+            self.size = size
+        for row, line in enumerate(frame):
+            previous = self.frame[row] if row < len(self.frame) else ()
+            if line == previous:
+                continue
+            if len(line) != len(previous) or len(line) == 1:
+                parts.append(_move(row + 1, 1) + ''.join(line) + _CLEAR_LINE)
+                continue
+            column = 1
+            for cell, old, (_, column_width) in zip(line, previous, COLUMNS):
+                if cell != old:
+                    parts.append(_move(row + 1, column) + cell)
+                column += column_width
+        for row in range(len(frame), len(self.frame)):
+            parts.append(_move(row + 1, 1) + _CLEAR_LINE)
+        self.frame = frame
+        if parts:
+            self.stream.write(''.join(parts))
+            self.stream.flush()
+
+    def close(self):
+        """Leave the cursor below the table and make it visible again."""
+        if self.interactive and self.size is not None:
+            self.stream.write(_move(len(self.frame) + 1, 1) + _SHOW_CURSOR)
+            self.stream.flush()
@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+from pywifi import Profile, const
+
+import aio
+from backends import ScanBackend
+
+def make_profile(bssid, signal, ssid="Office", freq=2412):
+    profile = Profile()
+    profile.ssid = ssid
+    profile.bssid = bssid
+    profile.freq = freq
+    profile.signal = signal
+    return profile
+
+class FakeInterface:
+    """A pywifi-style interface whose results arrive `delay` seconds after scan()."""
+
+    def __init__(self, name="fake0", delay=0.1, results=()):
+        self._name = name
+        self.delay = delay
+        self.results = list(results)
+        self.started = None
+
+    def name(self):
+        return self._name
+
+    def scan(self):
+        self.started = time.monotonic()
+
+    def done(self):
+        return self.started is not None and time.monotonic() - self.started >= self.delay
+
+    def scan_results(self):
+        return self.results if self.done() else []
+
+    def status(self):
+        return const.IFACE_INACTIVE if self.done() else const.IFACE_SCANNING
+
+class PollingBackend(ScanBackend):
+    """Uses the default driver polling, so aio polls it from the event loop."""
+    name = "polling"
+
+    def __init__(self, interfaces):
+        self._interfaces = interfaces
+
+    def interfaces(self):
+        return self._interfaces
+
+class ScriptedBackend(ScanBackend):
+    """A blocking backend returning scripted (results or exception) per scan."""
+    name = "scripted"
+
+    def __init__(self, interfaces, script):
+        self._interfaces = interfaces
+        self.script = list(script)
+
+    def interfaces(self):
+        return self._interfaces
+
+    def scan(self, iface, deadline=None):
+        if not self.script:
+            raise EOFError("script finished")
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome, 0.01
+
+def test_wait_for_scan_does_not_block_the_loop():
+    iface = FakeInterface(delay=0.2, results=[make_profile("aa:bb:cc:00:00:01", -50)])
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        results, latency = await aio.wait_for_scan(iface, deadline=1.0)
+        task.cancel()
+        return results, latency, ticks
+
+    results, latency, ticks = asyncio.run(run())
+    assert [r.bssid for r in results] == ["aa:bb:cc:00:00:01"]
+    assert 0.2 <= latency < 1.0
+    # The loop kept running other coroutines while the scan settled
+    assert ticks >= 10
+
+def test_scan_all_interfaces_merges_concurrently():
+    interfaces = [
+        FakeInterface("wlan0", 0.2, [make_profile("aa:bb:cc:00:00:01", -70)]),
+        FakeInterface("wlan1", 0.2, [make_profile("aa:bb:cc:00:00:01", -40),
+                                     make_profile("aa:bb:cc:00:00:02", -60, ssid="Lab")])
+    ]
+    start = time.monotonic()
+    networks = asyncio.run(aio.scan(deadline=1.0, all_interfaces=True, backend=PollingBackend(interfaces)))
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.4 + 0.2
+    by_bssid = {n['bssid']: n for n in networks}
+    assert by_bssid["aa:bb:cc:00:00:01"]['interface'] == "wlan1"
+    assert by_bssid["aa:bb:cc:00:00:01"]['signals'] == {"wlan0": -70, "wlan1": -40}
+    assert by_bssid["aa:bb:cc:00:00:02"]['ssid'] == "Lab"
+
+def test_iter_scans_survives_failures_and_ends_with_the_script():
+    backend = ScriptedBackend([FakeInterface()], [
+        [make_profile("aa:bb:cc:00:00:01", -50)],
+        OSError("device busy"),
+        [make_profile("aa:bb:cc:00:00:01", -55)]
+    ])
+
+    async def run():
+        return [batch async for batch in aio.iter_scans(0, backend=backend)]
+
+    batches = asyncio.run(run())
+    assert [[n['signal'] for n in batch['networks']] for batch in batches] == [[-50], [], [-55]]
+
+def test_iter_scans_can_be_cancelled():
+    backend = PollingBackend([FakeInterface(delay=10)])
+
+    async def run():
+        async def consume():
+            async for _ in aio.iter_scans(0, deadline=30, backend=backend):
+                pass
+
+        task = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+        return False
+
+    start = time.monotonic()
+    assert asyncio.run(run())
+    assert time.monotonic() - start < 2
+
+def test_write_report(tmp_path):
+    networks = [{'ssid': "Office", 'bssid': "aa:bb:cc:00:00:01", 'frequency': 2412, 'channel': 1,
+                 'band': "2.4 GHz", 'signal': -50, 'security': "WPA2-PSK"}]
+    filename = str(tmp_path / "report.html")
+    assert asyncio.run(aio.write_report(networks, filename, offline=True)) == filename
+    with open(filename, encoding='utf-8') as f:
+        assert "Office" in f.read()
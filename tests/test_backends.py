@@ -0,0 +1,61 @@
+import os
+import subprocess
+
+import pytest
+
+import backends
+from backends import BackendUnavailable, IwBackend, IwInterface, PyWiFiBackend, parse_iw_scan
+from scanner import get_security_type, parse_scan_results
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "iw_scan.txt")
+
+def read_fixture():
+    with open(FIXTURE, encoding='utf-8') as f:
+        return f.read()
+
+def test_parse_iw_scan():
+    profiles = list(parse_iw_scan(read_fixture().splitlines()))
+    assert [(p.bssid, p.ssid, p.freq, p.signal) for p in profiles] == [
+        ("aa:bb:cc:00:00:01", "Office", 2412, -45),
+        ("aa:bb:cc:00:00:02", "Corp", 5180, -67),
+        ("aa:bb:cc:00:00:03", "Legacy", 2437, -80),
+        ("aa:bb:cc:00:00:04", "", 2462, -71),
+        ("aa:bb:cc:00:00:05", "Guest", 5975, -58)
+    ]
+    assert [get_security_type(p) for p in profiles] == ["WPA2/WPA3-SAE", "WPA/WPA2", "WEP", "Open", "OWE"]
+    assert profiles[0].auth_suites == {"RSN": ["PSK", "SAE"]}
+    assert profiles[1].auth_suites == {"RSN": ["IEEE 802.1X"], "WPA": ["IEEE 802.1X"]}
+
+    networks = parse_scan_results(profiles)
+    assert [(n['channel'], n['band']) for n in networks] == [
+        (1, "2.4 GHz"), (36, "5 GHz"), (6, "2.4 GHz"), (11, "2.4 GHz"), (5, "6 GHz")]
+    assert networks[3]['ssid'] == "<Hidden>"
+
+def test_iw_scan_falls_back_to_dump_on_timeout(monkeypatch):
+    commands = []
+
+    def run(command, capture_output, text, timeout=None):
+        commands.append((command, timeout))
+        if command[-1] == "scan":
+            raise subprocess.TimeoutExpired(command, timeout)
+        return subprocess.CompletedProcess(command, 0, read_fixture(), "")
+
+    monkeypatch.setattr(backends.subprocess, "run", run)
+    results, _ = IwBackend().scan(IwInterface("wlan0"), deadline=2.0)
+    assert commands == [(["iw", "dev", "wlan0", "scan"], 2.0), (["iw", "dev", "wlan0", "scan", "dump"], None)]
+    assert len(results) == 5
+
+def test_iw_scan_dump_failure_raises(monkeypatch):
+    def run(command, capture_output, text, timeout=None):
+        return subprocess.CompletedProcess(command, 1, "", "Operation not permitted")
+
+    monkeypatch.setattr(backends.subprocess, "run", run)
+    with pytest.raises(RuntimeError, match="Operation not permitted"):
+        IwBackend().scan(IwInterface("wlan0"))
+
+def test_missing_backends_are_unavailable(monkeypatch):
+    monkeypatch.setattr(backends.platform, "system", lambda: "Linux")
+    with pytest.raises(BackendUnavailable):
+        PyWiFiBackend().interfaces()
+    with pytest.raises(BackendUnavailable):
+        IwBackend(iw="/nonexistent/iw").interfaces()
@@ -0,0 +1,87 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backends import CachingBackend
+
+class FakeInterface:
+    def name(self):
+        return "fake0"
+
+class SlowBackend:
+    """Each scan takes `latency` seconds and returns a new result list."""
+    name = "slow"
+
+    def __init__(self, latency=0.2, error=None):
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def interfaces(self):
+        return [FakeInterface()]
+
+    def scan(self, iface, deadline=None):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+        return [f"scan {call}"], self.latency
+
+def scan_concurrently(cache, callers=8):
+    barrier = threading.Barrier(callers)
+    iface = FakeInterface()
+
+    def call():
+        barrier.wait()
+        return cache.scan(iface)
+
+    with ThreadPoolExecutor(callers) as pool:
+        futures = [pool.submit(call) for _ in range(callers)]
+        return [future.result() for future in futures]
+
+def test_concurrent_scans_share_one_backend_scan():
+    backend = SlowBackend()
+    cache = CachingBackend(backend, ttl=10)
+    results = scan_concurrently(cache)
+    assert backend.calls == 1
+    assert {tuple(networks) for networks, _ in results} == {("scan 1",)}
+    assert cache.stats['scans'] == 1 and cache.stats['coalesced'] == 7
+
+    # Within the TTL the cached results come back without a scan
+    assert cache.scan(FakeInterface()) == (["scan 1"], 0.0)
+    assert backend.calls == 1 and cache.stats['hits'] == 1
+
+def test_expired_entry_is_rescanned():
+    backend = SlowBackend(latency=0)
+    cache = CachingBackend(backend, ttl=0.05)
+    cache.scan(FakeInterface())
+    time.sleep(0.06)
+    assert cache.scan(FakeInterface())[0] == ["scan 2"]
+
+def test_stale_while_revalidate_returns_cached_results():
+    backend = SlowBackend(latency=0.05)
+    cache = CachingBackend(backend, ttl=0.01, stale_while_revalidate=True)
+    cache.scan(FakeInterface())
+    time.sleep(0.02)
+    results = scan_concurrently(cache, callers=4)
+    assert {tuple(networks) for networks, _ in results} == {("scan 1",)}
+    assert cache.stats['stale_hits'] == 4
+    # One background scan refreshes the entry
+    deadline = time.monotonic() + 1
+    while cache.flights and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert backend.calls == 2
+    assert cache.cache["fake0"][1] == ["scan 2"]
+
+def test_failed_scan_reaches_every_caller_and_is_not_cached():
+    backend = SlowBackend(error=OSError("device busy"))
+    cache = CachingBackend(backend, ttl=10)
+    with pytest.raises(OSError):
+        scan_concurrently(cache, callers=4)
+    assert backend.calls == 1
+    assert not cache.cache and not cache.flights
@@ -0,0 +1,18 @@
+import warnings
+
+from congestion import congestion_by_band
+
+def test_unmapped_frequencies_are_ignored_without_warnings():
+    networks = [{'ssid': "A", 'frequency': 1234, 'signal': -50},
+                {'ssid': "B", 'frequency': 5180, 'signal': -60},
+                {'ssid': "C", 'frequency': 2412, 'signal': -55}]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        results = congestion_by_band(networks)
+    assert [result['band'] for result in results] == ["2.4 GHz", "5 GHz"]
+
+def test_recommends_a_quiet_channel():
+    networks = [{'ssid': f"N{i}", 'frequency': 2412, 'signal': -40} for i in range(5)]
+    result = congestion_by_band(networks)[0]
+    assert result['recommended'] in (6, 11)
+    assert result['interference'][0] > result['recommended_interference']
@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+from pywifi import Profile
+
+from dashboard import Broadcaster, LiveDashboard, encode_event
+
+def make_profile(bssid, signal, ssid="Office", freq=2412):
+    profile = Profile()
+    profile.ssid = ssid
+    profile.bssid = bssid
+    profile.freq = freq
+    profile.signal = signal
+    return profile
+
+class FakeInterface:
+    def name(self):
+        return "fake0"
+
+class ScriptedBackend:
+    """Return the scripted scans in order, then end the scan loop."""
+    name = "scripted"
+
+    def __init__(self, scans):
+        self.scans = list(scans)
+
+    def interfaces(self):
+        return [FakeInterface()]
+
+    def scan(self, iface, deadline=None):
+        if not self.scans:
+            raise EOFError("script finished")
+        return self.scans.pop(0), 0.01
+
+class FakeWriter:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        pass
+
+def parse_events(chunks):
+    """Return [(event, data)] for the SSE messages among the written chunks."""
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(b"event: "):
+            event, data = chunk.decode('utf-8').strip().split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+def make_dashboard(scans):
+    dashboard = LiveDashboard(interval=0, backend=ScriptedBackend(scans))
+    dashboard.ready = asyncio.Event()
+    return dashboard
+
+def test_snapshot_sent_on_connect():
+    async def run():
+        dashboard = make_dashboard([[make_profile("aa:bb:cc:00:00:01", -50),
+                                     make_profile("aa:bb:cc:00:00:02", -60, ssid="Lab")]])
+        await dashboard.scan_loop()
+        writer = FakeWriter()
+        client = asyncio.ensure_future(dashboard.send_events(writer))
+        await asyncio.sleep(0.05)
+        client.cancel()
+        return dashboard, writer
+
+    dashboard, writer = asyncio.run(run())
+    assert dashboard.failure is None
+    assert writer.chunks[0].startswith(b"HTTP/1.1 200 OK")
+    events = parse_events(writer.chunks)
+    event, data = events[0]
+    assert event == "snapshot"
+    assert sorted(network['bssid'] for network in data['networks']) == ["aa:bb:cc:00:00:01", "aa:bb:cc:00:00:02"]
+    assert "charts" in [event for event, _ in events]
+    # The cancelled client unsubscribed on its way out
+    assert not dashboard.broadcaster.subscribers
+
+def test_deltas_fan_out_to_every_subscriber():
+    async def run():
+        dashboard = make_dashboard([
+            [make_profile("aa:bb:cc:00:00:01", -50)],
+            [make_profile("aa:bb:cc:00:00:01", -50), make_profile("aa:bb:cc:00:00:02", -60, ssid="Lab")]
+        ])
+        queues = [dashboard.broadcaster.subscribe() for _ in range(2)]
+        await dashboard.scan_loop()
+        return [[queue.get_nowait() for _ in range(queue.qsize())] for queue in queues]
+
+    first, second = asyncio.run(run())
+    assert first == second
+    deltas = [data['deltas'] for event, data in parse_events(first) if event == "delta"]
+    assert len(deltas) == 2
+    assert [(d['change'], d['bssid']) for d in deltas[0]] == [("appeared", "aa:bb:cc:00:00:01")]
+    assert [(d['change'], d['bssid']) for d in deltas[1]] == [("appeared", "aa:bb:cc:00:00:02")]
+
+def test_slow_subscriber_is_disconnected():
+    async def run():
+        broadcaster = Broadcaster(queue_size=2)
+        slow = broadcaster.subscribe()
+        fast = broadcaster.subscribe()
+        messages = [encode_event("delta", {'count': count}) for count in range(3)]
+        received = []
+        for message in messages:
+            broadcaster.publish(message)
+            received.append(fast.get_nowait())
+        return broadcaster, slow, fast, messages, received
+
+    broadcaster, slow, fast, messages, received = asyncio.run(run())
+    assert received == messages
+    assert broadcaster.subscribers == {fast}
+    # The oldest event made room for the None that tells the writer to close
+    assert [slow.get_nowait() for _ in range(slow.qsize())] == [messages[1], None]
+
+def test_slow_client_stream_ends_on_disconnect():
+    async def run():
+        dashboard = make_dashboard([])
+        dashboard.broadcaster = Broadcaster(queue_size=1)
+        writer = FakeWriter()
+        client = asyncio.ensure_future(dashboard.send_events(writer))
+        await asyncio.sleep(0)
+        for count in range(3):
+            dashboard.broadcaster.publish(encode_event("delta", {'count': count}))
+        await asyncio.wait_for(client, 1)
+        return dashboard, writer
+
+    dashboard, writer = asyncio.run(run())
+    assert not dashboard.broadcaster.subscribers
+    # Only the response head went out: the dropped event made room for the None
+    assert len(writer.chunks) == 1 and writer.chunks[0].startswith(b"HTTP/1.1 200 OK")
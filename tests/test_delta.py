@@ -0,0 +1,49 @@
+import json
+
+from delta import DeltaTracker, apply_deltas, diff_scans, load_tracker, save_checkpoint, append_delta_log
+
+def scan(*networks):
+    return [{'ssid': ssid, 'bssid': bssid, 'frequency': 2412, 'channel': channel, 'band': "2.4 GHz",
+             'signal': signal, 'security': security} for ssid, bssid, channel, signal, security in networks]
+
+def test_diff_scans_classifies_changes():
+    before = scan(("A", "aa", 1, -50, "WPA2-PSK"), ("B", "bb", 6, -60, "Open"), ("C", "cc", 11, -70, "Open"))
+    after = scan(("A", "aa", 6, -52, "WPA2-PSK"), ("B", "bb", 6, -40, "WPA3-SAE"), ("D", "dd", 1, -80, "Open"))
+    changes = sorted((delta['change'], delta['ssid']) for delta in diff_scans(before, after))
+    assert changes == [("appeared", "D"), ("channel", "A"), ("disappeared", "C"), ("security", "B"),
+                       ("signal", "B")]
+
+def test_apply_deltas_rebuilds_the_state():
+    tracker = DeltaTracker()
+    state = {}
+    for networks in (scan(("A", "aa", 1, -50, "Open")), scan(("A", "aa", 6, -70, "Open"), ("B", None, 1, -60, "Open"))):
+        apply_deltas(state, tracker.update(networks))
+    assert state == tracker.state
+
+def test_load_tracker_replays_only_after_the_checkpoint(tmp_path):
+    path = str(tmp_path / "deltas.jsonl")
+    tracker = DeltaTracker()
+    for i, networks in enumerate([scan(("A", "aa", 1, -50, "Open")), scan(("A", "aa", 1, -80, "Open")),
+                                  scan(("B", "bb", 6, -60, "Open"))]):
+        append_delta_log(path, {'timestamp': i, 'latency': None, 'count': 1, 'deltas': tracker.update(networks)})
+        if i == 0:
+            save_checkpoint(path, tracker)
+    assert load_tracker(path).state == tracker.state
+
+    # The checkpoint is used: a log line it covers is not read again
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(" " * (len(lines[0]) - 1) + "\n" + "".join(lines[1:]))
+    assert load_tracker(path).state == tracker.state
+
+def test_load_tracker_falls_back_to_a_full_replay(tmp_path):
+    path = str(tmp_path / "deltas.jsonl")
+    tracker = DeltaTracker()
+    append_delta_log(path, {'timestamp': 0, 'count': 1, 'deltas': tracker.update(scan(("A", "aa", 1, -50, "Open")))})
+    save_checkpoint(path, tracker)
+    # A truncated (rotated) log is shorter than the checkpoint
+    fresh = DeltaTracker()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'deltas': fresh.update(scan(("B", "bb", 6, -60, "Open")))}) + "\n")
+    assert load_tracker(path).state == fresh.state
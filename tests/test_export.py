@@ -0,0 +1,66 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from export import append_batch, channel_stats, export_format, read_binary, to_networks
+
+NETWORKS = [
+    {'ssid': "Office", 'bssid': "aa:bb:cc:00:00:01", 'frequency': 2412, 'channel': 1, 'band': "2.4 GHz",
+     'signal': -48, 'security': "WPA2-PSK"},
+    {'ssid': "Lab", 'bssid': None, 'frequency': 5180, 'channel': 36, 'band': "5 GHz", 'signal': -70,
+     'security': "WPA3-SAE"},
+    {'ssid': "Guest", 'bssid': "aa:bb:cc:00:00:03", 'frequency': 2412, 'channel': 1, 'band': "2.4 GHz",
+     'signal': -60, 'security': "Open"}
+]
+
+def test_binary_round_trip(tmp_path):
+    path = str(tmp_path / "scans.wscan")
+    append_batch(path, {'timestamp': 1000.0, 'networks': NETWORKS})
+    append_batch(path, {'timestamp': 1005.0, 'networks': NETWORKS[:1]})
+    records = read_binary(path)
+    assert len(records) == 4
+    decoded = to_networks(records)
+    assert [n['timestamp'] for n in decoded] == [1000.0, 1000.0, 1000.0, 1005.0]
+    for network, expected in zip(decoded, NETWORKS + NETWORKS[:1]):
+        assert network == dict(expected, timestamp=network['timestamp'])
+
+def test_binary_ignores_a_partial_last_record(tmp_path):
+    path = str(tmp_path / "scans.wscan")
+    append_batch(path, {'timestamp': 1000.0, 'networks': NETWORKS})
+    with open(path, 'ab') as f:
+        f.write(b"\0" * 10)
+    assert len(read_binary(path)) == 3
+
+def test_channel_stats(tmp_path):
+    path = str(tmp_path / "scans.wscan")
+    append_batch(path, {'timestamp': 1000.0, 'networks': NETWORKS})
+    stats = channel_stats(read_binary(path))
+    assert [(s['band'], s['channel'], s['observations']) for s in stats] == [("2.4 GHz", 1, 2), ("5 GHz", 36, 1)]
+    assert stats[0]['mean'] == -54.0 and stats[0]['min'] == -60 and stats[0]['max'] == -48
+
+def test_text_exports_append(tmp_path):
+    csv_path = str(tmp_path / "scans.csv")
+    jsonl_path = str(tmp_path / "scans.jsonl")
+    for _ in range(2):
+        append_batch(csv_path, {'timestamp': 1000.0, 'networks': NETWORKS})
+        append_batch(jsonl_path, {'timestamp': 1000.0, 'networks': NETWORKS})
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6 and rows[0]['ssid'] == "Office"
+    with open(jsonl_path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 6 and lines[1]['security'] == "WPA3-SAE"
+
+def test_export_format():
+    assert export_format("a.CSV") == "csv"
+    assert export_format("a.wscan") == "binary"
+    with pytest.raises(ValueError):
+        export_format("a.txt")
+
+def test_read_binary_rejects_other_files(tmp_path):
+    path = tmp_path / "other.wscan"
+    path.write_bytes(np.zeros(80, dtype=np.uint8).tobytes())
+    with pytest.raises(ValueError):
+        read_binary(str(path))
@@ -0,0 +1,42 @@
+import pytest
+
+from export import append_batch
+from fleet import aggregate, load_networks, sensor_file
+from scanner import write_report_file
+
+NETWORKS = [
+    {'ssid': "Office", 'bssid': "aa:bb:cc:00:00:01", 'frequency': 2412, 'channel': 1, 'band': "2.4 GHz",
+     'signal': -50, 'security': "WPA2-PSK"},
+    {'ssid': "Office", 'bssid': "aa:bb:cc:00:00:02", 'frequency': 2412, 'channel': 1, 'band': "2.4 GHz",
+     'signal': -60, 'security': "WPA2-PSK"},
+    {'ssid': "Lab", 'bssid': None, 'frequency': 5180, 'channel': 36, 'band': "5 GHz", 'signal': -70,
+     'security': "Open"}
+]
+
+def summary(networks):
+    return [(n['ssid'], n['bssid'], n['channel'], n['band'], n['signal'], n['security']) for n in networks]
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl", ".wscan"])
+def test_load_networks_reads_exports(tmp_path, suffix):
+    path = str(tmp_path / f"sensor{suffix}")
+    append_batch(path, {'timestamp': 1.0, 'networks': NETWORKS})
+    append_batch(path, {'timestamp': 2.0, 'networks': NETWORKS})
+    networks = load_networks(path)
+    assert summary(networks) == summary(NETWORKS) * 2
+    assert sensor_file(path)[0] == "sensor"
+
+def test_virtual_report_keeps_bssids(tmp_path):
+    path = str(tmp_path / "report.html")
+    write_report_file(NETWORKS, path, virtual=True)
+    assert summary(load_networks(path)) == summary(NETWORKS)
+
+def test_aggregate_keeps_distinct_aps(tmp_path):
+    report = str(tmp_path / "report.html")
+    export = str(tmp_path / "site.wscan")
+    write_report_file(NETWORKS, report, virtual=True)
+    append_batch(export, {'timestamp': 1.0, 'networks': NETWORKS})
+    result = aggregate([("a", report), ("b", export)], workers=1)
+    assert not result['errors']
+    assert len(result['networks']) == 3
+    office = [n for n in result['networks'] if n['bssid'] == "aa:bb:cc:00:00:01"]
+    assert office[0]['sensors'] == {"a": -50, "b": -50}
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from pywifi import Profile
+
+from scanner import merge_scans, scan_interfaces
+
+def make_profile(bssid, signal, ssid="Office", freq=2412):
+    profile = Profile()
+    profile.ssid = ssid
+    profile.bssid = bssid
+    profile.freq = freq
+    profile.signal = signal
+    return profile
+
+class FakeInterface:
+    def __init__(self, name, latency, results):
+        self._name = name
+        self.latency = latency
+        self.results = results
+
+    def name(self):
+        return self._name
+
+class StaggeredBackend:
+    """Each interface's scan takes its own latency; finish times are recorded."""
+
+    def __init__(self):
+        self.finished = {}
+        self.lock = threading.Lock()
+
+    def scan(self, iface, deadline=None):
+        time.sleep(iface.latency)
+        with self.lock:
+            self.finished[iface.name()] = time.monotonic()
+        return iface.results, iface.latency
+
+def test_strongest_observation_wins_and_signals_are_kept():
+    interfaces = [
+        FakeInterface("wlan0", 0.05, [make_profile("aa:bb:cc:00:00:01", -70), make_profile("aa:bb:cc:00:00:02", -40)]),
+        FakeInterface("wlan1", 0.01, [make_profile("AA:BB:CC:00:00:01", -45)]),
+        FakeInterface("wlan2", 0.03, [make_profile("aa:bb:cc:00:00:01", -80)])
+    ]
+    scans = scan_interfaces(interfaces, backend=StaggeredBackend())
+    assert sorted(scans) == ["wlan0", "wlan1", "wlan2"]
+
+    merged = merge_scans(scans)
+    assert len(merged) == 2
+    first = merged["aa:bb:cc:00:00:01"]
+    assert (first['signal'], first['interface']) == (-45, "wlan1")
+    assert first['signals'] == {"wlan0": -70, "wlan1": -45, "wlan2": -80}
+    second = merged["aa:bb:cc:00:00:02"]
+    assert (second['interface'], second['signals']) == ("wlan0", {"wlan0": -40})
+
+def test_slow_interface_does_not_block_the_others():
+    backend = StaggeredBackend()
+    interfaces = [FakeInterface("slow", 0.5, [make_profile("aa:bb:cc:00:00:01", -60)])]
+    interfaces += [FakeInterface(f"fast{i}", 0.05, [make_profile(f"aa:bb:cc:00:01:0{i}", -50)]) for i in range(3)]
+    start = time.monotonic()
+    scans = scan_interfaces(interfaces, backend=backend)
+    elapsed = time.monotonic() - start
+
+    assert len(scans) == 4
+    # Run in parallel: the whole scan takes about as long as the slowest interface
+    assert elapsed < 0.5 + 3 * 0.05
+    for i in range(3):
+        assert backend.finished[f"fast{i}"] - start < 0.3
+
+def test_failing_interface_is_left_out():
+    class FailingBackend(StaggeredBackend):
+        def scan(self, iface, deadline=None):
+            if iface.name() == "broken":
+                raise OSError("device busy")
+            return super().scan(iface, deadline)
+
+    interfaces = [FakeInterface("broken", 0, []), FakeInterface("wlan0", 0.01, [make_profile("aa:bb:cc:00:00:01", -50)])]
+    scans = scan_interfaces(interfaces, backend=FailingBackend())
+    assert list(scans) == ["wlan0"]
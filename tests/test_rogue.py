@@ -0,0 +1,60 @@
+import random
+
+from rogue import Inventory, RogueDetector, _deletes, edit_distance, normalize_ssid
+
+def osa_distance(a, b):
+    """Reference optimal string alignment distance, computed in full."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+def network(ssid, bssid=None, security="WPA2-PSK"):
+    return {'ssid': ssid, 'bssid': bssid, 'security': security, 'channel': 6, 'signal': -50}
+
+def test_edit_distance_matches_reference():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = ''.join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = ''.join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        expected = osa_distance(a, b)
+        assert edit_distance(a, b, 2) == (expected if expected <= 2 else 3)
+
+def test_deletes():
+    assert _deletes("abc", 1) == {"abc": 0, "bc": 1, "ac": 1, "ab": 1}
+
+def test_normalize_ssid():
+    assert normalize_ssid("C0rp-Wifi") == normalize_ssid("corp wifi")
+
+def test_lookalike_index():
+    inventory = Inventory([{'ssid': "CorpNetwork"}, {'ssid': "Guest"}])
+    assert inventory.lookalike("C0rpNetwrok") == ("CorpNetwork", 1)
+    assert inventory.lookalike("CorpNetwork") is None
+    assert inventory.lookalike("Unrelated") is None
+    # Short SSIDs only match at distance 1
+    assert inventory.lookalike("Gueest") == ("Guest", 1)
+    assert inventory.lookalike("Gxest1") is None
+
+def test_detector_findings():
+    inventory = Inventory([{'bssid': "AA:BB:CC:00:00:01", 'ssid': "CorpWifi", 'security': "WPA3-SAE"}])
+    detector = RogueDetector(inventory, flag_unknown=True)
+    kinds = lambda n: [alert['kind'] for alert in detector.check_network(n)]
+    assert kinds(network("CorpWifi", "aa:bb:cc:00:00:01", "WPA3-SAE")) == []
+    assert kinds(network("CorpWifi", "aa:bb:cc:00:00:01", "WPA2-PSK")) == ["downgrade"]
+    assert kinds(network("Other", "aa:bb:cc:00:00:01", "WPA3-SAE")) == ["ssid_mismatch"]
+    assert kinds(network("<Hidden>", "aa:bb:cc:00:00:01", "WPA3-SAE")) == []
+    assert kinds(network("CorpWifi", "aa:bb:cc:00:00:99", "WPA3-SAE")) == ["evil_twin"]
+    assert kinds(network("C0rpWifi", "aa:bb:cc:00:00:98")) == ["lookalike"]
+    assert kinds(network("Cafe", "aa:bb:cc:00:00:97")) == ["unknown"]
+
+def test_annotate_and_update():
+    detector = RogueDetector(Inventory([{'ssid': "CorpWifi", 'bssid': "aa:bb:cc:00:00:01"}]))
+    scan = [network("CorpWifi", "aa:bb:cc:00:00:02"), network("Cafe", "aa:bb:cc:00:00:03")]
+    annotated, alerts = detector.annotate(scan)
+    assert [alert['kind'] for alert in alerts] == ["evil_twin"]
+    assert annotated[0]['alert']['kind'] == "evil_twin" and 'alert' not in annotated[1]
+    assert len(detector.update(scan)) == 1
+    assert detector.update(scan) == []
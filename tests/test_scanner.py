@@ -0,0 +1,79 @@
+import time
+
+from pywifi import Profile, const
+
+from scanner import freq_to_band, freq_to_channel, normalize_frequency, wait_for_scan
+
+def make_profile(bssid, freq=2412, signal=-50):
+    profile = Profile()
+    profile.ssid = bssid
+    profile.bssid = bssid
+    profile.freq = freq
+    profile.signal = signal
+    return profile
+
+class FakeInterface:
+    """An interface whose fresh results arrive `delay` seconds after scan()."""
+
+    def __init__(self, delay, stale=(), fresh=(), report_status=True):
+        self.delay = delay
+        self.stale = list(stale)
+        self.fresh = list(fresh)
+        self.report_status = report_status
+        self.started = None
+        self.scans = 0
+
+    def name(self):
+        return "fake0"
+
+    def scan(self):
+        self.scans += 1
+        self.started = time.monotonic()
+
+    def done(self):
+        return self.started is not None and time.monotonic() - self.started >= self.delay
+
+    def scan_results(self):
+        return self.fresh if self.done() else self.stale
+
+    def status(self):
+        if not self.report_status:
+            raise OSError("status not supported")
+        return const.IFACE_INACTIVE if self.done() else const.IFACE_SCANNING
+
+def test_wait_for_scan_returns_once_results_arrive():
+    iface = FakeInterface(0.3, fresh=[make_profile("aa:bb:cc:00:00:01")])
+    results, latency = wait_for_scan(iface, deadline=5.0)
+    assert iface.scans == 1
+    assert [r.bssid for r in results] == ["aa:bb:cc:00:00:01"]
+    assert 0.3 <= latency < 1.5
+
+def test_wait_for_scan_without_status_waits_for_stable_new_results():
+    stale = [make_profile("aa:bb:cc:00:00:01")]
+    fresh = stale + [make_profile("aa:bb:cc:00:00:02")]
+    iface = FakeInterface(0.2, stale=stale, fresh=fresh, report_status=False)
+    results, latency = wait_for_scan(iface, deadline=5.0)
+    assert len(results) == 2
+    assert latency < 1.5
+
+def test_wait_for_scan_accepts_unchanged_results_after_settling():
+    stale = [make_profile("aa:bb:cc:00:00:01")]
+    iface = FakeInterface(0.0, stale=stale, fresh=stale, report_status=False)
+    results, latency = wait_for_scan(iface, deadline=5.0, settle=0.3)
+    assert len(results) == 1
+    assert 0.3 <= latency < 1.5
+
+def test_wait_for_scan_gives_up_at_the_deadline():
+    iface = FakeInterface(60.0, report_status=False)
+    results, latency = wait_for_scan(iface, deadline=0.3)
+    assert results == []
+    assert 0.3 <= latency < 1.0
+
+def test_channel_mapping():
+    assert freq_to_channel(2412) == 1
+    assert freq_to_channel(2484) == 14
+    assert freq_to_channel(5180) == 36
+    assert freq_to_channel(5955) == 1
+    assert freq_to_channel(1234) is None
+    assert freq_to_band(5955) == "6 GHz"
+    assert normalize_frequency(2412000) == 2412
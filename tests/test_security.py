@@ -0,0 +1,55 @@
+import numpy as np
+
+import security
+from records import Security
+from security import (AKM_NONE, AKM_OWE, AKM_SAE, AKM_UNKNOWN, AKM_WPA, AKM_WPA2, AKM_WPA2_PSK, AKM_WPA_PSK,
+                      AKM_8021X_SUITE_B_192, CIPHER_CCMP, CIPHER_GCMP_256, CIPHER_NONE, CIPHER_WEP,
+                      classify_security, describe_security)
+
+def test_legacy_labels_are_unchanged():
+    assert describe_security(None).label == "Open"
+    assert describe_security([AKM_NONE]).label == "Open"
+    assert describe_security([AKM_WPA]).label == "WPA"
+    assert describe_security([AKM_WPA_PSK]).label == "WPA-PSK"
+    assert describe_security([AKM_WPA2]).label == "WPA2"
+    assert describe_security([AKM_WPA2_PSK]).label == "WPA2-PSK"
+    assert describe_security([AKM_UNKNOWN]).label == "Unknown"
+
+def test_wpa3_owe_and_wep():
+    sae = describe_security([AKM_SAE], CIPHER_CCMP)
+    assert (sae.label, sae.protocol, sae.auth, sae.cipher, sae.mixed) == ("WPA3-SAE", "WPA3", "SAE", "CCMP", False)
+    owe = describe_security([AKM_OWE], CIPHER_CCMP)
+    assert (owe.label, owe.protocol, owe.auth) == ("OWE", "OWE", "OWE")
+    suite_b = describe_security([AKM_8021X_SUITE_B_192], CIPHER_GCMP_256)
+    assert (suite_b.label, suite_b.auth, suite_b.cipher) == ("WPA3-Enterprise-192", "Enterprise-192", "GCMP-256")
+    assert describe_security([AKM_NONE], CIPHER_WEP).label == "WEP"
+
+def test_empty_akm_list_is_unknown():
+    # pywifi on Windows reports [] for secured networks whose cipher it doesn't map
+    for cipher in (CIPHER_NONE, CIPHER_WEP, CIPHER_GCMP_256, None):
+        assert describe_security([], cipher).label == "Unknown"
+    assert list(classify_security([(), None, [AKM_NONE]])) == [Security.UNKNOWN, Security.OPEN, Security.OPEN]
+
+def test_mixed_modes():
+    transition = describe_security([AKM_WPA2_PSK, AKM_SAE], CIPHER_CCMP)
+    assert (transition.label, transition.protocol, transition.mixed) == ("WPA2/WPA3-SAE", "WPA3", True)
+    assert describe_security([AKM_WPA2_PSK, AKM_WPA_PSK]).label == "WPA/WPA2-PSK"
+    assert describe_security([AKM_WPA2, AKM_WPA]).label == "WPA/WPA2"
+    # Unknown suites next to known ones don't hide them
+    assert describe_security([AKM_UNKNOWN, AKM_WPA2_PSK]).label == "WPA2-PSK"
+
+def test_descriptors_are_memoized():
+    assert describe_security([AKM_SAE, AKM_WPA2_PSK], CIPHER_CCMP) is describe_security((AKM_SAE, AKM_WPA2_PSK),
+                                                                                         CIPHER_CCMP)
+
+def test_every_label_has_a_code_and_strength():
+    labels = {descriptor.label for descriptor in security._DESCRIPTORS.values()}
+    assert all(Security.from_label(label) != Security.UNKNOWN for label in labels - {"Unknown"})
+    assert set(security.SECURITY_STRENGTH) == {code.label for code in Security} - {"Unknown"}
+
+def test_classify_security_column():
+    codes = classify_security([(AKM_WPA2_PSK,), [AKM_SAE], (AKM_NONE,), (AKM_UNKNOWN,)],
+                              [CIPHER_CCMP, CIPHER_CCMP, CIPHER_NONE, CIPHER_NONE])
+    assert codes.dtype == np.uint8
+    assert [Security(code) for code in codes] == [Security.WPA2_PSK, Security.WPA3_SAE, Security.OPEN,
+                                                  Security.UNKNOWN]
@@ -0,0 +1,32 @@
+import numpy as np
+
+from survey import Survey, grid_axes, idw_grid, parse_position
+
+def test_idw_reproduces_samples_and_constants():
+    positions = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    values = np.array([[-40.0, -60.0, -80.0], [-50.0, -50.0, -50.0]])
+    xs = np.array([0.0, 5.0, 10.0])
+    ys = np.array([0.0, 5.0, 10.0])
+    grid = idw_grid(positions, values, xs, ys)
+    assert grid.shape == (2, 3, 3)
+    assert np.allclose([grid[0, 0, 0], grid[0, 0, 2], grid[0, 2, 0]], [-40, -60, -80])
+    assert np.allclose(grid[1], -50)
+    assert grid[0].min() >= -80 and grid[0].max() <= -40
+
+def test_grid_axes_cover_the_extent():
+    xs, ys = grid_axes((0, 0, 40, 20), cells=8)
+    assert len(xs) == 8 and len(ys) == 4
+    assert xs[0] == 2.5 and xs[-1] == 37.5
+
+def test_survey_samples(tmp_path):
+    survey = Survey(str(tmp_path / "survey.jsonl"))
+    survey.add(0, 0, [{'bssid': "aa", 'ssid': "A", 'channel': 1, 'signal': -40},
+                      {'bssid': None, 'ssid': "B", 'channel': 6, 'signal': -70}])
+    survey.add(5, 5, [{'bssid': "aa", 'ssid': "A", 'channel': 1, 'signal': -55}])
+    positions, keys, ssids, signals = Survey(survey.path).samples()
+    assert positions.shape == (2, 2)
+    assert keys == ["aa", "ssid:B"] and ssids == ["A", "B"]
+    assert signals.tolist() == [[-40, -55], [-70, -100]]
+
+def test_parse_position():
+    assert parse_position("12.5,4") == (12.5, 4.0)
@@ -0,0 +1,66 @@
+import math
+import random
+
+from tracking import SIGNAL_FLOOR, SignalStats, SignalTracker
+
+def reference_percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+def test_ring_statistics_match_a_full_recomputation():
+    rng = random.Random(7)
+    stats = SignalStats(size=8)
+    samples = [rng.randint(-95, -30) for _ in range(50)]
+    for count, signal in enumerate(samples, 1):
+        stats.add(signal)
+        window = samples[max(0, count - 8):count]
+        assert stats.window() == window
+        for q in (10, 50, 90, 100):
+            assert stats.percentile(q) == reference_percentile(window, q)
+    # Lifetime extremes cover samples that have already left the ring
+    assert (stats.minimum, stats.maximum) == (min(samples), max(samples))
+    assert stats.count == 50
+
+def test_ewma_and_variance():
+    stats = SignalStats()
+    ewma, variance = None, 0.0
+    for signal in (-60, -50, -70, -65, -40):
+        stats.add(signal, alpha=0.3)
+        if ewma is None:
+            ewma = float(signal)
+        else:
+            diff = signal - ewma
+            ewma += 0.3 * diff
+            variance = 0.7 * (variance + 0.3 * diff * diff)
+    assert math.isclose(stats.ewma, ewma) and math.isclose(stats.variance, variance)
+    assert stats.smoothed == round(ewma)
+
+def test_samples_are_clamped_into_the_histogram():
+    stats = SignalStats(size=4)
+    stats.add(-120)
+    stats.add(5)
+    assert stats.window() == [SIGNAL_FLOOR, 0]
+    assert stats.percentile(0) == SIGNAL_FLOOR and stats.percentile(100) == 0
+
+def test_tracker_annotates_and_evicts():
+    tracker = SignalTracker(alpha=0.5, max_age=60)
+    office = {'ssid': "Office", 'bssid': "aa:bb:cc:00:00:01", 'signal': -60}
+    hidden = {'ssid': "Lab", 'bssid': None, 'signal': -80}
+    tracker.update([office, hidden], timestamp=0)
+    tracker.update([dict(office, signal=-40)], timestamp=30)
+
+    annotated = tracker.annotate([dict(office, signal=-40), hidden])
+    assert (annotated[0]['signal'], annotated[0]['signal_raw']) == (-50, -40)
+    assert annotated[0]['signal_stats']['samples'] == 2
+    assert tracker.get("ssid:Lab") is not None
+
+    # Lab was last seen at 0, so it goes once 60 s have passed; Office stays
+    tracker.update([dict(office, signal=-40)], timestamp=61)
+    assert len(tracker) == 1 and tracker.get("ssid:Lab") is None
+
+def test_seed_replays_history():
+    tracker = SignalTracker(max_age=100)
+    tracker.seed([(0, "aa:bb:cc:00:00:01", -70), (10, "aa:bb:cc:00:00:02", None),
+                  (200, "aa:bb:cc:00:00:03", -50)])
+    # The first row is too old by the last timestamp; the None signal is skipped
+    assert list(tracker.stats) == ["aa:bb:cc:00:00:03"]
@@ -0,0 +1,178 @@
+"""Per-BSSID signal time series with streaming statistics.
+
+RSSI is noisy, so a single sample flaps between signal levels from scan
+to scan. SignalTracker keeps, for every access point, a fixed-size ring
+of recent samples plus statistics that are all updated in O(1) per
+sample:
+
+- EWMA and exponentially weighted variance of the signal
+- lifetime minimum and maximum
+- a histogram of the samples in the ring (one bin per dBm), from which
+  percentiles are read without sorting
+
+Access points not seen for `max_age` seconds are evicted, so memory stays
+bounded by the number of APs currently in range.
+"""
+import math
+import time
+from array import array
+from collections import OrderedDict
+
+from delta import network_key
+
+# Samples kept per access point
+RING_SIZE = 32
+
+# Weight of the newest sample in the moving average
+EWMA_ALPHA = 0.3
+
+# Seconds after which an access point that hasn't been seen is dropped
+EVICT_AFTER = 600.0
+
+# Signal range covered by the percentile histogram, in dBm; samples are clamped into it
+SIGNAL_FLOOR = -100
+SIGNAL_CEILING = 0
+
+class SignalStats:
+    """Ring buffer and streaming statistics for one access point."""
+    __slots__ = ('samples', 'position', 'count', 'ewma', 'variance', 'minimum', 'maximum',
+                 'histogram', 'last_seen')
+
+    def __init__(self, size=RING_SIZE):
+        self.samples = array('b', bytes(size))
+        self.position = 0
+        self.count = 0
+        self.ewma = None
+        self.variance = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.histogram = array('H', bytes(2 * (SIGNAL_CEILING - SIGNAL_FLOOR + 1)))
+        self.last_seen = None
+
+    def add(self, signal, alpha=EWMA_ALPHA, timestamp=None):
+        """Record one sample in O(1)."""
+        signal = min(max(int(round(signal)), SIGNAL_FLOOR), SIGNAL_CEILING)
+        size = len(self.samples)
+        if self.count >= size:
+            self.histogram[self.samples[self.position] - SIGNAL_FLOOR] -= 1
+        self.samples[self.position] = signal
+        self.histogram[signal - SIGNAL_FLOOR] += 1
+        self.position = (self.position + 1) % size
+        self.count += 1
+
+        if self.ewma is None:
+            self.ewma = float(signal)
+            self.minimum = self.maximum = signal
+        else:
+            diff = signal - self.ewma
+            self.ewma += alpha * diff
+            self.variance = (1 - alpha) * (self.variance + alpha * diff * diff)
+            self.minimum = min(self.minimum, signal)
+            self.maximum = max(self.maximum, signal)
+        self.last_seen = timestamp
+
+    def window(self):
+        """Return the samples in the ring, oldest first."""
+        if self.count < len(self.samples):
+            return self.samples[:self.count].tolist()
+        return (self.samples[self.position:] + self.samples[:self.position]).tolist()
+
+    def percentile(self, q):
+        """Return the q-th percentile (0-100) of the samples in the ring."""
+        held = min(self.count, len(self.samples))
+        if not held:
+            return None
+        rank = max(1, math.ceil(q / 100 * held))
+        seen = 0
+        for offset, count in enumerate(self.histogram):
+            seen += count
+            if seen >= rank:
+                return SIGNAL_FLOOR + offset
+        return SIGNAL_CEILING
+
+    @property
+    def smoothed(self):
+        """The EWMA rounded to a whole dBm, as shown in tables and reports."""
+        return int(round(self.ewma)) if self.ewma is not None else None
+
+    def summary(self):
+        """Return the statistics as a dict."""
+        return {
+            'ewma': round(self.ewma, 1) if self.ewma is not None else None,
+            'stddev': round(math.sqrt(self.variance), 1),
+            'min': self.minimum,
+            'max': self.maximum,
+            'p10': self.percentile(10),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'samples': self.count
+        }
+
+class SignalTracker:
+    """Streaming signal statistics for every access point seen.
+
+    Feed every scan to update(); annotate() then returns the networks with
+    'signal' replaced by the smoothed value, the raw sample kept as
+    'signal_raw' and the statistics as 'signal_stats'.
+    """
+
+    def __init__(self, size=RING_SIZE, alpha=EWMA_ALPHA, max_age=EVICT_AFTER):
+        self.size = size
+        self.alpha = alpha
+        self.max_age = max_age
+        # Least recently seen first, so eviction only looks at the front
+        self.stats = OrderedDict()
+
+    def __len__(self):
+        return len(self.stats)
+
+    def get(self, key):
+        return self.stats.get(key)
+
+    def observe(self, key, signal, timestamp):
+        """Record one sample for `key`."""
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = SignalStats(self.size)
+        else:
+            self.stats.move_to_end(key)
+        stats.add(signal, self.alpha, timestamp)
+
+    def update(self, networks, timestamp=None):
+        """Record one scan and evict access points not seen within max_age."""
+        if timestamp is None:
+            timestamp = time.time()
+        for network in networks:
+            self.observe(network_key(network), network['signal'], timestamp)
+        self.evict(timestamp)
+
+    def seed(self, rows):
+        """Replay (timestamp, bssid, signal) rows, oldest first, e.g. from ScanHistory.signal_history()."""
+        timestamp = None
+        for timestamp, bssid, signal in rows:
+            if bssid and signal is not None:
+                self.observe(bssid, signal, timestamp)
+        if timestamp is not None:
+            self.evict(timestamp)
+
+    def evict(self, now):
+        """Drop access points last seen more than max_age seconds before `now`."""
+        cutoff = now - self.max_age
+        while self.stats:
+            key, stats = next(iter(self.stats.items()))
+            if stats.last_seen >= cutoff:
+                break
+            del self.stats[key]
+
+    def annotate(self, networks):
+        """Return network dicts carrying the smoothed signal and its statistics."""
+        annotated = []
+        for network in networks:
+            record = network.to_dict() if hasattr(network, 'to_dict') else dict(network)
+            stats = self.stats.get(network_key(network))
+            if stats is not None:
+                record['signal_raw'] = record['signal']
+                record['signal'] = stats.smoothed
+                record['signal_stats'] = stats.summary()
+            annotated.append(record)
+        return annotated